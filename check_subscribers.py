@@ -5,8 +5,8 @@
 
 import os
 import json
-import urllib.request
-import urllib.parse
+
+from http_transport import get_transport
 
 # API 키
 API_KEY = os.getenv('YOUTUBE_API_KEY')
@@ -20,11 +20,8 @@ def get_subscriber_count(channel_id, channel_name):
         'key': API_KEY
     }
 
-    url = f"{base_url}?{urllib.parse.urlencode(params)}"
-
     try:
-        with urllib.request.urlopen(url) as response:
-            data = json.loads(response.read())
+        data = get_transport().get_json(base_url, params)
 
         if data.get('items'):
             stats = data['items'][0]['statistics']
@@ -8,9 +8,44 @@ let leaderboardData = null;
 let expandedRows = new Set();
 let currentTab = 'top-creators';
 let subscriberData = {};  // Store subscriber data with timestamps
+let searchQuery = '';
+let searchMatches = null;  // Set of matching channels, null when not searching
+
+// Windowed rendering: only rows near the viewport are kept in the DOM
+const WINDOW_OVERSCAN_PX = 800;  // extra height rendered above and below the viewport
+let renderFrame = null;  // pending requestAnimationFrame id (one DOM update per frame)
+
+// One window per list; entries are { channel, rank, nodes } and nodes only exist while rendered
+const tableWindow = {
+    containerId: 'table-body',
+    estimate: 80,  // row height before it's measured (.leaderboard-table tbody tr)
+    entries: [], render: null, sizes: [], start: 0, end: 0, animate: false,
+    setSpacers: setTableSpacers
+};
+const cardWindow = {
+    containerId: 'mobile-cards',
+    estimate: 240,
+    entries: [], render: null, sizes: [], start: 0, end: 0, animate: false,
+    setSpacers: setCardSpacers
+};
+
+// Hangul decomposition tables (same as leaderboard.py's search index)
+const HANGUL_INITIALS = 'ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ';
+const HANGUL_MEDIALS = 'ㅏㅐㅑㅒㅓㅔㅕㅖㅗㅘㅙㅚㅛㅜㅝㅞㅟㅠㅡㅢㅣ';
+const HANGUL_FINALS = ['', 'ㄱ', 'ㄲ', 'ㄳ', 'ㄴ', 'ㄵ', 'ㄶ', 'ㄷ', 'ㄹ', 'ㄺ', 'ㄻ', 'ㄼ', 'ㄽ', 'ㄾ', 'ㄿ', 'ㅀ',
+                       'ㅁ', 'ㅂ', 'ㅄ', 'ㅅ', 'ㅆ', 'ㅇ', 'ㅈ', 'ㅊ', 'ㅋ', 'ㅌ', 'ㅍ', 'ㅎ'];
+const HANGUL_COMPOUND_JAMO = {
+    'ㄳ': 'ㄱㅅ', 'ㄵ': 'ㄴㅈ', 'ㄶ': 'ㄴㅎ', 'ㄺ': 'ㄹㄱ', 'ㄻ': 'ㄹㅁ', 'ㄼ': 'ㄹㅂ', 'ㄽ': 'ㄹㅅ',
+    'ㄾ': 'ㄹㅌ', 'ㄿ': 'ㄹㅍ', 'ㅀ': 'ㄹㅎ', 'ㅄ': 'ㅂㅅ',
+    'ㅘ': 'ㅗㅏ', 'ㅙ': 'ㅗㅐ', 'ㅚ': 'ㅗㅣ', 'ㅝ': 'ㅜㅓ', 'ㅞ': 'ㅜㅔ', 'ㅟ': 'ㅜㅣ', 'ㅢ': 'ㅡㅣ'
+};
 
 // Initialize when DOM is loaded
 document.addEventListener('DOMContentLoaded', () => {
+    document.querySelectorAll('.search-input').forEach(input => {
+        input.addEventListener('input', (e) => setSearchQuery(e.target.value));
+    });
+    window.addEventListener('scroll', scheduleWindowUpdate, { passive: true });
     loadLeaderboard();
 });
 
@@ -21,26 +56,31 @@ async function loadLeaderboard() {
     try {
         showLoading();
 
-        // Fetch leaderboard data
-        // Try GitHub Pages data first (most up-to-date)
-        const timestamp = new Date().getTime();
-        let response = await fetch(`https://orngfire.github.io/youtube-leaderboard/leaderboard.json?t=${timestamp}`);
+        // Try the content-hashed bundle first: only the tiny manifest is
+        // revalidated, the hashed file itself is served from cache
+        leaderboardData = await loadFromManifest();
 
-        // If GitHub data doesn't work, try local data
-        if (!response.ok) {
-            response = await fetch('leaderboard.json');
-        }
+        if (!leaderboardData) {
+            // Fall back to the plain JSON (GitHub Pages data first, most up-to-date)
+            const timestamp = new Date().getTime();
+            let response = await fetch(`https://orngfire.github.io/youtube-leaderboard/leaderboard.json?t=${timestamp}`);
 
-        // If local data doesn't work, try test data
-        if (!response.ok) {
-            response = await fetch('leaderboard_test.json');
-        }
+            // If GitHub data doesn't work, try local data
+            if (!response.ok) {
+                response = await fetch('leaderboard.json');
+            }
 
-        if (!response.ok) {
-            throw new Error('Failed to load leaderboard data');
-        }
+            // If local data doesn't work, try test data
+            if (!response.ok) {
+                response = await fetch('leaderboard_test.json');
+            }
+
+            if (!response.ok) {
+                throw new Error('Failed to load leaderboard data');
+            }
 
-        leaderboardData = await response.json();
+            leaderboardData = await response.json();
+        }
 
         // Debug: Check if average_views exists in data
         if (leaderboardData && leaderboardData.length > 0) {
@@ -48,8 +88,13 @@ async function loadLeaderboard() {
             console.log('Has average_views?', 'average_views' in leaderboardData[0].metrics);
         }
 
-        // Display data
-        displayLeaderboard();
+        // Search needs the prebuilt index from create_json()
+        document.querySelectorAll('.search-bar').forEach(bar => {
+            bar.style.display = leaderboardData && leaderboardData.search ? '' : 'none';
+        });
+
+        // Display data (keeps the current search after a reload)
+        setSearchQuery(searchQuery);
 
         // Update last updated time
         updateLastUpdated();
@@ -64,6 +109,153 @@ async function loadLeaderboard() {
     }
 }
 
+/**
+ * Load leaderboard data via leaderboard.manifest.json
+ * Returns null when the manifest or hashed file is unavailable
+ */
+async function loadFromManifest() {
+    try {
+        const manifestResponse = await fetch('leaderboard.manifest.json', { cache: 'no-cache' });
+        if (!manifestResponse.ok) return null;
+
+        const manifest = await manifestResponse.json();
+        if (!manifest.file) return null;
+
+        // Hashed file names are immutable, so the default HTTP cache can be reused
+        const response = await fetch(manifest.file);
+        if (!response.ok) return null;
+
+        const data = await response.json();
+        // last_updated lives in the manifest so the hash only changes with the data
+        data.last_updated = manifest.last_updated;
+        return data;
+    } catch (error) {
+        console.warn('Manifest load failed, falling back to leaderboard.json:', error);
+        return null;
+    }
+}
+
+/**
+ * Normalize text for search: lowercase, strip accents (é → e), drop spaces and symbols.
+ * Hangul is kept as-is because NFKD would turn it into conjoining jamo.
+ */
+function normalizeSearchText(text) {
+    let normalized = '';
+    for (const char of (text || '').normalize('NFC').toLowerCase()) {
+        const isHangul = (char >= '\uac00' && char <= '\ud7a3') || (char >= '\u3131' && char <= '\u318e');
+        const chars = isHangul ? char : char.normalize('NFKD').replace(/\p{M}/gu, '');
+        for (const c of chars) {
+            if (/[\p{L}\p{N}]/u.test(c)) normalized += c;
+        }
+    }
+    return normalized;
+}
+
+/**
+ * Decompose Hangul into jamo in typing order ('김소윤' → 'ㄱㅣㅁㅅㅗㅇㅠㄴ'),
+ * so a half-typed syllable still matches
+ */
+function hangulKeystrokes(text) {
+    let out = '';
+    for (const char of text) {
+        if (char >= '\uac00' && char <= '\ud7a3') {
+            const code = char.charCodeAt(0) - 0xAC00;
+            for (const jamo of [HANGUL_INITIALS[Math.floor(code / 588)], HANGUL_MEDIALS[Math.floor(code / 28) % 21], HANGUL_FINALS[code % 28]]) {
+                out += HANGUL_COMPOUND_JAMO[jamo] || jamo;
+            }
+        } else {
+            out += HANGUL_COMPOUND_JAMO[char] || char;
+        }
+    }
+    return out;
+}
+
+/**
+ * Intersect two ascending number arrays
+ */
+function intersectSorted(a, b) {
+    const result = [];
+    let i = 0;
+    let j = 0;
+    while (i < a.length && j < b.length) {
+        if (a[i] === b[j]) {
+            result.push(a[i]);
+            i++;
+            j++;
+        } else if (a[i] < b[j]) {
+            i++;
+        } else {
+            j++;
+        }
+    }
+    return result;
+}
+
+/**
+ * Look up a query in the prebuilt search index
+ * Returns the matching leaderboard positions, or null when the query is empty
+ */
+function searchLeaderboard(query) {
+    const index = leaderboardData?.search;
+    const normalized = normalizeSearchText(query);
+    if (!index || !normalized) return null;
+
+    // Consonants only (e.g. 'ㄱㅅㅇ') searches initials
+    const initialsOnly = /^[ㄱ-ㅎ]+$/.test(normalized);
+    const target = initialsOnly ? normalized : hangulKeystrokes(normalized);
+    const keys = initialsOnly ? index.initials : index.text;
+
+    // Narrow down with the n-gram postings, then confirm each candidate
+    let candidates = null;
+    for (let i = 0; i + index.gram_size <= target.length; i++) {
+        const postings = index.grams[target.slice(i, i + index.gram_size)];
+        if (!postings) return [];
+        candidates = candidates ? intersectSorted(candidates, postings) : postings;
+        if (candidates.length === 0) return [];
+    }
+
+    if (candidates === null) {
+        candidates = keys.map((_, position) => position);
+    }
+    return candidates.filter(position => keys[position].includes(target));
+}
+
+/**
+ * Update the search query from either search box and redraw
+ */
+function setSearchQuery(query) {
+    searchQuery = query;
+    document.querySelectorAll('.search-input').forEach(input => {
+        if (input.value !== query) input.value = query;
+    });
+    if (!leaderboardData) return;
+
+    const channels = leaderboardData.channels || leaderboardData.leaderboard || [];
+    const positions = searchLeaderboard(query);
+    searchMatches = positions === null ? null : new Set(positions.map(position => channels[position]));
+    displayLeaderboard();
+}
+
+/**
+ * Whether a channel passes the current search
+ */
+function matchesSearch(channel) {
+    return searchMatches === null || searchMatches.has(channel);
+}
+
+/**
+ * Show a "no results" row/card when the search filters everything out
+ */
+function showSearchEmpty() {
+    if (searchMatches === null || searchMatches.size > 0) return;
+
+    const tableBody = document.getElementById('table-body');
+    const mobileCards = document.getElementById('mobile-cards');
+    const columns = document.querySelectorAll('.leaderboard-table thead th').length;
+    tableBody.innerHTML = `<tr class="search-empty"><td colspan="${columns}">검색 결과가 없습니다</td></tr>`;
+    mobileCards.innerHTML = '<div class="mobile-search-empty">검색 결과가 없습니다</div>';
+}
+
 /**
  * Switch between tabs
  */
@@ -94,16 +286,14 @@ function displayLeaderboard() {
         return;
     }
 
-    const tableBody = document.getElementById('table-body');
-    const mobileCards = document.getElementById('mobile-cards');
-
-    // Clear existing content
-    tableBody.innerHTML = '';
-    mobileCards.innerHTML = '';
-
     // Update table headers based on current tab
     updateTableHeaders();
 
+    // Mobile cards only exist for Top Creators; other tabs leave the list empty
+    if (currentTab !== 'top-creators') {
+        mountWindow(cardWindow, [], null);
+    }
+
     // Display data based on current tab
     switch(currentTab) {
         case 'most-active':
@@ -120,12 +310,143 @@ function displayLeaderboard() {
             displayTopCreators(channels);
             break;
     }
+
+    showSearchEmpty();
+}
+
+/**
+ * Replace a window's entries and render the visible part on the next frame
+ * render(entry) returns the DOM nodes for one entry
+ */
+function mountWindow(list, entries, render) {
+    list.entries = entries;
+    list.render = render;
+    list.sizes = new Array(entries.length);
+    list.start = 0;
+    list.end = 0;
+    list.animate = true;  // count-up only for the rows shown right after a redraw
+
+    const container = document.getElementById(list.containerId);
+    container.replaceChildren();
+    list.setSpacers(container, 0, 0);
+    scheduleWindowUpdate();
+}
+
+/**
+ * Queue a window update for the next animation frame (scroll, resize, expand)
+ */
+function scheduleWindowUpdate() {
+    if (renderFrame !== null) return;
+    renderFrame = requestAnimationFrame(() => {
+        renderFrame = null;
+        // Check visibility before any writes so the frame does a single layout
+        const visible = [tableWindow, cardWindow].filter(list => document.getElementById(list.containerId).offsetParent);
+        visible.forEach(updateWindow);
+    });
+}
+
+/**
+ * Render the entries overlapping the viewport (plus overscan) and size the spacers for the rest
+ */
+function updateWindow(list) {
+    const { entries, sizes } = list;
+    const container = document.getElementById(list.containerId);
+    if (entries.length === 0) return;
+
+    // Read: measure what is rendered now, and where the list starts
+    const gap = parseFloat(getComputedStyle(container).rowGap) || 0;
+    for (let i = list.start; i < list.end; i++) {
+        const nodes = entries[i].nodes;
+        if (nodes) {
+            sizes[i] = nodes.reduce((height, node) => height + node.getBoundingClientRect().height, 0) + gap;
+        }
+    }
+    const measured = sizes.filter(size => size !== undefined);
+    const estimate = measured.length ? measured.reduce((a, b) => a + b, 0) / measured.length : list.estimate;
+    const sizeOf = i => sizes[i] !== undefined ? sizes[i] : estimate;
+
+    const listTop = container.getBoundingClientRect().top;
+    const viewTop = -listTop - WINDOW_OVERSCAN_PX;
+    const viewBottom = window.innerHeight - listTop + WINDOW_OVERSCAN_PX;
+
+    let start = 0;
+    let before = 0;
+    while (start < entries.length - 1 && before + sizeOf(start) <= viewTop) {
+        before += sizeOf(start++);
+    }
+    let end = start;
+    let offset = before;
+    while (end < entries.length && offset < viewBottom) {
+        offset += sizeOf(end++);
+    }
+    let after = 0;
+    for (let i = end; i < entries.length; i++) {
+        after += sizeOf(i);
+    }
+
+    // Write: swap the rendered rows in one go
+    if (start !== list.start || end !== list.end) {
+        for (let i = list.start; i < list.end; i++) {
+            if (i < start || i >= end) entries[i].nodes = null;
+        }
+
+        const nodes = [];
+        const created = [];
+        for (let i = start; i < end; i++) {
+            if (!entries[i].nodes) {
+                entries[i].nodes = list.render(entries[i]);
+                created.push(...entries[i].nodes);
+            }
+            nodes.push(...entries[i].nodes);
+        }
+        container.replaceChildren(...nodes);
+        list.start = start;
+        list.end = end;
+
+        if (list.animate) {
+            animateScores(created);
+            list.animate = false;
+        }
+        // New rows replace estimates with real heights on the next frame
+        if (created.length) scheduleWindowUpdate();
+    }
+    list.setSpacers(container, before, after);
+}
+
+/**
+ * Table spacers: empty rows above and below the rendered rows
+ */
+function setTableSpacers(tableBody, before, after) {
+    if (tableBody.children.length === 0) return;  // nothing rendered (empty list or search message)
+
+    const columns = document.querySelectorAll('.leaderboard-table thead th').length;
+    [['before', before, 'afterbegin'], ['after', after, 'beforeend']].forEach(([side, height, position]) => {
+        let spacer = tableBody.querySelector(`:scope > .virtual-spacer-${side}`);
+        if (!spacer) {
+            spacer = document.createElement('tr');
+            spacer.className = `virtual-spacer virtual-spacer-${side}`;
+            spacer.setAttribute('aria-hidden', 'true');
+            spacer.innerHTML = `<td colspan="${columns}"></td>`;
+            tableBody.insertAdjacentElement(position, spacer);
+        }
+        spacer.firstElementChild.style.height = `${height}px`;
+    });
+}
+
+/**
+ * Card spacers: padding on the card list (keeps the flex gap between cards intact)
+ */
+function setCardSpacers(mobileCards, before, after) {
+    mobileCards.style.paddingTop = `${before}px`;
+    mobileCards.style.paddingBottom = `${after}px`;
 }
 
 /**
  * Create table row for desktop view
+ * Returns the row, plus its details row while expanded (built on demand)
  */
-function createTableRow(channel) {
+function createTableRow(entry) {
+    const channel = entry.channel;
     const row = document.createElement('tr');
     row.className = `rank-${channel.rank}`;
     row.dataset.rank = channel.rank;
@@ -162,31 +483,40 @@ function createTableRow(channel) {
 
     row.innerHTML = mainRow;
 
-    // Add expanded details row
+    // Add click event to toggle details
+    row.addEventListener('click', () => toggleDetails(entry));
+
+    // A row scrolled back into view keeps its open details
+    if (expandedRows.has(channel)) {
+        row.classList.add('expanded');
+        return [row, createDetailsRow(channel, true)];
+    }
+    return [row];
+}
+
+/**
+ * Create expanded details row (only when a row is opened)
+ */
+function createDetailsRow(channel, shown = false) {
     const detailsRow = document.createElement('tr');
     detailsRow.className = 'details-row';
-    detailsRow.style.display = 'none';
 
     const detailsCell = document.createElement('td');
     detailsCell.colSpan = 7;
     detailsCell.innerHTML = createExpandedDetails(channel);
+    if (shown) {
+        detailsCell.querySelector('.expanded-content').classList.add('show');
+    }
     detailsRow.appendChild(detailsCell);
 
-    // Add click event to toggle details
-    row.addEventListener('click', () => toggleDetails(row, detailsRow));
-
-    // Create fragment to return both rows
-    const fragment = document.createDocumentFragment();
-    fragment.appendChild(row);
-    fragment.appendChild(detailsRow);
-
-    return fragment;
+    return detailsRow;
 }
 
 /**
  * Create mobile card view
  */
-function createMobileCard(channel) {
+function createMobileCard(entry) {
+    const channel = entry.channel;
     const card = document.createElement('div');
     card.className = 'mobile-card';
 
@@ -245,7 +575,7 @@ function createMobileCard(channel) {
         </a>
     `;
 
-    return card;
+    return [card];
 }
 
 /**
@@ -383,64 +713,61 @@ function createExpandedDetails(channel) {
 /**
  * Toggle expanded details
  */
-function toggleDetails(row, detailsRow) {
-    const expandedContent = detailsRow.querySelector('.expanded-content');
-    const isExpanded = detailsRow.style.display === 'table-row';
-
-    // Close all other expanded rows
-    document.querySelectorAll('.details-row').forEach(dr => {
-        if (dr !== detailsRow) {
-            dr.style.display = 'none';
-            dr.querySelector('.expanded-content').classList.remove('show');
+function toggleDetails(entry) {
+    const wasExpanded = expandedRows.has(entry.channel);
+
+    // Close the other expanded row (its details row is dropped, rebuilt on the next expand)
+    for (let i = tableWindow.start; i < tableWindow.end; i++) {
+        const nodes = tableWindow.entries[i].nodes;
+        if (nodes && nodes.length > 1) {
+            nodes.pop().remove();
+            nodes[0].classList.remove('expanded');
         }
-    });
-
-    document.querySelectorAll('tr.expanded').forEach(r => {
-        if (r !== row) {
-            r.classList.remove('expanded');
-        }
-    });
+    }
+    expandedRows.clear();
 
     // Toggle current row
-    if (isExpanded) {
-        detailsRow.style.display = 'none';
-        expandedContent.classList.remove('show');
-        row.classList.remove('expanded');
-    } else {
-        detailsRow.style.display = 'table-row';
+    if (!wasExpanded) {
+        const [row] = entry.nodes;
+        const detailsRow = createDetailsRow(entry.channel);
+        row.after(detailsRow);
+        entry.nodes.push(detailsRow);
         setTimeout(() => {
-            expandedContent.classList.add('show');
+            detailsRow.querySelector('.expanded-content').classList.add('show');
+            scheduleWindowUpdate();
         }, 10);
         row.classList.add('expanded');
+        expandedRows.add(entry.channel);
     }
+
+    // Row heights changed: re-measure and refill the window
+    scheduleWindowUpdate();
 }
 
 /**
  * Animate score numbers with count-up effect
+ * Only the given rows are animated, all in one requestAnimationFrame loop
  */
-function animateScores() {
-    const scoreElements = document.querySelectorAll('.score-number');
+function animateScores(nodes) {
+    const scoreElements = nodes.flatMap(node => [...node.querySelectorAll('.score-number')]);
+    if (scoreElements.length === 0) return;
 
+    const duration = 1000; // 1 second
+    const targets = scoreElements.map(element => parseInt(element.dataset.target));
     scoreElements.forEach(element => {
-        const target = parseInt(element.dataset.target);
-        const duration = 1000; // 1 second
-        const steps = 30;
-        const stepDuration = duration / steps;
-        const increment = target / steps;
-
-        let current = 0;
         element.textContent = '0';
         element.classList.add('count-up');
-
-        const timer = setInterval(() => {
-            current += increment;
-            if (current >= target) {
-                current = target;
-                clearInterval(timer);
-            }
-            element.textContent = formatNumber(Math.floor(current));
-        }, stepDuration);
     });
+
+    const startTime = performance.now();
+    const step = (now) => {
+        const progress = Math.min((now - startTime) / duration, 1);
+        scoreElements.forEach((element, i) => {
+            element.textContent = formatNumber(Math.floor(targets[i] * progress));
+        });
+        if (progress < 1) requestAnimationFrame(step);
+    };
+    requestAnimationFrame(step);
 }
 
 /**
@@ -547,14 +874,15 @@ function showError() {
  */
 function showEmpty() {
     document.getElementById('empty-state').style.display = 'block';
-    document.getElementById('table-body').innerHTML = '';
-    document.getElementById('mobile-cards').innerHTML = '';
+    mountWindow(tableWindow, [], null);
+    mountWindow(cardWindow, [], null);
 }
 
 // Handle window resize to switch between desktop and mobile views
 window.addEventListener('resize', () => {
     if (leaderboardData) {
         showMainContent();
+        scheduleWindowUpdate();
     }
 });
 
@@ -643,21 +971,32 @@ function updateTableHeaders() {
  * Display Top Creators (existing leaderboard)
  */
 function displayTopCreators(channels) {
-    const tableBody = document.getElementById('table-body');
-    const mobileCards = document.getElementById('mobile-cards');
+    const matches = channels.filter(matchesSearch);
+    expandedRows.clear();
 
-    channels.forEach((channel) => {
-        // Desktop table row
-        const row = createTableRow(channel);
-        tableBody.appendChild(row);
+    // Desktop table rows and mobile cards (count-up runs on the first rows shown)
+    mountWindow(tableWindow, matches.map(channel => ({ channel, rank: channel.rank, nodes: null })), createTableRow);
+    mountWindow(cardWindow, matches.map(channel => ({ channel, rank: channel.rank, nodes: null })), createMobileCard);
+}
 
-        // Mobile card
-        const card = createMobileCard(channel);
-        mobileCards.appendChild(card);
-    });
+/**
+ * Rank entries for a re-sorted tab
+ * Rank comes from the full list so it stays the same while searching
+ */
+function rankedEntries(sortedChannels) {
+    return sortedChannels
+        .map((channel, index) => ({ channel, rank: index + 1, nodes: null }))
+        .filter(entry => matchesSearch(entry.channel));
+}
 
-    // Add count-up animation to total scores
-    animateScores();
+/**
+ * Rank cell for the re-sorted tabs (medals for the top 3)
+ */
+function tabRankCell(rank) {
+    return `
+        <td class="rank-cell">
+            ${rank <= 3 ? `<span class="rank-medal">${['🥇', '🥈', '🥉'][rank - 1]}</span>` : `<span class="rank-number">${rank}</span>`}
+        </td>`;
 }
 
 /**
@@ -665,8 +1004,6 @@ function displayTopCreators(channels) {
  * Based on videos published during evaluation period (2025.10.02 - 2025.12.14)
  */
 function displayMostActive(channels) {
-    const tableBody = document.getElementById('table-body');
-
     // Sort by video count (videos from evaluation period)
     const sortedChannels = [...channels].sort((a, b) => {
         const aCount = a.metrics?.video_count || 0;
@@ -674,45 +1011,50 @@ function displayMostActive(channels) {
         return bCount - aCount;
     });
 
-    sortedChannels.forEach((channel, index) => {
-        const row = document.createElement('tr');
-        const videoCount = channel.metrics?.video_count || 0;
-        const avgViews = Math.round(channel.metrics?.average_views || 0);
-        // Debug logging
-        if (index === 0) {
-            console.log('Most Active Tab Debug:', {
-                channel: channel.name,
-                metrics: channel.metrics,
-                average_views: channel.metrics?.average_views,
-                median_score: channel.metrics?.median_score,
-                avgViews_calculated: avgViews
-            });
-        }
-        // Use average_likes for the average likes count
-        const avgLikes = Math.round(channel.metrics?.average_likes || 0);
-
-        row.innerHTML = `
-            <td class="rank-cell">
-                ${index < 3 ? `<span class="rank-medal">${['🥇', '🥈', '🥉'][index]}</span>` : `<span class="rank-number">${index + 1}</span>`}
-            </td>
-            <td class="name-cell">
-                <div class="name-wrapper">
-                    <div class="name-line">
-                        <span class="name-text">${channel.name}</span>
-                    </div>
-                    <div class="channel-name">${channel.channel_name ? '@' + channel.channel_name : '@' + channel.channel_handle}</div>
+    // Debug logging
+    if (sortedChannels.length > 0) {
+        const channel = sortedChannels[0];
+        console.log('Most Active Tab Debug:', {
+            channel: channel.name,
+            metrics: channel.metrics,
+            average_views: channel.metrics?.average_views,
+            median_score: channel.metrics?.median_score,
+            avgViews_calculated: Math.round(channel.metrics?.average_views || 0)
+        });
+    }
+
+    mountWindow(tableWindow, rankedEntries(sortedChannels), createMostActiveRow);
+}
+
+/**
+ * Create Most Active table row
+ */
+function createMostActiveRow(entry) {
+    const { channel, rank } = entry;
+    const row = document.createElement('tr');
+    const videoCount = channel.metrics?.video_count || 0;
+    const avgViews = Math.round(channel.metrics?.average_views || 0);
+    // Use average_likes for the average likes count
+    const avgLikes = Math.round(channel.metrics?.average_likes || 0);
+
+    row.innerHTML = `${tabRankCell(rank)}
+        <td class="name-cell">
+            <div class="name-wrapper">
+                <div class="name-line">
+                    <span class="name-text">${channel.name}</span>
                 </div>
-            </td>
-            <td class="score-cell">
-                <span class="score-badge">🎬 ${videoCount}개</span>
-            </td>
-            <td class="score-cell">${avgViews.toLocaleString()}</td>
-            <td class="score-cell">${avgLikes.toLocaleString()}</td>
-        `;
+                <div class="channel-name">${channel.channel_name ? '@' + channel.channel_name : '@' + channel.channel_handle}</div>
+            </div>
+        </td>
+        <td class="score-cell">
+            <span class="score-badge">🎬 ${videoCount}개</span>
+        </td>
+        <td class="score-cell">${avgViews.toLocaleString()}</td>
+        <td class="score-cell">${avgLikes.toLocaleString()}</td>
+    `;
 
-        row.className = `rank-${index + 1}`;
-        tableBody.appendChild(row);
-    });
+    row.className = `rank-${rank}`;
+    return [row];
 }
 
 /**
@@ -720,8 +1062,6 @@ function displayMostActive(channels) {
  * Based on current subscriber count (not limited to evaluation period)
  */
 function displayMostSubscribed(channels) {
-    const tableBody = document.getElementById('table-body');
-
     // Sort by actual subscriber count from metrics
     const sortedChannels = [...channels].sort((a, b) => {
         const aSubs = a.metrics?.subscriber_count || 0;
@@ -729,43 +1069,47 @@ function displayMostSubscribed(channels) {
         return bSubs - aSubs;
     });
 
-    sortedChannels.forEach((channel, index) => {
-        // Use actual subscriber count from metrics
-        const currentSubs = channel.metrics?.subscriber_count || 0;
-        const subsChange = channel.metrics?.subscriber_change || 0;
-        const subsChangePercent = channel.metrics?.subscriber_change_percent || 0;
-
-        // Use total_video_count for all videos, regardless of evaluation period
-        const totalVideoCount = channel.metrics?.total_video_count || 0;
-
-        const row = document.createElement('tr');
-        row.innerHTML = `
-            <td class="rank-cell">
-                ${index < 3 ? `<span class="rank-medal">${['🥇', '🥈', '🥉'][index]}</span>` : `<span class="rank-number">${index + 1}</span>`}
-            </td>
-            <td class="name-cell">
-                <div class="name-wrapper">
-                    <div class="name-line">
-                        <span class="name-text">${channel.name}</span>
-                    </div>
-                    <div class="channel-name">${channel.channel_name ? '@' + channel.channel_name : '@' + channel.channel_handle}</div>
+    mountWindow(tableWindow, rankedEntries(sortedChannels), createMostSubscribedRow);
+}
+
+/**
+ * Create Most Subscribed table row
+ */
+function createMostSubscribedRow(entry) {
+    const { channel, rank } = entry;
+
+    // Use actual subscriber count from metrics
+    const currentSubs = channel.metrics?.subscriber_count || 0;
+    const subsChange = channel.metrics?.subscriber_change || 0;
+    const subsChangePercent = channel.metrics?.subscriber_change_percent || 0;
+
+    // Use total_video_count for all videos, regardless of evaluation period
+    const totalVideoCount = channel.metrics?.total_video_count || 0;
+
+    const row = document.createElement('tr');
+    row.innerHTML = `${tabRankCell(rank)}
+        <td class="name-cell">
+            <div class="name-wrapper">
+                <div class="name-line">
+                    <span class="name-text">${channel.name}</span>
                 </div>
-            </td>
-            <td class="score-cell">
-                <span class="score-badge">👥 ${currentSubs >= 1000 ? (currentSubs / 1000).toFixed(1) + 'K' : currentSubs.toLocaleString()}</span>
-            </td>
-            <td class="score-cell">
-                <span style="color: ${subsChange >= 0 ? '#22c55e' : '#ef4444'}">
-                    ${subsChange >= 0 ? '+' : ''}${subsChange}
-                    ${subsChangePercent !== 0 ? ` (${subsChangePercent > 0 ? '+' : ''}${subsChangePercent.toFixed(1)}%)` : ''}
-                </span>
-            </td>
-            <td class="score-cell">${totalVideoCount}개</td>
-        `;
+                <div class="channel-name">${channel.channel_name ? '@' + channel.channel_name : '@' + channel.channel_handle}</div>
+            </div>
+        </td>
+        <td class="score-cell">
+            <span class="score-badge">👥 ${currentSubs >= 1000 ? (currentSubs / 1000).toFixed(1) + 'K' : currentSubs.toLocaleString()}</span>
+        </td>
+        <td class="score-cell">
+            <span style="color: ${subsChange >= 0 ? '#22c55e' : '#ef4444'}">
+                ${subsChange >= 0 ? '+' : ''}${subsChange}
+                ${subsChangePercent !== 0 ? ` (${subsChangePercent > 0 ? '+' : ''}${subsChangePercent.toFixed(1)}%)` : ''}
+            </span>
+        </td>
+        <td class="score-cell">${totalVideoCount}개</td>
+    `;
 
-        row.className = `rank-${index + 1}`;
-        tableBody.appendChild(row);
-    });
+    row.className = `rank-${rank}`;
+    return [row];
 }
 
 /**
@@ -773,8 +1117,6 @@ function displayMostSubscribed(channels) {
  * Based on videos published during evaluation period (2025.10.02 - 2025.12.14)
  */
 function displayViralHit(channels) {
-    const tableBody = document.getElementById('table-body');
-
     // Sort by highest view count from actual data
     const sortedChannels = [...channels].sort((a, b) => {
         const aViews = a.metrics?.viral_video?.views || 0;
@@ -782,35 +1124,39 @@ function displayViralHit(channels) {
         return bViews - aViews;
     });
 
-    sortedChannels.forEach((channel, index) => {
-        // Use actual viral_video data from metrics (single highest view video from evaluation period)
-        const video = channel.metrics?.viral_video || { views: 0, likes: 0, comments: 0 };
-        // Calculate engagement with 2x weight for comments (same as main leaderboard)
-        const engagement = video.views > 0 ?
-            ((video.likes + video.comments * 2) / video.views * 100).toFixed(2) : 0;
-
-        const row = document.createElement('tr');
-        row.innerHTML = `
-            <td class="rank-cell">
-                ${index < 3 ? `<span class="rank-medal">${['🥇', '🥈', '🥉'][index]}</span>` : `<span class="rank-number">${index + 1}</span>`}
-            </td>
-            <td class="name-cell">
-                <div class="name-wrapper">
-                    <div class="name-line">
-                        <span class="name-text">${channel.name}</span>
-                    </div>
-                    <div class="channel-name">${channel.channel_name ? '@' + channel.channel_name : '@' + channel.channel_handle}</div>
+    mountWindow(tableWindow, rankedEntries(sortedChannels), createViralHitRow);
+}
+
+/**
+ * Create Viral Hit table row
+ */
+function createViralHitRow(entry) {
+    const { channel, rank } = entry;
+
+    // Use actual viral_video data from metrics (single highest view video from evaluation period)
+    const video = channel.metrics?.viral_video || { views: 0, likes: 0, comments: 0 };
+    // Calculate engagement with 2x weight for comments (same as main leaderboard)
+    const engagement = video.views > 0 ?
+        ((video.likes + video.comments * 2) / video.views * 100).toFixed(2) : 0;
+
+    const row = document.createElement('tr');
+    row.innerHTML = `${tabRankCell(rank)}
+        <td class="name-cell">
+            <div class="name-wrapper">
+                <div class="name-line">
+                    <span class="name-text">${channel.name}</span>
                 </div>
-            </td>
-            <td class="score-cell">
-                <span class="score-badge">🔥 ${video.views.toLocaleString()}</span>
-            </td>
-            <td class="score-cell">${video.likes.toLocaleString()}</td>
-            <td class="score-cell">${video.comments.toLocaleString()}</td>
-            <td class="score-cell">${engagement}%</td>
-        `;
+                <div class="channel-name">${channel.channel_name ? '@' + channel.channel_name : '@' + channel.channel_handle}</div>
+            </div>
+        </td>
+        <td class="score-cell">
+            <span class="score-badge">🔥 ${video.views.toLocaleString()}</span>
+        </td>
+        <td class="score-cell">${video.likes.toLocaleString()}</td>
+        <td class="score-cell">${video.comments.toLocaleString()}</td>
+        <td class="score-cell">${engagement}%</td>
+    `;
 
-        row.className = `rank-${index + 1}`;
-        tableBody.appendChild(row);
-    });
-}
\ No newline at end of file
+    row.className = `rank-${rank}`;
+    return [row];
+}
@@ -1,13 +1,13 @@
 #!/usr/bin/env python3
 """
-모든 채널 ID 찾기 - urllib만 사용
+모든 채널 ID 찾기 - 공유 HTTP 커넥션 풀 사용
 """
 import json
-import urllib.request
-import urllib.parse
 import os
 import time
 
+from http_transport import get_transport, TransportHTTPError
+
 # .env 파일에서 API 키 읽기
 API_KEY = None
 if os.path.exists('.env'):
@@ -49,11 +49,10 @@ for channel in channels:
         'key': API_KEY
     }
 
-    api_url = f"https://www.googleapis.com/youtube/v3/search?{urllib.parse.urlencode(params)}"
+    api_url = "https://www.googleapis.com/youtube/v3/search"
 
     try:
-        with urllib.request.urlopen(api_url) as response:
-            data = json.loads(response.read())
+        data = get_transport().get_json(api_url, params)
 
         channel_id = None
 
@@ -76,8 +75,8 @@ for channel in channels:
         # API 할당량 보호를 위해 잠시 대기
         time.sleep(0.5)
 
-    except urllib.error.HTTPError as e:
-        error_data = json.loads(e.read())
+    except TransportHTTPError as e:
+        error_data = e.json()
         error_msg = error_data.get('error', {}).get('message', 'Unknown error')
         print(f"  ❌ API 오류: {error_msg}")
 
@@ -31,6 +31,7 @@ if not API_KEY or API_KEY == 'YOUR_API_KEY_HERE':
 try:
     from googleapiclient.discovery import build
     from googleapiclient.errors import HttpError
+    from http_transport import get_transport
 except ImportError:
     print("❌ googleapiclient 모듈이 설치되지 않았습니다!")
     print("다음 명령어로 설치하세요:")
@@ -38,7 +39,7 @@ except ImportError:
     sys.exit(1)
 
 # YouTube API 초기화
-youtube = build('youtube', 'v3', developerKey=API_KEY)
+youtube = build('youtube', 'v3', developerKey=API_KEY, http=get_transport().httplib2_adapter())
 
 # channels.json 읽기
 with open('channels.json', 'r', encoding='utf-8') as f:
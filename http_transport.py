@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+공유 HTTP 전송 계층
+YouTube API 클라이언트, Google Sheets 클라이언트, 보조 스크립트가 같은 커넥션 풀을 사용
+"""
+
+import json
+import logging
+import os
+import threading
+import urllib.parse
+from typing import Dict, Optional, Tuple
+
+import httplib2
+import urllib3
+
+try:
+    import httpx
+    import h2  # noqa: F401  (httpx의 HTTP/2 지원에 필요)
+except ImportError:  # HTTP/2는 선택 사항, 없으면 HTTP/1.1 keep-alive 풀 사용
+    httpx = None
+
+logger = logging.getLogger(__name__)
+
+# 설정
+HTTP_POOL_MAXSIZE = int(os.getenv('HTTP_POOL_MAXSIZE', '10'))  # 호스트당 유지할 커넥션 수
+HTTP_TIMEOUT = float(os.getenv('HTTP_TIMEOUT', '30'))  # 초
+HTTP2_ENABLED = os.getenv('HTTP2_ENABLED', 'false').lower() == 'true'
+
+
+class TransportHTTPError(Exception):
+    """get_json 요청이 4xx/5xx로 끝난 경우"""
+
+    def __init__(self, status: int, body: bytes, url: str):
+        super().__init__(f"HTTP {status}: {url}")
+        self.status = status
+        self.body = body
+        self.url = url
+
+    def json(self) -> Dict:
+        """에러 응답 본문 (JSON이 아니면 빈 dict)"""
+        try:
+            return json.loads(self.body)
+        except ValueError:
+            return {}
+
+
+class SharedTransport:
+    """커넥션 풀 기반 HTTP 전송
+
+    호스트별로 keep-alive 커넥션을 재사용해 호출마다 DNS 조회와 TLS 핸드셰이크를
+    반복하지 않는다. 응답은 gzip으로 받아 자동으로 풀어준다. HTTP2_ENABLED이고
+    httpx[http2]가 설치되어 있으면 HTTP/2 멀티플렉싱을 사용한다.
+    스레드 안전하므로 여러 스레드가 하나의 인스턴스를 공유해도 된다.
+    """
+
+    def __init__(self, pool_maxsize: int = HTTP_POOL_MAXSIZE, timeout: float = HTTP_TIMEOUT,
+                 http2: bool = HTTP2_ENABLED):
+        self.timeout = timeout
+        self.requests = 0
+        self._lock = threading.Lock()
+
+        # Sheets(requests) 클라이언트와도 공유하는 HTTP/1.1 풀
+        self.pool = urllib3.PoolManager(
+            num_pools=pool_maxsize,
+            maxsize=pool_maxsize,
+            retries=False,  # 재시도는 호출하는 쪽(YouTubeAPI._execute)에서 처리
+            timeout=urllib3.Timeout(total=timeout)
+        )
+
+        self._http2_client = None
+        if http2:
+            if httpx is None:
+                logger.warning("HTTP2_ENABLED이지만 httpx[http2]가 설치되지 않아 HTTP/1.1을 사용합니다")
+            else:
+                self._http2_client = httpx.Client(
+                    http2=True,
+                    timeout=timeout,
+                    limits=httpx.Limits(max_keepalive_connections=pool_maxsize, max_connections=pool_maxsize * 2)
+                )
+
+    def request(self, method: str, url: str, body: Optional[bytes] = None,
+                headers: Optional[Dict[str, str]] = None) -> Tuple[int, Dict[str, str], bytes]:
+        """요청 실행 → (상태 코드, 응답 헤더(소문자 키), 압축 해제된 본문)"""
+        headers = dict(headers or {})
+        if not any(key.lower() == 'accept-encoding' for key in headers):
+            headers['accept-encoding'] = 'gzip'
+
+        with self._lock:
+            self.requests += 1
+
+        # 네트워크 오류는 ConnectionError(OSError)로 통일해 기존 재시도 로직이 그대로 잡도록 함
+        if self._http2_client is not None:
+            try:
+                response = self._http2_client.request(method, url, content=body, headers=headers)
+            except httpx.TransportError as e:
+                raise ConnectionError(f"{method} {url}: {e}") from e
+            return response.status_code, {k.lower(): v for k, v in response.headers.items()}, response.content
+
+        try:
+            response = self.pool.request(method, url, body=body, headers=headers, decode_content=True)
+        except urllib3.exceptions.HTTPError as e:
+            raise ConnectionError(f"{method} {url}: {e}") from e
+        return response.status, {k.lower(): v for k, v in response.headers.items()}, response.data
+
+    def get_json(self, url: str, params: Optional[Dict] = None) -> Dict:
+        """GET 요청 후 JSON 파싱 (4xx/5xx는 TransportHTTPError)"""
+        if params:
+            url = f"{url}?{urllib.parse.urlencode(params)}"
+        status, _, content = self.request('GET', url)
+        if status >= 400:
+            raise TransportHTTPError(status, content, url)
+        return json.loads(content)
+
+    def httplib2_adapter(self) -> 'Httplib2Adapter':
+        """googleapiclient의 build(http=...)에 넘길 어댑터"""
+        return Httplib2Adapter(self)
+
+    def authorized_session(self, credentials):
+        """이 풀을 사용하는 Google 인증 세션 (gspread.authorize(session=...)용)"""
+        from google.auth.transport.requests import AuthorizedSession
+        from requests.adapters import HTTPAdapter
+
+        session = AuthorizedSession(credentials)
+        adapter = HTTPAdapter()
+        adapter.poolmanager = self.pool  # requests도 같은 keep-alive 커넥션을 재사용
+        session.mount('https://', adapter)
+        return session
+
+    def stats(self) -> Dict[str, int]:
+        """요청 수와 실제로 연 커넥션 수"""
+        connections = 0
+        for key in self.pool.pools.keys():
+            pool = self.pool.pools.get(key)
+            if pool is not None:
+                connections += pool.num_connections
+        return {'requests': self.requests, 'connections': connections}
+
+    def close(self):
+        self.pool.clear()
+        if self._http2_client is not None:
+            self._http2_client.close()
+
+
+class Httplib2Adapter:
+    """SharedTransport를 httplib2.Http 인터페이스로 감싼 어댑터
+
+    httplib2.Http와 달리 스레드 안전하다.
+    """
+
+    def __init__(self, transport: SharedTransport):
+        self.transport = transport
+        self.timeout = transport.timeout
+        self.redirect_codes = set(httplib2.REDIRECT_CODES)
+
+    def request(self, uri: str, method: str = 'GET', body=None, headers: Optional[Dict] = None,
+                redirections: int = 5, connection_type=None) -> Tuple[httplib2.Response, bytes]:
+        if isinstance(body, str):
+            body = body.encode('utf-8')
+        status, response_headers, content = self.transport.request(method, uri, body, headers)
+        # 본문은 이미 압축 해제되었으므로 content-encoding은 넘기지 않음
+        response_headers.pop('content-encoding', None)
+        response = httplib2.Response({**response_headers, 'status': str(status)})
+        return response, content
+
+    def close(self):
+        # 풀은 공유 자원이므로 개별 클라이언트가 닫지 않음
+        pass
+
+
+_transport = None
+_transport_lock = threading.Lock()
+
+
+def get_transport() -> SharedTransport:
+    """프로세스 전체에서 공유하는 전송 인스턴스"""
+    global _transport
+    with _transport_lock:
+        if _transport is None:
+            _transport = SharedTransport()
+        return _transport
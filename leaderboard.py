@@ -4,53 +4,240 @@ YouTube Creator Leaderboard System
 평가 기간: 2025-10-02 ~ 2025-12-14
 """
 
+import bisect
+import copy
+import cProfile
+import gzip
+import hashlib
 import json
 import logging
+import mmap
 import os
+import random
+import shutil
+import signal
 import sys
+import threading
+import time
+import tracemalloc
 from datetime import datetime, timezone, timedelta
-from typing import Dict, List, Optional, Tuple
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from zoneinfo import ZoneInfo
+import argparse
+import atexit
+import contextlib
+import contextvars
+import logging.handlers
+import queue
+import re
 import statistics
+import struct
+import tempfile
+import unicodedata
+import uuid
+from array import array
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import urllib.parse
 
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
+import httplib2
 from dotenv import load_dotenv
 import gspread
 from google.oauth2.service_account import Credentials
 
-# 로깅 설정
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('leaderboard.log'),
-        logging.StreamHandler(sys.stdout)
-    ]
-)
-logger = logging.getLogger(__name__)
+from http_transport import get_transport
+
+try:
+    import openpyxl
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.styles import Alignment, Font, PatternFill
+except ImportError:  # openpyxl 미설치 환경에서는 로컬 Excel 생성을 생략
+    openpyxl = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow 미설치 환경에서는 분석용 Parquet 내보내기를 생략
+    pa = None
+
+# 로거 (핸들러는 setup_logging()에서 설정)
+logger = logging.getLogger('leaderboard')
+api_logger = logger.getChild('api')  # YouTube API 호출별 메시지
+subscriber_logger = logger.getChild('subscribers')  # 채널별 구독자 갱신 메시지
+api_server_logger = logger.getChild('server')  # 읽기 전용 API 서버 요청
 
 # 환경 변수 로드
 load_dotenv()
 
 # 설정
 API_KEY = os.getenv('YOUTUBE_API_KEY')
+# 여러 키를 쉼표로 구분해 주면 키 풀로 나눠 씀 (없으면 YOUTUBE_API_KEY 하나)
+API_KEYS = [key.strip() for key in os.getenv('YOUTUBE_API_KEYS', '').split(',') if key.strip()] or (
+    [API_KEY] if API_KEY else [])
 START_DATE = '2025-10-02T00:00:00Z'
 END_DATE = '2025-12-14T23:59:59Z'
 CHANNELS_FILE = 'channels.json'
 MIN_VIDEOS = 3
 
+# 정적 배포 출력 (GitHub Pages용 해시 파일 + 매니페스트)
+STATIC_OUTPUT_DIR = 'docs'
+STATIC_MANIFEST_FILE = 'leaderboard.manifest.json'
+STATIC_KEEP_VERSIONS = 3  # 캐시된 매니페스트를 가진 클라이언트를 위해 이전 버전 유지 (매니페스트의 versions 순서 기준)
+
+# 변경분 피드 (직전 실행 대비 순위/점수/뱃지 변화)
+DELTA_FEED_FILE = 'leaderboard_delta.json'
+DELTA_RING_SIZE = 48  # 3시간 간격 기준 약 6일치 보관
+
+# 검색 인덱스 (이름/핸들/채널명, 초성 검색 포함)
+SEARCH_GRAM_SIZE = 2  # 이보다 짧은 검색어는 인덱스 없이 전체를 훑음
+
+# 스냅샷 아카이브 (실행별 순위/점수 기록)
+HISTORY_DIR = 'history'
+RANK_HISTORY_FILE = 'rank_history.json'
+MOVERS_WINDOW_DAYS = 7
+
+# 로그 (콘솔은 사람이 읽는 형식, 파일은 JSON 한 줄씩, 크기 제한 + 순환)
+LOG_FILE = 'leaderboard.log'
+LOG_MAX_BYTES = 5 * 1024 * 1024
+LOG_BACKUP_COUNT = 3
+LOG_SAMPLE_BURST = 20  # 같은 위치의 반복 메시지는 처음 이만큼만 그대로 기록
+LOG_SAMPLE_EVERY = 10  # 그 뒤로는 이 개수마다 하나씩 기록
+
+# 프로파일링 (--profile, 단계별 CPU 프로파일 + 스택 샘플 + 할당 기록)
+PROFILE_DIR = 'profile'
+PROFILE_SAMPLE_INTERVAL = 0.005  # 초, 스택 샘플 간격
+PROFILE_TOP_ALLOCATIONS = 20  # 단계별로 기록할 할당 위치 수
+
+# 재시도 (일시적 오류에 대한 지수 백오프 + 지터)
+RETRY_MAX_ATTEMPTS = 5
+RETRY_BASE_DELAY = 1.0  # 초
+RETRY_MAX_DELAY = 32.0  # 초
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+RETRYABLE_REASONS = {'rateLimitExceeded', 'userRateLimitExceeded', 'backendError', 'internalError'}
+
+# API 키 풀 (키별 예상 사용량을 태평양 시간 기준 할당량 일자마다 집계)
+API_KEY_USAGE_FILE = 'api_key_usage.json'
+API_KEY_DAILY_QUOTA = int(os.getenv('API_KEY_DAILY_QUOTA', '10000'))  # 키 하나의 하루 할당량 (단위)
+API_QUOTA_TIMEZONE = ZoneInfo('America/Los_Angeles')  # 할당량은 태평양 시간 자정에 초기화
+API_QUOTA_COSTS = {'youtube.search.list': 100}  # 메서드별 단위 (없으면 1)
+QUOTA_REASONS = {'quotaExceeded', 'dailyLimitExceeded'}
+
+# 헤지 요청 (응답이 엔드포인트 p95보다 늦으면 같은 요청을 하나 더 보내 먼저 온 응답 사용)
+HEDGE_SAMPLE_SIZE = 200  # 엔드포인트별로 보관할 최근 응답 시간 수
+HEDGE_MIN_SAMPLES = 20  # 이만큼 쌓이기 전에는 헤지하지 않음
+HEDGE_MIN_DELAY = 0.2  # 초 (p95가 이보다 짧아도 이만큼은 기다림)
+HEDGE_BUDGET_RATIO = 0.05  # 헤지 요청은 사용한 할당량 단위의 5%까지 (API_QUOTA_COSTS 기준)
+
+# 회로 차단기 (엔드포인트별 일시적 오류가 연속되면 잠시 요청을 막고 저장된 데이터로 대체)
+CIRCUIT_FAILURE_THRESHOLD = 5
+CIRCUIT_OPEN_SECONDS = 60.0
+
+# 배치 요청 (독립적인 API 호출을 멀티파트 HTTP 요청 하나로 묶음)
+BATCH_MAX_SIZE = 50  # 배치 하나에 담을 요청 수
+CHANNELS_PER_REQUEST = 50  # channels.list의 id 파라미터 최대 개수
+
+# 수집 파이프라인 (채널 수집과 점수 계산을 겹쳐 실행)
+FETCH_WORKERS = int(os.getenv('FETCH_WORKERS', '4'))  # 채널을 동시에 수집할 스레드 수
+
+# 실행 저널 (채널별 체크포인트, --resume으로 이어서 실행)
+RUN_JOURNAL_DIR = '.run_journal'
+RUN_CHECKPOINT_MAX_AGE_HOURS = 3  # 워크플로우 cron 주기: 이보다 오래된 체크포인트는 이어받지 않고 다시 수집
+
+# 리더보드 설정 파일 (없으면 위 기간/가중치로 단일 리더보드 생성)
+LEADERBOARDS_FILE = 'leaderboards.json'
+
+# 영상 저장소 / 롤링 윈도우 리더보드 상태
+VIDEO_STATE_FILE = 'video_store.bin'  # mmap으로 여는 바이너리 상태 파일
+VIDEO_STORE_FILE = 'video_store.json'  # 이전 형식 (상태 파일이 없을 때만 읽음)
+ROLLING_STATE_FILE = 'rolling_state.json'
+
+# 영상별 통계 시계열 (값이 바뀐 경우에만 델타 + varint로 기록)
+TIMESERIES_DIR = 'timeseries'
+TIMESERIES_COMPACT_SEGMENTS = 32  # 영상당 평균 조각 수가 이보다 많아지면 series.bin을 다시 이어 붙여 저장
+
+# 트렌딩 (영상/채널별 조회수·반응 속도의 지수 이동 평균)
+TRENDING_STATE_FILE = 'trending_state.json'
+TRENDING_HALF_LIFE_HOURS = 24  # 이 시간이 지나면 과거 속도의 비중이 절반으로
+TRENDING_ENGAGEMENT_WEIGHT = 20  # 좋아요/댓글 1개 = 조회수 20회
+TRENDING_RETAIN_DAYS = 7  # 이 기간 동안 관측되지 않은 영상은 상태에서 제거
+TRENDING_LIMIT = 10
+
+# 스프레드시트 (Google Sheets와 로컬 Excel이 같은 열/서식 사용)
+EXCEL_FILE = 'leaderboard.xlsx'
+LEADERBOARD_SHEET_HEADERS = [
+    '순위', '이름', '채널명', '총점수', '채널점수', '인게이지먼트', '바이럴', '성장',
+    '영상수', '중앙값', '인게이지먼트율(%)', 'Top3평균', '성장비율', '뱃지'
+]
+VIDEO_SHEET_HEADERS = ['업로드날짜', '이름', '채널명', '영상제목', '조회수', '좋아요', '댓글', '기본점수', 'URL']
+TRENDING_CHANNEL_HEADERS = ['순위', '이름', '채널명', '트렌딩점수', '시간당 조회수', '시간당 반응', '급상승 영상', 'URL']
+TRENDING_VIDEO_HEADERS = ['순위', '이름', '채널명', '트렌딩점수', '시간당 조회수', '시간당 반응', '영상제목', 'URL']
+SHEET_HEADER_RGB = (0.9, 0.9, 0.9)
+SHEET_MEDAL_RGB = [(1, 0.843, 0), (0.753, 0.753, 0.753), (0.804, 0.498, 0.196)]  # 금, 은, 동
+
+# 분석용 컬럼 파일 (ANALYTICS_EXPORT_ENABLED=true, Parquet, 실행 날짜별 파티션)
+ANALYTICS_OUTPUT_DIR = 'analytics'
+ANALYTICS_ROW_GROUP_SIZE = 65536  # 행 그룹 크기 (이만큼 모아서 한 번에 기록)
+
+# 데몬 모드 (--daemon, 프로세스를 유지하며 주기적으로 갱신)
+DAEMON_INTERVAL_MINUTES = 30
+
+# 읽기 전용 HTTP API (--serve, 최신 결과 파일로 만든 메모리 인덱스에서 응답)
+API_SERVER_HOST = os.getenv('API_SERVER_HOST', '127.0.0.1')
+API_DEFAULT_LIMIT = 10
+API_MAX_LIMIT = 100
+API_GZIP_MIN_BYTES = 1024  # 이보다 작은 응답은 압축하지 않음
+API_RESPONSE_CACHE_SIZE = 1024  # 인덱스 버전별로 기억할 응답 수
+API_RELOAD_SECONDS = 5  # 단독 실행 시 결과 파일 변경 확인 간격
+
+# 로스터 사전 검증 (--validate, 확인된 채널 항목은 내용 해시로 캐시)
+ROSTER_VALIDATION_FILE = 'roster_validation.json'
+ROSTER_VALIDATION_MAX_AGE_DAYS = 30  # 이보다 오래된 확인 결과는 다시 확인
+
+# 샤드 실행 (--shard K/N 부분 결과, --merge로 병합)
+SHARD_DIR = 'shards'
+
+# 채널별 갱신 주기 (활동이 많은 채널은 자주, 휴면 채널은 점점 드물게)
+REFRESH_SCHEDULE_FILE = 'refresh_schedule.json'
+REFRESH_MIN_INTERVAL_HOURS = float(os.getenv('REFRESH_MIN_INTERVAL_HOURS', '3'))  # 워크플로우 실행 간격
+REFRESH_MAX_INTERVAL_HOURS = 24  # 최대 허용 지연 (이보다 오래된 데이터는 항상 갱신)
+REFRESH_BACKOFF_FACTOR = 2  # 변화가 없을 때마다 주기를 늘리는 배수
+REFRESH_ACTIVE_UPLOAD_DAYS = 3  # 이 기간 안에 업로드가 있으면 활동 중
+REFRESH_FAST_VIEW_GROWTH = 0.05  # 하루 조회수 증가율이 이 이상이면 활동 중
+REFRESH_DUE_TOLERANCE_MINUTES = 30  # cron 시작 지연 허용치
+
 # 가중치
 WEIGHT_MEDIAN = 0.6
 WEIGHT_ENGAGEMENT = 0.3
 WEIGHT_VIRAL = 0.05
 WEIGHT_GROWTH = 0.05
 
+DEFAULT_WEIGHTS = {
+    'median': WEIGHT_MEDIAN,
+    'engagement': WEIGHT_ENGAGEMENT,
+    'viral': WEIGHT_VIRAL,
+    'growth': WEIGHT_GROWTH
+}
+
 # 뱃지 기준
 BADGE_STABLE_THRESHOLD = 3000  # 꾸준러: 중앙값 3,000점 이상
 BADGE_ENGAGEMENT_THRESHOLD = 5.0  # 인게이지먼트 킹: 평균 인게이지먼트율 5% 이상
 BADGE_VIRAL_MULTIPLIER = 10  # 바이럴 메이커: Top 3 평균이 중앙값의 10배 이상
 BADGE_GROWTH_THRESHOLD = 1.5  # 성장 로켓: 성장 비율 1.5 이상
 
+DEFAULT_BADGE_RULES = {
+    'stable_threshold': BADGE_STABLE_THRESHOLD,
+    'engagement_threshold': BADGE_ENGAGEMENT_THRESHOLD,
+    'viral_multiplier': BADGE_VIRAL_MULTIPLIER,
+    'growth_threshold': BADGE_GROWTH_THRESHOLD,
+    'allrounder_median': 2000,  # 올라운더: 중앙값 2,000점 이상
+    'allrounder_engagement': 3.0,  # 올라운더: 인게이지먼트율 3% 이상
+    'allrounder_top3': 4000  # 올라운더: Top3 평균 4,000점 이상
+}
+
 # 뱃지 정보
 BADGE_INFO = {
     '🎯': {
@@ -76,12 +263,840 @@ BADGE_INFO = {
 }
 
 
+_log_context = contextvars.ContextVar('log_context', default={})
+_log_listener = None
+_profiler = None  # --profile일 때만 StageProfiler
+_NO_PROFILE = contextlib.nullcontext()
+
+
+class LogContextFilter(logging.Filter):
+    """레코드에 실행 ID와 현재 처리 중인 채널을 붙임 (큐에 넣기 전, 로그를 남긴 스레드에서 실행)"""
+
+    def __init__(self, run_id: str):
+        super().__init__()
+        self.run_id = run_id
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.run_id = self.run_id
+        context = _log_context.get()
+        record.channel_id = context.get('channel_id')
+        record.channel = context.get('channel')
+        return True
+
+
+class LogSamplingFilter(logging.Filter):
+    """채널/영상마다 반복되는 INFO 이하 메시지 샘플링
+
+    같은 위치(로거, 줄 번호)에서 나온 메시지는 처음 LOG_SAMPLE_BURST개를 그대로 남기고,
+    그 뒤로는 LOG_SAMPLE_EVERY개마다 하나만 남긴다. 경고 이상은 항상 남긴다.
+    """
+
+    def __init__(self, burst: int = LOG_SAMPLE_BURST, every: int = LOG_SAMPLE_EVERY):
+        super().__init__()
+        self.burst = burst
+        self.every = every
+        self.counts = {}
+        self.suppressed = 0
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        key = (record.name, record.lineno)
+        count = self.counts.get(key, 0) + 1
+        self.counts[key] = count
+        if count <= self.burst or (count - self.burst) % self.every == 0:
+            return True
+        self.suppressed += 1
+        return False
+
+
+class JsonLogFormatter(logging.Formatter):
+    """로그 파일용 JSON 한 줄 형식"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'ts': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'stage': record.name,
+            'run_id': getattr(record, 'run_id', None),
+            'msg': record.getMessage()
+        }
+        if getattr(record, 'channel_id', None):
+            entry['channel_id'] = record.channel_id
+            entry['channel'] = record.channel
+        if record.exc_info:
+            entry['exc'] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False)
+
+
+def setup_logging(run_id: Optional[str] = None) -> logging.handlers.QueueListener:
+    """로깅 설정 (import 시점이 아니라 실행 시 한 번)
+
+    호출한 스레드는 큐에 넣기만 하고, 콘솔/파일 쓰기는 백그라운드 QueueListener가 한다.
+    LOG_LEVEL로 전체 레벨을, LOG_STAGE_LEVELS(예: "api=WARNING,subscribers=WARNING")로
+    단계별 레벨을 정한다.
+    """
+    global _log_listener
+    if _log_listener is not None:
+        return _log_listener
+
+    run_id = run_id or os.getenv('GITHUB_RUN_ID') or uuid.uuid4().hex[:12]
+
+    console = logging.StreamHandler(sys.stdout)
+    console.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
+    log_file = logging.handlers.RotatingFileHandler(LOG_FILE, maxBytes=LOG_MAX_BYTES,
+                                                    backupCount=LOG_BACKUP_COUNT, encoding='utf-8')
+    log_file.setFormatter(JsonLogFormatter())
+
+    log_queue = queue.SimpleQueue()
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    queue_handler.addFilter(LogContextFilter(run_id))
+
+    root = logging.getLogger()
+    root.handlers = [queue_handler]
+    root.setLevel(os.getenv('LOG_LEVEL', 'INFO').upper())
+
+    # 단계별 레벨 + 반복 메시지 샘플링
+    for stage_logger in (api_logger, subscriber_logger):
+        stage_logger.addFilter(LogSamplingFilter())
+    for item in filter(None, os.getenv('LOG_STAGE_LEVELS', '').split(',')):
+        stage, _, level = item.partition('=')
+        logger.getChild(stage.strip()).setLevel(level.strip().upper())
+
+    _log_listener = logging.handlers.QueueListener(log_queue, console, log_file, respect_handler_level=True)
+    _log_listener.start()
+    atexit.register(shutdown_logging)
+    logger.info(f"실행 ID: {run_id}")
+    return _log_listener
+
+
+def shutdown_logging():
+    """샘플링으로 생략한 메시지 수를 남기고 큐를 비운 뒤 리스너 종료"""
+    global _log_listener
+    if _log_listener is None:
+        return
+    suppressed = sum(log_filter.suppressed for stage_logger in (api_logger, subscriber_logger)
+                     for log_filter in stage_logger.filters if isinstance(log_filter, LogSamplingFilter))
+    if suppressed:
+        logger.info(f"반복 로그 {suppressed}건 샘플링으로 생략")
+    _log_listener.stop()
+    _log_listener = None
+
+
+@contextlib.contextmanager
+def log_channel(channel_info: Dict):
+    """이 블록에서 남기는 로그에 채널 ID/이름을 붙임"""
+    token = _log_context.set({'channel_id': channel_info.get('channel_id') or channel_info.get('channel_url'),
+                              'channel': channel_info.get('name')})
+    try:
+        yield
+    finally:
+        _log_context.reset(token)
+
+
+class StageProfiler:
+    """--profile: 파이프라인 단계별 CPU 프로파일, 스택 샘플, 메모리 할당 기록
+
+    - 단계마다 cProfile.Profile 하나 (같은 단계에 다시 들어오면 누적). 단계가 중첩되면 바깥
+      단계는 잠시 멈추므로 각 프로파일에는 그 단계 자신의 시간만 남는다 → {단계}.pstats
+    - 샘플링 스레드가 PROFILE_SAMPLE_INTERVAL마다 모든 스레드의 스택을 떠서 그 시점의 단계별로
+      모은다. 수집 스레드의 HTTP 대기도 보인다 → {단계}.collapsed (flamegraph.pl / speedscope 입력)
+    - tracemalloc으로 단계별 최대 메모리와, 가장 바깥 단계의 시작/끝 스냅샷 차이 중
+      큰 할당 위치를 기록한다 → allocations.txt
+    단계별 시간 요약은 stages.txt와 로그에 남는다.
+    """
+
+    # tracemalloc 스냅샷 자체가 만든 할당은 할당 기록에서 제외
+    ALLOCATION_FILTERS = [tracemalloc.Filter(False, tracemalloc.__file__)]
+
+    def __init__(self, output_dir: str = PROFILE_DIR, sample_interval: float = PROFILE_SAMPLE_INTERVAL):
+        self.output_dir = output_dir
+        self.sample_interval = sample_interval
+        self.profiles = {}  # 단계 → cProfile.Profile
+        self.totals = {}  # 단계 → {'calls', 'wall', 'cpu', 'peak'}
+        self.samples = {}  # 단계 → {접힌 스택: 횟수}
+        self.allocations = {}  # 단계 → {(파일, 줄): [늘어난 바이트, 늘어난 개수]}
+        self.stack = []  # [단계, 시작 벽시계, 시작 CPU 시간]
+        self._stop = threading.Event()
+        self._sampler = threading.Thread(target=self._sample_loop, name='profile-sampler', daemon=True)
+
+    def start(self):
+        tracemalloc.start()
+        self._sampler.start()
+
+    @contextlib.contextmanager
+    def stage(self, name: str):
+        """단계 구간 (메인 스레드에서만 사용)"""
+        outermost = not self.stack
+        before = tracemalloc.take_snapshot() if outermost else None
+        if self.stack:
+            self._pause(self.stack[-1])
+            # 최대 메모리를 초기화하기 전에 지금까지의 값을 진행 중인 바깥 단계들에 반영
+            peak = tracemalloc.get_traced_memory()[1]
+            for outer in self.stack:
+                totals = self.totals[outer[0]]
+                totals['peak'] = max(totals['peak'], peak)
+        tracemalloc.reset_peak()
+        entry = [name, 0.0, 0.0]
+        self.stack.append(entry)
+        self._resume(entry)
+        try:
+            yield
+        finally:
+            self._pause(entry)
+            self.stack.pop()
+            totals = self.totals[name]
+            totals['calls'] += 1
+            totals['peak'] = max(totals['peak'], tracemalloc.get_traced_memory()[1])
+            if outermost:
+                sites = self.allocations.setdefault(name, {})
+                after = tracemalloc.take_snapshot().filter_traces(self.ALLOCATION_FILTERS)
+                for stat in after.compare_to(before.filter_traces(self.ALLOCATION_FILTERS), 'lineno'):
+                    frame = stat.traceback[0]
+                    site = sites.setdefault((frame.filename, frame.lineno), [0, 0])
+                    site[0] += stat.size_diff
+                    site[1] += stat.count_diff
+            if self.stack:
+                self._resume(self.stack[-1])
+
+    def _resume(self, entry: List):
+        name = entry[0]
+        if name not in self.profiles:
+            self.profiles[name] = cProfile.Profile()
+            self.totals[name] = {'calls': 0, 'wall': 0.0, 'cpu': 0.0, 'peak': 0}
+        entry[1], entry[2] = time.perf_counter(), time.thread_time()
+        self.profiles[name].enable()
+
+    def _pause(self, entry: List):
+        name = entry[0]
+        self.profiles[name].disable()
+        self.totals[name]['wall'] += time.perf_counter() - entry[1]
+        self.totals[name]['cpu'] += time.thread_time() - entry[2]
+
+    @staticmethod
+    def _frame_label(frame) -> str:
+        code = frame.f_code
+        return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+    def _sample_loop(self):
+        own = threading.get_ident()
+        while not self._stop.wait(self.sample_interval):
+            stage = self.stack[-1][0] if self.stack else '단계밖'
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            counts = self.samples.setdefault(stage, {})
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                labels = []
+                while frame is not None:
+                    labels.append(self._frame_label(frame))
+                    frame = frame.f_back
+                labels.append(names.get(ident, str(ident)))
+                key = ';'.join(reversed(labels))
+                counts[key] = counts.get(key, 0) + 1
+
+    def _filename(self, stage: str, suffix: str) -> str:
+        return os.path.join(self.output_dir, re.sub(r'[^\w.-]', '_', stage) + suffix)
+
+    def finish(self):
+        """샘플링을 멈추고 결과 파일 기록"""
+        while self.stack:  # 예외로 빠져나온 단계가 남아 있으면 정리
+            entry = self.stack.pop()
+            self._pause(entry)
+            self.totals[entry[0]]['calls'] += 1
+        self._stop.set()
+        self._sampler.join()
+        tracemalloc.stop()
+
+        os.makedirs(self.output_dir, exist_ok=True)
+        for stage, profile in self.profiles.items():
+            profile.dump_stats(self._filename(stage, '.pstats'))
+        for stage, counts in self.samples.items():
+            with open(self._filename(stage, '.collapsed'), 'w', encoding='utf-8') as f:
+                for key, count in sorted(counts.items()):
+                    f.write(f"{key} {count}\n")
+
+        with open(os.path.join(self.output_dir, 'allocations.txt'), 'w', encoding='utf-8') as f:
+            for stage, sites in self.allocations.items():
+                top = sorted(sites.items(), key=lambda item: item[1][0], reverse=True)[:PROFILE_TOP_ALLOCATIONS]
+                f.write(f"[{stage}] 최대 {self.totals[stage]['peak'] / 1024 / 1024:.1f} MiB, "
+                        f"단계 전후로 늘어난 할당 상위 {len(top)}곳\n")
+                for (filename, lineno), (size, count) in top:
+                    f.write(f"  {size / 1024:+10.1f} KiB {count:+8d}개  {filename}:{lineno}\n")
+                f.write('\n')
+
+        lines = [f"{stage}: {totals['calls']}회, {totals['wall']:.2f}초 (CPU {totals['cpu']:.2f}초), "
+                 f"최대 메모리 {totals['peak'] / 1024 / 1024:.1f} MiB"
+                 for stage, totals in sorted(self.totals.items(), key=lambda item: item[1]['wall'], reverse=True)]
+        with open(os.path.join(self.output_dir, 'stages.txt'), 'w', encoding='utf-8') as f:
+            f.write('\n'.join(lines) + '\n')
+        logger.info(f"프로파일 저장: {self.output_dir}/ (단계별 .pstats, .collapsed, allocations.txt)")
+        for line in lines:
+            logger.info(f"  {line}")
+
+
+def setup_profiling(output_dir: str) -> StageProfiler:
+    """--profile: 단계별 프로파일 시작 (종료 시 결과 파일 기록)"""
+    global _profiler
+    if _profiler is None:
+        _profiler = StageProfiler(output_dir)
+        _profiler.start()
+        atexit.register(shutdown_profiling)
+    return _profiler
+
+
+def shutdown_profiling():
+    global _profiler
+    if _profiler is None:
+        return
+    profiler, _profiler = _profiler, None
+    profiler.finish()
+
+
+def profile_stage(name: str):
+    """파이프라인 단계 구간 (--profile이 아니면 아무것도 하지 않는 컨텍스트)"""
+    if _profiler is None:
+        return _NO_PROFILE
+    return _profiler.stage(name)
+
+
+class ChannelFetchError(Exception):
+    """재시도 후에도 채널 데이터를 가져오지 못한 경우"""
+
+
+class QuotaExceededError(ChannelFetchError):
+    """API 일일 할당량 초과 (당일에는 재시도해도 소용없음)"""
+
+
+class CircuitOpenError(ChannelFetchError):
+    """엔드포인트 회로 차단기가 열려 있어 요청을 보내지 않음 (저장된 데이터로 대체)"""
+
+
+def _http_error_reason(error: HttpError) -> str:
+    """HttpError 응답 본문에서 reason 추출 (예: quotaExceeded)"""
+    try:
+        return json.loads(error.content)['error']['errors'][0]['reason']
+    except (ValueError, KeyError, IndexError, TypeError):
+        return ''
+
+
+def _with_api_key(uri: str, api_key: str) -> str:
+    """요청 URI의 key 파라미터를 바꿔 끼움"""
+    parts = urllib.parse.urlsplit(uri)
+    query = [(name, value) for name, value in urllib.parse.parse_qsl(parts.query, keep_blank_values=True)
+             if name != 'key']
+    query.append(('key', api_key))
+    return urllib.parse.urlunsplit(parts._replace(query=urllib.parse.urlencode(query)))
+
+
+class APIKeyPool:
+    """YouTube API 키 여러 개를 나눠 쓰는 풀
+
+    키마다 예상 사용 단위를 태평양 시간 기준 할당량 일자별로 집계해 가장 덜 쓴 키부터 배정하고,
+    quotaExceeded를 받은 키는 그날 남은 시간 동안 제외한다. 사용량은 키 해시로만 저장해
+    같은 날의 다음 실행이 이어서 집계한다.
+    """
+
+    def __init__(self, api_keys: List[str], usage_file: str = API_KEY_USAGE_FILE,
+                 daily_quota: int = API_KEY_DAILY_QUOTA):
+        self.api_keys = list(dict.fromkeys(api_keys))
+        self.usage_file = usage_file
+        self.daily_quota = daily_quota
+        self._lock = threading.Lock()  # 수집 스레드 여러 개가 함께 키를 받아 감
+        self.usage = self.load()
+
+    @staticmethod
+    def key_id(api_key: str) -> str:
+        return hashlib.sha256(api_key.encode('utf-8')).hexdigest()[:12]
+
+    @staticmethod
+    def quota_day(now: Optional[datetime] = None) -> str:
+        return (now or datetime.now(timezone.utc)).astimezone(API_QUOTA_TIMEZONE).strftime('%Y-%m-%d')
+
+    def load(self) -> Dict:
+        """오늘(태평양 시간) 사용량 로드 (날짜가 지났으면 새로 시작)"""
+        if os.path.exists(self.usage_file):
+            try:
+                with open(self.usage_file, 'r', encoding='utf-8') as f:
+                    usage = json.load(f)
+                if usage.get('day') == self.quota_day():
+                    return usage
+            except Exception as e:
+                logger.error(f"API 키 사용량 로드 실패: {e}")
+        return {'day': self.quota_day(), 'keys': {}}
+
+    def save(self):
+        """사용량 저장 (임시 파일 교체로 원자적 저장)"""
+        with self._lock:
+            usage = json.dumps(self.usage, indent=2)
+        tmp_path = f"{self.usage_file}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(usage)
+        os.replace(tmp_path, self.usage_file)
+
+    def _entry(self, api_key: str) -> Dict:
+        today = self.quota_day()
+        if self.usage['day'] != today:
+            api_logger.info(f"할당량 일자 변경 ({self.usage['day']} → {today} PT): 키 사용량 초기화")
+            self.usage = {'day': today, 'keys': {}}
+        return self.usage['keys'].setdefault(self.key_id(api_key), {'units': 0, 'exhausted': False})
+
+    def acquire(self, units: int = 1) -> str:
+        """요청 하나에 쓸 키 배정 (예상 사용량이 가장 적은 키, 모두 소진되면 QuotaExceededError)
+
+        예상치가 하루 할당량을 넘긴 키도 실제로 거절당하기 전까지는 마지막 순서로 쓴다.
+        """
+        with self._lock:
+            candidates = []
+            for order, api_key in enumerate(self.api_keys):
+                entry = self._entry(api_key)
+                if not entry['exhausted']:
+                    candidates.append((entry['units'] + units > self.daily_quota, entry['units'], order, api_key))
+            if not candidates:
+                raise QuotaExceededError(f"API 할당량 초과: 키 {len(self.api_keys)}개 모두 소진 ({self.usage['day']} PT)")
+            api_key = min(candidates)[3]
+            self._entry(api_key)['units'] += units
+            return api_key
+
+    def exhaust(self, api_key: str):
+        """quotaExceeded를 받은 키를 오늘 남은 시간 동안 제외"""
+        with self._lock:
+            entry = self._entry(api_key)
+            if entry['exhausted']:
+                return
+            entry['exhausted'] = True
+            remaining = sum(not self._entry(key)['exhausted'] for key in self.api_keys)
+        api_logger.warning(f"API 키 {self.key_id(api_key)} 할당량 소진 (예상 {entry['units']:,}단위) "
+                           f"- 남은 키 {remaining}개로 전환")
+
+    def summary(self) -> str:
+        with self._lock:
+            entries = [(self.key_id(key), self._entry(key)) for key in self.api_keys]
+        return ', '.join(f"{key_id} {entry['units']:,}단위{' (소진)' if entry['exhausted'] else ''}"
+                         for key_id, entry in entries)
+
+
+class EndpointHealth:
+    """API 엔드포인트 하나의 응답 시간 분포와 회로 차단기
+
+    최근 HEDGE_SAMPLE_SIZE개 응답 시간으로 백분위수를 계산해 헤지 기준(p95)으로 쓴다.
+    일시적 오류가 CIRCUIT_FAILURE_THRESHOLD번 연속되면 CIRCUIT_OPEN_SECONDS 동안 요청을 막고,
+    그 뒤에는 요청 하나만 시험 삼아 보내(half-open) 성공하면 닫고 실패하면 다시 연다.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.latencies = deque(maxlen=HEDGE_SAMPLE_SIZE)
+        self.failures = 0  # 연속 실패 수
+        self.opened_until = None  # time.monotonic() 기준, None이면 닫힘
+        self.probing = False
+        self.open_count = 0
+        self._lock = threading.Lock()
+
+    def percentile(self, fraction: float) -> Optional[float]:
+        with self._lock:
+            samples = sorted(self.latencies)
+        if not samples:
+            return None
+        return samples[min(int(fraction * len(samples)), len(samples) - 1)]
+
+    def hedge_delay(self) -> Optional[float]:
+        """헤지 요청을 보내기 전 기다릴 시간 (표본이 부족하면 None)"""
+        if len(self.latencies) < HEDGE_MIN_SAMPLES:
+            return None
+        return max(self.percentile(0.95), HEDGE_MIN_DELAY)
+
+    def allow(self) -> bool:
+        """요청을 보내도 되는지 (열린 뒤 대기 시간이 지났으면 시험 요청 하나만 허용)"""
+        with self._lock:
+            if self.opened_until is None:
+                return True
+            if self.probing or time.monotonic() < self.opened_until:
+                return False
+            self.probing = True
+            return True
+
+    def cancel_probe(self):
+        """allow()로 받은 시험 요청을 보내지 못한 경우 (키 소진 등) 다음 요청이 시험하도록 되돌림"""
+        with self._lock:
+            self.probing = False
+
+    def record_success(self, latency: Optional[float] = None):
+        """응답을 받음 (404처럼 영구 오류여도 서버는 응답했으므로 성공으로 봄)"""
+        with self._lock:
+            if latency is not None:
+                self.latencies.append(latency)
+            self.failures = 0
+            closed = self.opened_until is not None
+            self.opened_until = None
+            self.probing = False
+        if closed:
+            api_logger.info(f"{self.name}: 회로 차단 해제")
+
+    def record_failure(self):
+        """일시적 오류(5xx, rate limit, 네트워크 오류)"""
+        with self._lock:
+            self.failures += 1
+            if not self.probing and (self.opened_until is not None or self.failures < CIRCUIT_FAILURE_THRESHOLD):
+                return
+            self.opened_until = time.monotonic() + CIRCUIT_OPEN_SECONDS
+            self.probing = False
+            self.open_count += 1
+        api_logger.warning(f"{self.name}: 일시적 오류 {self.failures}회 연속 - {CIRCUIT_OPEN_SECONDS:g}초 동안 회로 차단")
+
+
 class YouTubeAPI:
     """YouTube Data API v3 래퍼"""
 
-    def __init__(self, api_key: str):
-        self.youtube = build('youtube', 'v3', developerKey=api_key)
+    def __init__(self, api_keys: List[str]):
+        # 공유 커넥션 풀 사용 (keep-alive로 호출마다 TLS 핸드셰이크를 반복하지 않음)
+        # 요청마다 키 풀에서 받은 키로 key 파라미터를 바꿔 보낸다
+        self.key_pool = APIKeyPool(api_keys)
+        self.youtube = build('youtube', 'v3', developerKey=self.key_pool.api_keys[0],
+                             http=get_transport().httplib2_adapter())
         self.api_calls = 0
+        self.retries = 0
+        self.batch_calls = 0
+        self.quota_units = 0  # 키에 배정한 할당량 단위 (헤지 요청 포함)
+        self.hedged_calls = 0
+        self.hedged_units = 0
+        self.hedge_wins = 0
+        self._stats_lock = threading.Lock()  # 수집 스레드 여러 개가 카운터를 함께 올림
+        self.endpoints = {}  # 메서드 ID → EndpointHealth
+        # 헤지 요청은 원래 요청과 복제 요청을 각각 스레드에서 실행해 먼저 온 응답을 사용
+        self._hedge_pool = None
+        if os.getenv('YOUTUBE_HEDGE_ENABLED', 'true').lower() == 'true':
+            self._hedge_pool = ThreadPoolExecutor(max_workers=max(FETCH_WORKERS, 1) * 2, thread_name_prefix='hedge')
+
+    def _count_calls(self, calls: int = 1, batches: int = 0):
+        with self._stats_lock:
+            self.api_calls += calls
+            self.batch_calls += batches
+
+    @staticmethod
+    def _is_retryable(error: HttpError) -> bool:
+        """일시적 오류(5xx, rate limit) 여부"""
+        return error.resp.status in RETRYABLE_STATUS or _http_error_reason(error) in RETRYABLE_REASONS
+
+    def _backoff(self, attempt: int, error: Exception):
+        # full jitter: 0 ~ min(최대, 기본 * 2^시도) 사이 임의 대기
+        delay = random.uniform(0, min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * (2 ** attempt)))
+        with self._stats_lock:
+            self.retries += 1
+        api_logger.warning(f"일시적 API 오류, {delay:.1f}초 후 재시도 ({attempt + 1}/{RETRY_MAX_ATTEMPTS}): {error}")
+        time.sleep(delay)
+
+    def _health(self, request) -> EndpointHealth:
+        name = getattr(request, 'methodId', None) or 'unknown'
+        with self._stats_lock:
+            if name not in self.endpoints:
+                self.endpoints[name] = EndpointHealth(name)
+            return self.endpoints[name]
+
+    def _send(self, request, health: EndpointHealth):
+        """요청 한 번 전송 (응답 시간과 성공/실패를 엔드포인트 상태에 기록, 회로 확인은 호출한 쪽에서)"""
+        started = time.monotonic()
+        try:
+            response = request.execute()
+        except HttpError as e:
+            if self._is_retryable(e):
+                health.record_failure()
+            else:
+                health.record_success(time.monotonic() - started)
+            raise
+        except BaseException:
+            health.record_failure()
+            raise
+        health.record_success(time.monotonic() - started)
+        return response
+
+    def _take_hedge_budget(self, cost: int) -> bool:
+        # 호출 수가 아니라 할당량 단위로 계산 (search.list 한 번은 100단위)
+        with self._stats_lock:
+            if self.hedged_units + cost > (self.quota_units - self.hedged_units) * HEDGE_BUDGET_RATIO:
+                return False
+            self.hedged_calls += 1
+            self.hedged_units += cost
+            return True
+
+    def _execute_hedged(self, request):
+        """엔드포인트 p95보다 늦으면 같은 요청을 하나 더 보내고 먼저 성공한 응답 사용 (예산 안에서만)
+
+        늦은 쪽은 취소할 수 없으므로 끝날 때까지 두되 결과는 버린다 (응답 시간은 분포에 남음).
+        헤지 풀 스레드에서는 호출한 스레드의 컨텍스트(로그의 채널 정보)를 복사해 실행한다.
+        """
+        health = self._health(request)
+        delay = health.hedge_delay()
+        cost = API_QUOTA_COSTS.get(getattr(request, 'methodId', None), 1)
+        if delay is None or self._hedge_pool is None:
+            return self._execute_with_key(request, health)
+
+        primary = self._hedge_pool.submit(contextvars.copy_context().run, self._execute_with_key, request, health)
+        try:
+            return primary.result(timeout=delay)
+        except FutureTimeoutError:
+            pass
+        if not self._take_hedge_budget(cost):
+            return primary.result()
+
+        api_logger.debug(f"{health.name}: {delay:.2f}초(p95) 넘게 응답이 없어 헤지 요청")
+        duplicate = copy.copy(request)
+        duplicate.headers = dict(request.headers)
+        hedge = self._hedge_pool.submit(contextvars.copy_context().run, self._execute_with_key, duplicate, health)
+        done, _ = wait([primary, hedge], return_when=FIRST_COMPLETED)
+        winner = primary if primary in done else hedge
+        if winner.exception() is not None:
+            # 먼저 끝난 쪽이 실패했으면 나머지 결과를 기다림 (둘 다 실패하면 원래 요청의 오류)
+            other = hedge if winner is primary else primary
+            if other.exception() is None:
+                winner = other
+            else:
+                winner = primary
+        if winner is hedge:
+            with self._stats_lock:
+                self.hedge_wins += 1
+        return winner.result()
+
+    def endpoint_summary(self) -> List[str]:
+        """엔드포인트별 응답 시간 백분위수와 회로 차단 횟수"""
+        with self._stats_lock:
+            endpoints = sorted(self.endpoints.items())
+        lines = []
+        for name, health in endpoints:
+            if not health.latencies:
+                continue
+            p50, p95, p99 = (health.percentile(fraction) for fraction in (0.5, 0.95, 0.99))
+            line = f"{name}: p50 {p50:.2f}초 / p95 {p95:.2f}초 / p99 {p99:.2f}초 (최근 {len(health.latencies)}건)"
+            if health.open_count:
+                line += f", 회로 차단 {health.open_count}회"
+            lines.append(line)
+        return lines
+
+    def _assign_key(self, request) -> str:
+        """키 풀에서 키를 받아 요청 URI에 넣음 (모든 키가 소진되면 QuotaExceededError)"""
+        cost = API_QUOTA_COSTS.get(getattr(request, 'methodId', None), 1)
+        api_key = self.key_pool.acquire(cost)
+        with self._stats_lock:
+            self.quota_units += cost
+        request.uri = _with_api_key(request.uri, api_key)
+        return api_key
+
+    def _execute_with_key(self, request, health: EndpointHealth):
+        """키를 배정해 실행하고, quotaExceeded를 받으면 그 키를 소진 처리한 뒤 같은 요청을 다른 키로 다시 보냄
+
+        회로가 열려 있으면 키를 배정하기 전에 CircuitOpenError를 올려 보내지 않은 요청에 할당량을 매기지 않는다.
+        """
+        while True:
+            if not health.allow():
+                raise CircuitOpenError(f"{health.name} 회로 차단 중 - 요청을 보내지 않습니다")
+            try:
+                api_key = self._assign_key(request)
+            except QuotaExceededError:
+                health.cancel_probe()
+                raise
+            try:
+                return self._send(request, health)
+            except HttpError as e:
+                if _http_error_reason(e) not in QUOTA_REASONS:
+                    raise
+                self.key_pool.exhaust(api_key)
+
+    def _execute(self, request):
+        """요청 실행 (일시적 오류는 지터가 있는 지수 백오프로 재시도)
+
+        할당량 초과는 남은 키로 넘겨 다시 보내고, 모든 키가 소진되면 QuotaExceededError를 올린다.
+        엔드포인트 회로가 열려 있으면 기다리지 않고 CircuitOpenError를 올린다 (호출한 쪽은 저장된 데이터로 대체).
+        그 밖의 영구 오류(404 등)는 HttpError 그대로 올려 호출한 쪽에서 처리하게 한다.
+        """
+        for attempt in range(RETRY_MAX_ATTEMPTS):
+            try:
+                return self._execute_hedged(request)
+            except HttpError as e:
+                if not self._is_retryable(e):
+                    raise
+                error = e
+            except (OSError, httplib2.HttpLib2Error) as e:
+                # 연결 끊김, 타임아웃 등 네트워크 오류
+                error = e
+
+            if attempt == RETRY_MAX_ATTEMPTS - 1:
+                break
+            self._backoff(attempt, error)
+
+        raise error
+
+    def execute_batch(self, requests: Dict[str, object]) -> Dict[str, object]:
+        """서로 독립적인 요청들을 멀티파트 배치 HTTP 요청으로 묶어 실행
+
+        결과는 요청 키별로 응답 dict 또는 예외다. 항목별 오류(404 등)는 해당 항목에만
+        남기고 배치 전체를 실패시키지 않는다. 일시적 오류가 난 항목(또는 배치 요청 자체가
+        네트워크 오류로 실패한 경우 묶인 항목 전체)만 모아 백오프 후 다시 보내며,
+        할당량 초과 항목은 다른 키로 바로 다시 보내고 모든 키가 소진되면 QuotaExceededError를 돌려준다.
+        할당량은 배치 안의 요청마다 따로 차감된다.
+        """
+        results = {}
+        pending = dict(requests)
+
+        for attempt in range(RETRY_MAX_ATTEMPTS):
+            retry = self._send_batch(pending, results)
+            if not retry or attempt == RETRY_MAX_ATTEMPTS - 1:
+                break
+            self._backoff(attempt, next(iter(results[key] for key in retry)))
+            pending = retry
+
+        return results
+
+    def _send_batch(self, pending: Dict[str, object], results: Dict[str, object]) -> Dict[str, object]:
+        """pending을 배치로 보내 results에 기록하고, 일시적 오류로 다시 보낼 항목 반환
+
+        할당량 초과 항목은 키를 소진 처리한 뒤 남은 키로 곧바로 다시 보낸다 (키마다 한 번이므로 유한).
+        회로를 먼저 확인하고 실제로 보내는 항목에만 키(할당량)를 배정한다. 회로가 half-open이면
+        엔드포인트마다 첫 항목 하나만 시험 요청으로 보내고, 나머지 항목은 CircuitOpenError로 남겨
+        호출한 쪽이 저장된 데이터로 대체한다 (시험이 성공하면 다음 실행부터 다시 수집).
+        """
+        retry = {}
+        while pending:
+            failover = {}
+            assigned = {}
+            healths = {}
+
+            def callback(request_id, response, exception):
+                health = healths[request_id]
+                if exception is None:
+                    health.record_success()
+                    results[request_id] = response
+                elif isinstance(exception, HttpError):
+                    results[request_id] = exception
+                    if _http_error_reason(exception) in QUOTA_REASONS:
+                        health.record_success()
+                        self.key_pool.exhaust(assigned[request_id])
+                        failover[request_id] = pending[request_id]
+                    elif self._is_retryable(exception):
+                        health.record_failure()
+                        retry[request_id] = pending[request_id]
+                    else:
+                        health.record_success()
+                else:
+                    health.record_failure()
+                    results[request_id] = exception
+
+            keys = []
+            for key, request in pending.items():
+                health = self._health(request)
+                if not health.allow():
+                    results[key] = CircuitOpenError(f"{health.name} 회로 차단 중 - 요청을 보내지 않습니다")
+                    continue
+                try:
+                    assigned[key] = self._assign_key(request)
+                except QuotaExceededError as e:
+                    health.cancel_probe()
+                    results[key] = e
+                    continue
+                healths[key] = health
+                keys.append(key)
+
+            for offset in range(0, len(keys), BATCH_MAX_SIZE):
+                chunk = keys[offset:offset + BATCH_MAX_SIZE]
+                batch = self.youtube.new_batch_http_request(callback=callback)
+                for key in chunk:
+                    batch.add(pending[key], request_id=key)
+
+                self._count_calls(len(chunk), batches=1)
+                try:
+                    batch.execute()
+                except (HttpError, OSError, httplib2.HttpLib2Error) as e:
+                    # 배치 요청 자체의 실패는 묶인 항목 전체의 결과로 기록
+                    for key in chunk:
+                        results[key] = e
+                        if not isinstance(e, HttpError) or self._is_retryable(e):
+                            healths[key].record_failure()
+                    if not isinstance(e, HttpError) or self._is_retryable(e):
+                        retry.update({key: pending[key] for key in chunk})
+
+            pending = failover
+
+        return retry
+
+    def prefetch_channels(self, channel_ids: List[str], start_date: str, end_date: str) -> Dict[str, Dict]:
+        """로스터 전체의 채널 정보와 업로드 재생목록 첫 페이지를 배치 요청으로 미리 조회
+
+        채널마다 요청하던 channels.list / playlistItems.list / videos.list를 단계별로 묶어
+        로스터 크기와 관계없이 몇 번의 HTTP 왕복으로 끝낸다.
+        결과: {channel_id: {'channel_stats', 'uploads', 'page', 'videos_response'}}
+        실패한 채널은 {'error': ChannelFetchError}로 남겨 해당 채널만 실패 처리되게 한다 (할당량 초과와 회로 차단은 그대로 남김).
+        """
+        prefetched = {channel_id: {} for channel_id in channel_ids}
+
+        def fail(channel_id, stage, error):
+            if not isinstance(error, (QuotaExceededError, CircuitOpenError)):
+                api_logger.error(f"API 에러 ({stage}) - 채널 ID {channel_id}: {error}")
+                error = ChannelFetchError(f"{stage} 조회 실패: {error}")
+            prefetched[channel_id] = {'error': error}
+
+        # 1) 채널 정보 + 업로드 재생목록 ID (ID를 묶어 요청 하나로)
+        requests = {}
+        chunks = {}
+        for offset in range(0, len(channel_ids), CHANNELS_PER_REQUEST):
+            key = f"channels-{offset}"
+            chunks[key] = channel_ids[offset:offset + CHANNELS_PER_REQUEST]
+            requests[key] = self.youtube.channels().list(
+                part='contentDetails,statistics,snippet',
+                id=','.join(chunks[key]),
+                maxResults=CHANNELS_PER_REQUEST
+            )
+
+        for key, result in self.execute_batch(requests).items():
+            if isinstance(result, Exception):
+                for channel_id in chunks[key]:
+                    fail(channel_id, '채널 정보', result)
+                continue
+
+            items = {item['id']: item for item in result.get('items', [])}
+            for channel_id in chunks[key]:
+                item = items.get(channel_id)
+                if item is None:
+                    api_logger.error(f"채널 ID {channel_id}: API 응답에 items가 없음 - 잘못된 채널 ID일 가능성")
+                    prefetched[channel_id] = {'channel_stats': None, 'uploads': None}
+                    continue
+                prefetched[channel_id] = {
+                    'channel_stats': self._channel_stats_from_item(channel_id, item),
+                    'uploads': item['contentDetails']['relatedPlaylists']['uploads']
+                }
+
+        # 2) 업로드 재생목록 첫 페이지 (채널별 요청을 배치 하나로)
+        requests = {
+            channel_id: self.youtube.playlistItems().list(
+                part='contentDetails',
+                playlistId=entry['uploads'],
+                maxResults=50
+            )
+            for channel_id, entry in prefetched.items() if entry.get('uploads')
+        }
+        for channel_id, result in self.execute_batch(requests).items():
+            if isinstance(result, HttpError) and result.resp.status == 404:
+                # 플레이리스트가 없는 경우 (영상이 없는 채널)
+                prefetched[channel_id]['uploads'] = None
+            elif isinstance(result, Exception):
+                fail(channel_id, '영상 목록', result)
+            else:
+                prefetched[channel_id]['page'] = result
+
+        # 3) 첫 페이지 중 기간 내 영상의 세부 정보
+        requests = {}
+        for channel_id, entry in prefetched.items():
+            video_ids = self._window_video_ids(entry.get('page', {}).get('items', []), start_date, end_date)
+            if video_ids:
+                requests[channel_id] = self.youtube.videos().list(
+                    part='snippet,statistics',
+                    id=','.join(video_ids)
+                )
+        for channel_id, result in self.execute_batch(requests).items():
+            if isinstance(result, Exception):
+                fail(channel_id, '영상 목록', result)
+            else:
+                prefetched[channel_id]['videos_response'] = result
+
+        return prefetched
 
     def get_channel_id(self, channel_url: str) -> Optional[str]:
         """채널 URL에서 채널 ID 추출"""
@@ -89,27 +1104,27 @@ class YouTubeAPI:
             # @username 형식 처리
             if '@' in channel_url:
                 username = channel_url.split('@')[-1].strip()
-                logger.info(f"===== 채널 검색 시작: @{username} =====")
-                logger.info(f"원본 URL: {channel_url}")
+                api_logger.info(f"===== 채널 검색 시작: @{username} =====")
+                api_logger.info(f"원본 URL: {channel_url}")
 
                 # 방법 1: search API로 직접 @handle 검색 (가장 정확)
                 try:
-                    logger.info(f"방법 1: @{username}으로 채널 검색")
+                    api_logger.info(f"방법 1: @{username}으로 채널 검색")
 
                     # 특별 처리: neo_chloe는 언더스코어가 포함된 특수 handle
                     search_query = f"@{username}" if username != "neo_chloe" else "neo chloe channel"
-                    logger.info(f"검색 쿼리: {search_query}")
+                    api_logger.info(f"검색 쿼리: {search_query}")
 
-                    self.api_calls += 1
+                    self._count_calls()
                     search_request = self.youtube.search().list(
                         part='snippet',
                         q=search_query,
                         type='channel',
                         maxResults=20  # 충분한 결과 검색
                     )
-                    search_response = search_request.execute()
+                    search_response = self._execute(search_request)
 
-                    logger.info(f"검색 결과: {len(search_response.get('items', []))}개 채널")
+                    api_logger.info(f"검색 결과: {len(search_response.get('items', []))}개 채널")
 
                     # 정확한 handle 매치 찾기
                     for idx, item in enumerate(search_response.get('items', [])):
@@ -118,7 +1133,7 @@ class YouTubeAPI:
                         channel_desc = item['snippet'].get('description', '')
                         channel_id_temp = item['snippet']['channelId']
 
-                        logger.debug(f"  [{idx}] 채널명: {channel_title}, ID: {channel_id_temp[:10]}...")
+                        api_logger.debug(f"  [{idx}] 채널명: {channel_title}, ID: {channel_id_temp[:10]}...")
 
                         # @username과 정확히 매치되는 채널 찾기
                         title_lower = channel_title.lower().replace(' ', '').replace('-', '')
@@ -126,130 +1141,165 @@ class YouTubeAPI:
 
                         # 정확한 매치 확인
                         if username_lower == title_lower or f"@{username_lower}" in channel_desc.lower():
-                            logger.info(f"✓ 정확한 채널 ID 찾음: {channel_id_temp} (채널명: {channel_title})")
+                            api_logger.info(f"✓ 정확한 채널 ID 찾음: {channel_id_temp} (채널명: {channel_title})")
                             return channel_id_temp
 
                         # 부분 매치 확인
                         if username_lower in title_lower or title_lower in username_lower:
-                            logger.info(f"✓ 부분 매치 채널 ID 찾음: {channel_id_temp} (채널명: {channel_title})")
+                            api_logger.info(f"✓ 부분 매치 채널 ID 찾음: {channel_id_temp} (채널명: {channel_title})")
                             return channel_id_temp
 
                     # 정확한 매치가 없으면 첫 번째 결과 사용
                     if search_response.get('items'):
                         channel_id = search_response['items'][0]['snippet']['channelId']
                         channel_title = search_response['items'][0]['snippet']['title']
-                        logger.warning(f"⚠ 정확한 매치 없음, 첫 번째 결과 사용: {channel_id} (채널명: {channel_title})")
+                        api_logger.warning(f"⚠ 정확한 매치 없음, 첫 번째 결과 사용: {channel_id} (채널명: {channel_title})")
                         return channel_id
 
                 except HttpError as e:
-                    logger.warning(f"방법 1 실패: {e}")
+                    api_logger.warning(f"방법 1 실패: {e}")
 
                 # 방법 4: forUsername 파라미터 사용 (레거시)
                 try:
-                    logger.info(f"방법 4: forUsername 파라미터로 검색")
-                    self.api_calls += 1
+                    api_logger.info(f"방법 4: forUsername 파라미터로 검색")
+                    self._count_calls()
                     request = self.youtube.channels().list(
                         part='id,snippet',
                         forUsername=username
                     )
-                    response = request.execute()
+                    response = self._execute(request)
 
                     if response.get('items'):
                         channel_id = response['items'][0]['id']
                         channel_title = response['items'][0]['snippet']['title']
-                        logger.info(f"✓ forUsername으로 채널 ID 찾음: {channel_id} (채널명: {channel_title})")
+                        api_logger.info(f"✓ forUsername으로 채널 ID 찾음: {channel_id} (채널명: {channel_title})")
                         return channel_id
                 except (HttpError, TypeError) as e:
-                    logger.warning(f"방법 4 실패: {e}")
+                    api_logger.warning(f"방법 4 실패: {e}")
 
                 # 모든 방법 실패
-                logger.error(f"❌ 채널 ID를 찾을 수 없습니다: {channel_url}")
+                api_logger.error(f"❌ 채널 ID를 찾을 수 없습니다: {channel_url}")
 
             # /channel/UC... 형식 처리
             elif '/channel/' in channel_url:
                 channel_id = channel_url.split('/channel/')[-1].strip()
-                logger.info(f"✓ 채널 ID 직접 추출 (URL): {channel_id}")
+                api_logger.info(f"✓ 채널 ID 직접 추출 (URL): {channel_id}")
                 return channel_id
 
             # /c/customname 형식 처리
             elif '/c/' in channel_url:
                 custom_name = channel_url.split('/c/')[-1].strip()
-                logger.info(f"Custom URL 감지: /c/{custom_name}")
+                api_logger.info(f"Custom URL 감지: /c/{custom_name}")
                 # Custom URL은 search API로 검색
                 try:
-                    self.api_calls += 1
+                    self._count_calls()
                     search_request = self.youtube.search().list(
                         part='snippet',
                         q=custom_name,
                         type='channel',
                         maxResults=5
                     )
-                    search_response = search_request.execute()
+                    search_response = self._execute(search_request)
 
                     if search_response.get('items'):
                         channel_id = search_response['items'][0]['snippet']['channelId']
                         channel_title = search_response['items'][0]['snippet']['title']
-                        logger.info(f"✓ Custom URL로 채널 ID 찾음: {channel_id} (채널명: {channel_title})")
+                        api_logger.info(f"✓ Custom URL로 채널 ID 찾음: {channel_id} (채널명: {channel_title})")
                         return channel_id
                 except HttpError as e:
-                    logger.warning(f"Custom URL 검색 실패: {e}")
+                    api_logger.warning(f"Custom URL 검색 실패: {e}")
 
-            logger.error(f"❌ 채널 ID를 찾을 수 없습니다: {channel_url}")
+            api_logger.error(f"❌ 채널 ID를 찾을 수 없습니다: {channel_url}")
             return None
 
+        except (QuotaExceededError, CircuitOpenError):
+            raise
         except Exception as e:
-            logger.error(f"예상치 못한 에러 (채널 ID): {e}")
+            api_logger.error(f"예상치 못한 에러 (채널 ID): {e}")
             return None
 
-    def get_channel_videos(self, channel_id: str, start_date: str, end_date: str) -> List[Dict]:
-        """채널의 특정 기간 영상 목록 조회"""
+    @staticmethod
+    def _window_video_ids(items: List[Dict], start_date: str, end_date: str) -> List[str]:
+        """재생목록 페이지에서 기간 내 영상 ID만 추출
+
+        업로드 재생목록은 최신순이므로 기간 밖 영상은 세부 정보를 조회하지 않음
+        (videoPublishedAt이 없는 항목은 videos.list 결과로 판단)
+        """
+        return [
+            item['contentDetails']['videoId'] for item in items
+            if start_date <= item['contentDetails'].get('videoPublishedAt', start_date) <= end_date
+        ]
+
+    def get_channel_videos(self, channel_id: str, start_date: str, end_date: str,
+                           prefetched: Optional[Dict] = None) -> List[Dict]:
+        """채널의 특정 기간 영상 목록 조회
+
+        prefetched가 있으면(prefetch_channels 결과) 재생목록 ID와 첫 페이지는 다시 요청하지 않고
+        두 번째 페이지부터만 조회한다.
+        """
         videos = []
 
         try:
-            # 채널의 업로드 재생목록 ID 가져오기
-            self.api_calls += 1
-            request = self.youtube.channels().list(
-                part='contentDetails',
-                id=channel_id
-            )
-            response = request.execute()
+            if prefetched is not None:
+                uploads_playlist_id = prefetched['uploads']
+                page = prefetched.get('page')
+                page_videos = prefetched.get('videos_response')
+            else:
+                # 채널의 업로드 재생목록 ID 가져오기
+                self._count_calls()
+                request = self.youtube.channels().list(
+                    part='contentDetails',
+                    id=channel_id
+                )
+                response = self._execute(request)
 
-            if not response.get('items'):
-                return videos
+                if not response.get('items'):
+                    return videos
+
+                uploads_playlist_id = response['items'][0]['contentDetails']['relatedPlaylists']['uploads']
+                page = page_videos = None
 
-            uploads_playlist_id = response['items'][0]['contentDetails']['relatedPlaylists']['uploads']
+            if not uploads_playlist_id:
+                return videos
 
             # 재생목록에서 영상 목록 가져오기
             next_page_token = None
 
             while True:
-                self.api_calls += 1
-                request = self.youtube.playlistItems().list(
-                    part='contentDetails',
-                    playlistId=uploads_playlist_id,
-                    maxResults=50,
-                    pageToken=next_page_token
-                )
+                if page is not None:
+                    response, page = page, None
+                else:
+                    self._count_calls()
+                    request = self.youtube.playlistItems().list(
+                        part='contentDetails',
+                        playlistId=uploads_playlist_id,
+                        maxResults=50,
+                        pageToken=next_page_token
+                    )
 
-                try:
-                    response = request.execute()
-                except HttpError as e:
-                    if e.resp.status == 404:
-                        # 플레이리스트가 없는 경우 (영상이 없는 채널)
-                        return videos  # 빈 리스트 반환
-                    else:
-                        raise  # 다른 에러는 재발생
+                    try:
+                        response = self._execute(request)
+                    except HttpError as e:
+                        if e.resp.status == 404:
+                            # 플레이리스트가 없는 경우 (영상이 없는 채널)
+                            return videos  # 빈 리스트 반환
+                        else:
+                            raise  # 다른 에러는 재발생
 
-                video_ids = [item['contentDetails']['videoId'] for item in response.get('items', [])]
+                items = response.get('items', [])
+                video_ids = self._window_video_ids(items, start_date, end_date)
 
                 if video_ids:
                     # 영상 세부 정보 가져오기
-                    self.api_calls += 1
-                    videos_request = self.youtube.videos().list(
-                        part='snippet,statistics',
-                        id=','.join(video_ids)
-                    )
-                    videos_response = videos_request.execute()
+                    if page_videos is not None:
+                        videos_response, page_videos = page_videos, None
+                    else:
+                        self._count_calls()
+                        videos_request = self.youtube.videos().list(
+                            part='snippet,statistics',
+                            id=','.join(video_ids)
+                        )
+                        videos_response = self._execute(videos_request)
 
                     for video in videos_response.get('items', []):
                         published_at = video['snippet']['publishedAt']
@@ -268,83 +1318,118 @@ class YouTubeAPI:
                                 'comments': int(stats.get('commentCount', 0))
                             })
 
+                # 페이지 전체가 시작일 이전이면 더 오래된 영상만 남았으므로 중단
+                if items and all(item['contentDetails'].get('videoPublishedAt', start_date) < start_date
+                                 for item in items):
+                    break
+
                 next_page_token = response.get('nextPageToken')
                 if not next_page_token:
                     break
 
-            logger.info(f"채널 {channel_id}: {len(videos)}개 영상 수집")
+            api_logger.info(f"채널 {channel_id}: {len(videos)}개 영상 수집")
             return videos
 
-        except HttpError as e:
-            logger.error(f"API 에러 (영상 목록): {e}")
-            return videos
+        except (HttpError, OSError, httplib2.HttpLib2Error) as e:
+            # 일부만 수집된 목록으로 점수를 매기지 않도록 실패로 올림
+            api_logger.error(f"API 에러 (영상 목록): {e}")
+            raise ChannelFetchError(f"영상 목록 조회 실패 ({len(videos)}개 수집 후 중단): {e}") from e
 
     def get_channel_info(self, channel_id: str) -> Optional[Dict]:
         """채널의 구독자 수와 전체 영상 개수를 포함한 정보 조회"""
         try:
-            self.api_calls += 1
+            self._count_calls()
             request = self.youtube.channels().list(
                 part='statistics,snippet',
                 id=channel_id
             )
-            response = request.execute()
+            response = self._execute(request)
 
             if response.get('items'):
-                item = response['items'][0]
-                stats = item.get('statistics', {})
-                snippet = item.get('snippet', {})
-
-                # 디버깅: 특정 채널의 전체 응답 로깅
-                channel_title = snippet.get('title', '')
-                if channel_title in ['전우형', '서혜리'] or '@deundeun' in channel_title or '@quick' in channel_title:
-                    logger.info(f"DEBUG - Full API response for {channel_title}:")
-                    logger.info(f"  Statistics: {stats}")
-                    logger.info(f"  Channel ID: {channel_id}")
-
-                # 구독자 수 확인
-                if 'subscriberCount' not in stats:
-                    logger.error(f"채널 {channel_title} ({channel_id}): subscriberCount 필드가 없음!")
-                    logger.error(f"  Available stats fields: {list(stats.keys())}")
-                    subscriber_count = 0
-                else:
-                    subscriber_count = int(stats.get('subscriberCount', 0))
-                    if subscriber_count == 0:
-                        logger.warning(f"채널 {channel_title}: 구독자 수 0명으로 반환됨")
-
-                return {
-                    'subscriber_count': subscriber_count,
-                    'total_videos': int(stats.get('videoCount', 0)),
-                    'total_views': int(stats.get('viewCount', 0)),
-                    'channel_title': channel_title,
-                    'hidden_subscriber': stats.get('hiddenSubscriberCount', False)
-                }
+                return self._channel_stats_from_item(channel_id, response['items'][0])
             else:
-                logger.error(f"채널 ID {channel_id}: API 응답에 items가 없음 - 잘못된 채널 ID일 가능성")
+                api_logger.error(f"채널 ID {channel_id}: API 응답에 items가 없음 - 잘못된 채널 ID일 가능성")
             return None
 
-        except HttpError as e:
-            logger.error(f"API 에러 (채널 정보) - 채널 ID {channel_id}: {e}")
-            return None
+        except (HttpError, OSError, httplib2.HttpLib2Error) as e:
+            api_logger.error(f"API 에러 (채널 정보) - 채널 ID {channel_id}: {e}")
+            raise ChannelFetchError(f"채널 정보 조회 실패: {e}") from e
+
+    def lookup_channels(self, channel_ids: List[str]) -> Dict[str, Dict]:
+        """채널 ID 존재 여부와 핸들 확인 (channels.list 50개씩, 배치 요청 하나로 전송)
+
+        존재하는 채널만 {'title', 'handle'}로 반환한다 (핸들이 없는 채널은 빈 문자열).
+        요청 자체가 실패하면 ChannelFetchError(할당량 초과는 QuotaExceededError)를 올린다.
+        """
+        requests = {}
+        for offset in range(0, len(channel_ids), CHANNELS_PER_REQUEST):
+            chunk = channel_ids[offset:offset + CHANNELS_PER_REQUEST]
+            requests[str(offset)] = self.youtube.channels().list(
+                part='snippet', id=','.join(chunk), maxResults=CHANNELS_PER_REQUEST
+            )
+
+        channels = {}
+        for result in self.execute_batch(requests).values():
+            if isinstance(result, Exception):
+                if isinstance(result, ChannelFetchError):
+                    raise result
+                raise ChannelFetchError(f"채널 확인 실패: {result}") from result
+            for item in result.get('items', []):
+                snippet = item.get('snippet', {})
+                channels[item['id']] = {
+                    'title': snippet.get('title', ''),
+                    'handle': snippet.get('customUrl', '').lstrip('@').lower()
+                }
+        return channels
+
+    @staticmethod
+    def _channel_stats_from_item(channel_id: str, item: Dict) -> Dict:
+        """channels.list 응답 항목에서 채널 통계 추출"""
+        stats = item.get('statistics', {})
+        snippet = item.get('snippet', {})
+
+        # 디버깅: 특정 채널의 전체 응답 로깅
+        channel_title = snippet.get('title', '')
+        if channel_title in ['전우형', '서혜리'] or '@deundeun' in channel_title or '@quick' in channel_title:
+            api_logger.debug(f"Full API response for {channel_title} ({channel_id}): {stats}")
+
+        # 구독자 수 확인
+        if 'subscriberCount' not in stats:
+            api_logger.error(f"채널 {channel_title} ({channel_id}): subscriberCount 필드가 없음!")
+            api_logger.error(f"  Available stats fields: {list(stats.keys())}")
+            subscriber_count = 0
+        else:
+            subscriber_count = int(stats.get('subscriberCount', 0))
+            if subscriber_count == 0:
+                api_logger.warning(f"채널 {channel_title}: 구독자 수 0명으로 반환됨")
+
+        return {
+            'subscriber_count': subscriber_count,
+            'total_videos': int(stats.get('videoCount', 0)),
+            'total_views': int(stats.get('viewCount', 0)),
+            'channel_title': channel_title,
+            'hidden_subscriber': stats.get('hiddenSubscriberCount', False)
+        }
 
     def get_total_video_count(self, channel_id: str) -> int:
         """채널의 전체 영상 개수 조회 (기간 제한 없음)"""
         try:
             # 채널 통계 정보 가져오기
-            self.api_calls += 1
+            self._count_calls()
             request = self.youtube.channels().list(
                 part='statistics',
                 id=channel_id
             )
-            response = request.execute()
+            response = self._execute(request)
 
             if response.get('items'):
                 video_count = int(response['items'][0]['statistics'].get('videoCount', 0))
-                logger.info(f"채널 {channel_id}: 전체 영상 {video_count}개")
+                api_logger.info(f"채널 {channel_id}: 전체 영상 {video_count}개")
                 return video_count
 
             return 0
         except HttpError as e:
-            logger.error(f"API 에러 (전체 영상 개수): {e}")
+            api_logger.error(f"API 에러 (전체 영상 개수): {e}")
             return 0
 
 
@@ -399,7 +1484,7 @@ class SubscriberTracker:
             if self.baseline_data['created_at'] is None:
                 self.baseline_data['created_at'] = datetime.now(timezone.utc).isoformat()
 
-            logger.info(f"신규 채널 추가: {name} - 초기 구독자: {current_subscribers:,}")
+            subscriber_logger.info(f"신규 채널 추가: {name} - 초기 구독자: {current_subscribers:,}")
             return {
                 'current': current_subscribers,
                 'initial': current_subscribers,
@@ -417,7 +1502,7 @@ class SubscriberTracker:
             channel_data['last_subscribers'] = current_subscribers
             channel_data['last_update'] = datetime.now(timezone.utc).isoformat()
 
-            logger.info(f"채널 업데이트: {name} - 현재: {current_subscribers:,}, 증감: {change:+,} ({change_percent:+.1f}%)")
+            subscriber_logger.info(f"채널 업데이트: {name} - 현재: {current_subscribers:,}, 증감: {change:+,} ({change_percent:+.1f}%)")
 
             return {
                 'current': current_subscribers,
@@ -443,8 +1528,12 @@ class ScoreCalculator:
         return ((likes + comments * 2) / views) * 100
 
     @staticmethod
-    def calculate_channel_scores(videos: List[Dict]) -> Dict:
-        """채널 종합 점수 계산"""
+    def calculate_channel_scores(videos: List[Dict], weights: Optional[Dict] = None) -> Dict:
+        """채널 종합 점수 계산
+
+        weights를 생략하면 기본 가중치(DEFAULT_WEIGHTS)를 사용한다.
+        """
+        weights = weights or DEFAULT_WEIGHTS
         video_count = len(videos)
 
         # 영상이 없거나 부족한 경우 0점 처리
@@ -545,10 +1634,10 @@ class ScoreCalculator:
             growth_ratio = 0  # 영상 3개 미만이면 0
 
         # 최종 점수
-        score_median = median_score * WEIGHT_MEDIAN
-        score_engagement = total_engagement_rate * 100 * WEIGHT_ENGAGEMENT
-        score_viral = top3_avg * WEIGHT_VIRAL
-        score_growth = growth_ratio * 100 * WEIGHT_GROWTH
+        score_median = median_score * weights['median']
+        score_engagement = total_engagement_rate * 100 * weights['engagement']
+        score_viral = top3_avg * weights['viral']
+        score_growth = growth_ratio * 100 * weights['growth']
 
         total_score = score_median + score_engagement + score_viral + score_growth
 
@@ -580,13 +1669,867 @@ class ScoreCalculator:
         }
 
 
+class VideoStateFile:
+    """영상 저장소의 바이너리 상태 파일 (mmap으로 열고 필요한 채널만 읽음)
+
+    고정 폭 레코드와 문자열 표로 이루어져, 여는 데 드는 비용이 쌓인 영상 수와 무관하다.
+    레이아웃 (리틀 엔디언):
+    - 헤더: 매직, 버전, 채널 수, 영상 수, 문자열 수, updated_at 문자열 번호
+    - 채널 표: 채널 ID 순으로 정렬된 (채널 ID, 채널 정보 JSON, 첫 영상 번호, 영상 수)
+    - 영상 표: 채널별로 이어진 (영상 ID, 제목, 업로드 시각, 조회수, 좋아요, 댓글)
+    - 문자열 표: 문자열별 끝 오프셋(u64) + UTF-8 바이트
+    """
+
+    MAGIC = b'LBVS'
+    VERSION = 1
+    HEADER = struct.Struct('<4sHHIIII')  # 매직, 버전, 예약, 채널 수, 영상 수, 문자열 수, updated_at
+    CHANNEL = struct.Struct('<IIII')
+    VIDEO = struct.Struct('<IIIqqq')
+    OFFSET = struct.Struct('<Q')
+    NO_STRING = 0xFFFFFFFF
+
+    def __init__(self, path: str):
+        with open(path, 'rb') as f:
+            self.buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            magic, version, _, self.channel_count, self.video_count, self.string_count, updated_at = \
+                self.HEADER.unpack_from(self.buffer, 0)
+            if magic != self.MAGIC or version != self.VERSION:
+                raise ValueError(f"지원하지 않는 상태 파일 형식 ({magic!r}, 버전 {version})")
+            self.channels_at = self.HEADER.size
+            self.videos_at = self.channels_at + self.channel_count * self.CHANNEL.size
+            self.offsets_at = self.videos_at + self.video_count * self.VIDEO.size
+            self.strings_at = self.offsets_at + self.string_count * self.OFFSET.size
+            if self.strings_at > len(self.buffer) or (
+                    self.string_count and self.strings_at + self._string_end(self.string_count - 1) != len(self.buffer)):
+                raise ValueError("상태 파일 크기 불일치")
+            self.updated_at = self.string(updated_at)
+        except Exception:
+            self.buffer.close()
+            raise
+
+    def _string_end(self, index: int) -> int:
+        return self.OFFSET.unpack_from(self.buffer, self.offsets_at + index * self.OFFSET.size)[0]
+
+    def string(self, index: int) -> Optional[str]:
+        if index == self.NO_STRING:
+            return None
+        start = self._string_end(index - 1) if index else 0
+        end = self._string_end(index)
+        return self.buffer[self.strings_at + start:self.strings_at + end].decode('utf-8')
+
+    def _channel_record(self, index: int) -> Tuple[int, int, int, int]:
+        return self.CHANNEL.unpack_from(self.buffer, self.channels_at + index * self.CHANNEL.size)
+
+    def channel_id(self, index: int) -> str:
+        return self.string(self._channel_record(index)[0])
+
+    def channel_ids(self) -> Iterator[str]:
+        for index in range(self.channel_count):
+            yield self.channel_id(index)
+
+    def find(self, channel_id: str) -> Optional[int]:
+        """채널 표에서 이진 탐색 (없으면 None)"""
+        low, high = 0, self.channel_count
+        while low < high:
+            middle = (low + high) // 2
+            if self.channel_id(middle) < channel_id:
+                low = middle + 1
+            else:
+                high = middle
+        if low < self.channel_count and self.channel_id(low) == channel_id:
+            return low
+        return None
+
+    def channel_stats(self, index: int) -> Optional[Dict]:
+        """채널 하나의 채널 정보만 복원 (영상은 읽지 않음)"""
+        stats = self.string(self._channel_record(index)[1])
+        return json.loads(stats) if stats is not None else None
+
+    def channel(self, index: int) -> Tuple[Optional[Dict], Dict[str, Dict]]:
+        """채널 하나의 (채널 정보, 영상 ID → 영상) 복원"""
+        _, stats, first, count = self._channel_record(index)
+        videos = {}
+        for position in range(first, first + count):
+            video_id, title, published_at, views, likes, comments = \
+                self.VIDEO.unpack_from(self.buffer, self.videos_at + position * self.VIDEO.size)
+            videos[self.string(video_id)] = {
+                'title': self.string(title),
+                'published_at': self.string(published_at),
+                'views': views,
+                'likes': likes,
+                'comments': comments
+            }
+        stats = self.string(stats)
+        return (json.loads(stats) if stats is not None else None), videos
+
+    def close(self):
+        self.buffer.close()
+
+    @classmethod
+    def write(cls, path: str, updated_at: str, channels: Iterable[Tuple[str, Optional[Dict], Dict[str, Dict]]]):
+        """(채널 ID, 채널 정보, 영상) 목록을 채널 ID 순으로 받아 상태 파일 작성 (임시 파일 교체)"""
+        strings = {}
+        string_data = bytearray()
+        string_ends = bytearray()
+
+        def intern(value: Optional[str]) -> int:
+            if value is None:
+                return cls.NO_STRING
+            index = strings.get(value)
+            if index is None:
+                index = strings[value] = len(strings)
+                string_data.extend(value.encode('utf-8'))
+                string_ends.extend(cls.OFFSET.pack(len(string_data)))
+            return index
+
+        channel_table = bytearray()
+        video_table = bytearray()
+        video_count = 0
+        updated_at_index = intern(updated_at)
+        for channel_id, stats, videos in channels:
+            stats_index = intern(json.dumps(stats, ensure_ascii=False, separators=(',', ':'))
+                                 if stats is not None else None)
+            channel_table.extend(cls.CHANNEL.pack(intern(channel_id), stats_index, video_count, len(videos)))
+            for video_id, video in videos.items():
+                video_table.extend(cls.VIDEO.pack(
+                    intern(video_id), intern(video['title']), intern(video['published_at']),
+                    video['views'], video['likes'], video['comments']
+                ))
+            video_count += len(videos)
+
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(cls.HEADER.pack(cls.MAGIC, cls.VERSION, 0, len(channel_table) // cls.CHANNEL.size,
+                                    video_count, len(strings), updated_at_index))
+            f.write(channel_table)
+            f.write(video_table)
+            f.write(string_ends)
+            f.write(string_data)
+        os.replace(tmp_path, path)
+
+
+class VideoStore:
+    """채널별 영상 저장소
+
+    수집한 영상의 최신 통계를 채널별로 보관한다. 롤링 윈도우 리더보드는
+    API를 다시 훑는 대신 이 저장소에서 윈도우에 들어오고 나가는 영상만 반영한다.
+    상태 파일(VideoStateFile)을 mmap으로 열어 두고 채널을 읽을 때마다 그 채널만 복원한다.
+    이번 실행에서 갱신한 채널은 임시 파일(VideoDetailSink)로 내려 두고 저장할 때 상태 파일에 합치므로,
+    메모리에는 채널 정보만 남고 영상은 채널 하나씩만 올라온다.
+    (이전 형식 JSON 저장소에서 옮겨 올 때만 data['channels']에 전체 영상이 있다.)
+    """
+
+    def __init__(self, store_file: str = VIDEO_STATE_FILE, legacy_file: str = VIDEO_STORE_FILE):
+        self.store_file = store_file
+        self.legacy_file = legacy_file
+        self.state = None
+        self.spill = None  # 이번 실행에서 갱신한 채널 (채널 ID → 영상 목록)
+        self.data = self.load()
+
+    def load(self) -> Dict:
+        """상태 파일 열기 (없으면 이전 형식의 JSON 저장소 로드)"""
+        if os.path.exists(self.store_file):
+            try:
+                self.state = VideoStateFile(self.store_file)
+                logger.info(f"영상 상태 파일 열기: {self.state.channel_count}개 채널, "
+                            f"{self.state.video_count}개 영상")
+                return {'updated_at': self.state.updated_at, 'channels': {}, 'channel_stats': {}}
+            except Exception as e:
+                logger.error(f"영상 상태 파일 열기 실패: {e}")
+
+        if os.path.exists(self.legacy_file):
+            try:
+                with open(self.legacy_file, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                    logger.info(f"영상 저장소 로드: {len(data.get('channels', {}))}개 채널")
+                    data.setdefault('channel_stats', {})
+                    return data
+            except Exception as e:
+                logger.error(f"영상 저장소 로드 실패: {e}")
+
+        return {'updated_at': None, 'channels': {}, 'channel_stats': {}}
+
+    def _spilled(self, channel_id: str) -> bool:
+        return self.spill is not None and channel_id in self.spill.offsets
+
+    def _read_spill(self, channel_id: str) -> Dict[str, Dict]:
+        return {video.pop('video_id'): video for video in self.spill.read(channel_id)}
+
+    def _channel(self, channel_id: str) -> Optional[Dict[str, Dict]]:
+        """채널 영상 (이번 실행에서 갱신한 채널은 임시 파일에서, 나머지는 상태 파일에서 읽음, 캐시하지 않음)"""
+        stored = self.data['channels'].get(channel_id)
+        if stored is not None:
+            return stored
+        if self._spilled(channel_id):
+            return self._read_spill(channel_id)
+        if self.state is not None:
+            index = self.state.find(channel_id)
+            if index is not None:
+                stats, stored = self.state.channel(index)
+                if stats is not None:
+                    self.data['channel_stats'].setdefault(channel_id, stats)
+        return stored
+
+    def _records(self) -> Iterator[Tuple[str, Optional[Dict], Dict[str, Dict]]]:
+        """저장할 (채널 ID, 채널 정보, 영상) 목록, 채널 ID 순 (채널 하나씩 읽어 바로 넘김)"""
+        unchanged = {}
+        if self.state is not None:
+            unchanged = {channel_id: index for index, channel_id in enumerate(self.state.channel_ids())
+                         if channel_id not in self.data['channels'] and not self._spilled(channel_id)}
+        spilled = set(self.spill.offsets) if self.spill is not None else set()
+        for channel_id in sorted(set(self.data['channels']) | set(self.data['channel_stats'])
+                                 | spilled | set(unchanged)):
+            if channel_id in unchanged:
+                stats, videos = self.state.channel(unchanged[channel_id])
+                yield channel_id, self.data['channel_stats'].get(channel_id, stats), videos
+            elif channel_id in spilled:
+                yield channel_id, self.data['channel_stats'].get(channel_id), self._read_spill(channel_id)
+            else:
+                yield channel_id, self.data['channel_stats'].get(channel_id), self.data['channels'].get(channel_id, {})
+
+    def save(self):
+        """상태 파일 저장 (임시 파일 교체로 원자적 저장) 후 새 파일을 다시 연다
+
+        데몬 모드에서도 갱신했던 채널을 내려놓으므로 메모리가 쌓인 영상 수만큼 늘지 않는다.
+        """
+        self.data['updated_at'] = datetime.now(timezone.utc).isoformat()
+        VideoStateFile.write(self.store_file, self.data['updated_at'], self._records())
+        if self.spill is not None:
+            self.spill.close()
+            self.spill = None
+        if self.state is not None:
+            self.state.close()
+        self.state = VideoStateFile(self.store_file)
+        self.data = {'updated_at': self.state.updated_at, 'channels': {}, 'channel_stats': {}}
+        logger.info("영상 저장소 저장 완료")
+
+    def update_channel(self, channel_id: str, videos: List[Dict], retain_since: Optional[str] = None,
+                       channel_stats: Optional[Dict] = None):
+        """수집한 영상으로 채널 저장소 갱신 (retain_since 이전 영상은 정리)"""
+        if channel_stats is not None:
+            self.data['channel_stats'][channel_id] = channel_stats
+
+        stored = self._channel(channel_id) or {}
+        for video in videos:
+            stored[video['video_id']] = {
+                'title': video.get('title', ''),
+                'published_at': video['published_at'],
+                'views': video['views'],
+                'likes': video['likes'],
+                'comments': video['comments']
+            }
+
+        if retain_since:
+            for video_id in [vid for vid, video in stored.items() if video['published_at'] < retain_since]:
+                del stored[video_id]
+
+        # 갱신한 채널은 임시 파일로 내려 두고 메모리에서 뺌 (저장할 때 상태 파일에 합침)
+        if self.spill is None:
+            self.spill = VideoDetailSink()
+        self.spill.write(channel_id, [{'video_id': video_id, **video} for video_id, video in stored.items()])
+        self.data['channels'].pop(channel_id, None)
+
+    def has_channel(self, channel_id: str) -> bool:
+        return channel_id in self.data['channels'] or self._spilled(channel_id) or (
+            self.state is not None and self.state.find(channel_id) is not None)
+
+    def channel_stats(self, channel_id: str) -> Optional[Dict]:
+        """마지막으로 수집한 채널 정보 (구독자 수, 전체 영상 수 등)"""
+        if channel_id not in self.data['channel_stats'] and self.state is not None:
+            index = self.state.find(channel_id)
+            if index is not None:
+                stats = self.state.channel_stats(index)
+                if stats is not None:
+                    self.data['channel_stats'][channel_id] = stats
+        return self.data['channel_stats'].get(channel_id)
+
+    def channel_videos(self, channel_id: str, since: Optional[str] = None) -> List[Dict]:
+        """채널 영상 목록 (get_channel_videos와 같은 형식, 최신 업로드 순)"""
+        videos = [
+            {
+                'video_id': video_id,
+                'title': video['title'],
+                'published_at': video['published_at'],
+                'url': f"https://www.youtube.com/watch?v={video_id}",
+                'views': video['views'],
+                'likes': video['likes'],
+                'comments': video['comments']
+            }
+            for video_id, video in (self._channel(channel_id) or {}).items()
+            if since is None or video['published_at'] >= since
+        ]
+        videos.sort(key=lambda v: v['published_at'], reverse=True)
+        return videos
+
+    def close(self):
+        """열어 둔 상태 파일(mmap)과 임시 파일 닫기 (저장하지 않은 갱신은 버려짐)"""
+        if self.spill is not None:
+            self.spill.close()
+            self.spill = None
+        if self.state is not None:
+            self.state.close()
+            self.state = None
+
+
+class VideoDetailSink:
+    """실행 중 영상별 상세를 임시 파일로 내보내는 저장소
+
+    채널 점수를 계산하자마자 영상 상세를 채널당 한 줄씩 기록하고 메모리에는 채널별 위치만 남긴다.
+    Sheets 영상상세 시트처럼 마지막에 영상 단위로 다시 훑어야 할 때 채널별로 읽어 온다.
+    영상 저장소도 이번 실행에서 갱신한 채널의 영상을 저장 전까지 여기에 내려 둔다 (같은 키는 마지막 기록을 읽음).
+    """
+
+    def __init__(self):
+        self.file = tempfile.TemporaryFile()
+        self.offsets = {}  # 채널 키 → (오프셋, 길이)
+
+    def write(self, key: str, details: List[Dict]):
+        line = json.dumps(details, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        self.file.seek(0, os.SEEK_END)
+        self.offsets[key] = (self.file.tell(), len(line))
+        self.file.write(line)
+
+    def read(self, key: str) -> List[Dict]:
+        if key not in self.offsets:
+            return []
+        offset, length = self.offsets[key]
+        self.file.seek(offset)
+        return json.loads(self.file.read(length))
+
+    def close(self):
+        self.file.close()
+
+
+def _encode_varint(value: int, out: bytearray):
+    """부호 없는 정수를 LEB128 varint로 인코딩"""
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _zigzag(value: int) -> int:
+    """부호 있는 정수를 작은 부호 없는 정수로 (0, -1, 1, -2 ... → 0, 1, 2, 3 ...)"""
+    return (value << 1) ^ (value >> 63)
+
+
+def _unzigzag(value: int) -> int:
+    return (value >> 1) ^ -(value & 1)
+
+
+class VideoTimeSeries:
+    """영상별 조회수/좋아요/댓글 시계열 저장소
+
+    값이 바뀐 실행에서만 점을 추가하고, 각 점은 직전 점과의 차이(시각, 조회수, 좋아요, 댓글)를
+    zigzag varint로 저장한다. 저장 크기는 실행 횟수 × 영상 수가 아니라 실제 변화량에 비례한다.
+
+    - series.bin: 실행마다 새로 기록한 바이트를 파일 끝에 덧붙인 파일
+    - series_index.json: 영상별 {채널, 조각 [(오프셋, 길이)...], 점 개수, 마지막 값}, 채널별 영상 목록
+    마지막 값을 인덱스에 두므로 새 점을 추가할 때 기존 데이터를 디코딩하지 않는다.
+    조각이 TIMESERIES_COMPACT_SEGMENTS배 넘게 쌓이면 영상별로 다시 이어 붙여 한 번 새로 쓴다.
+    """
+
+    def __init__(self, series_dir: str = TIMESERIES_DIR):
+        self.series_dir = series_dir
+        self.data_file = os.path.join(series_dir, 'series.bin')
+        self.index_file = os.path.join(series_dir, 'series_index.json')
+        self.index = {'videos': {}, 'channels': {}}
+        self.blob = b''
+        self.pending = {}  # video_id → 이번 실행에서 추가된 바이트
+        self.load()
+
+    def load(self):
+        """인덱스와 데이터 파일 로드 (크기가 맞지 않으면 빈 저장소로 시작)"""
+        if not os.path.exists(self.index_file) or not os.path.exists(self.data_file):
+            return
+        try:
+            with open(self.index_file, 'r', encoding='utf-8') as f:
+                index = json.load(f)
+            with open(self.data_file, 'rb') as f:
+                blob = f.read()
+            if index.get('size', -1) > len(blob):
+                raise ValueError(f"데이터 파일 크기 불일치 ({index.get('size')} > {len(blob)})")
+            # 덧붙인 뒤 인덱스를 저장하지 못한 실행의 바이트는 버림
+            blob = blob[:index['size']]
+            for entry in index['videos'].values():
+                if 'o' in entry:
+                    # 이전 형식 (영상당 연속된 구간 하나)
+                    offset, length = entry.pop('o'), entry.pop('n')
+                    entry['s'] = [[offset, length]] if length else []
+            self.index, self.blob = index, blob
+            logger.info(f"시계열 저장소 로드: {len(index['videos'])}개 영상, {len(blob):,} bytes")
+        except Exception as e:
+            logger.error(f"시계열 저장소 로드 실패: {e}")
+
+    def _encoded(self, video_id: str) -> bytes:
+        """영상 하나의 인코딩 바이트 (저장된 조각 + 이번 실행에서 추가된 바이트)"""
+        entry = self.index['videos'][video_id]
+        return b''.join(self.blob[offset:offset + length] for offset, length in entry['s']) + \
+            bytes(self.pending.get(video_id, b''))
+
+    def save(self):
+        """이번 실행에서 추가된 바이트만 데이터 파일 끝에 덧붙이고 인덱스 저장
+
+        인덱스는 임시 파일 교체로 저장하므로, 덧붙인 뒤 인덱스를 쓰기 전에 중단되면
+        다음 로드에서 인덱스 크기 뒤의 바이트를 버린다.
+        """
+        os.makedirs(self.series_dir, exist_ok=True)
+        segments = sum(len(entry['s']) for entry in self.index['videos'].values()) + len(self.pending)
+        if segments > max(len(self.index['videos']), 1) * TIMESERIES_COMPACT_SEGMENTS \
+                or not os.path.exists(self.data_file):
+            self._compact()
+        else:
+            appended = bytearray()
+            for video_id, encoded in self.pending.items():
+                self.index['videos'][video_id]['s'].append([len(self.blob) + len(appended), len(encoded)])
+                appended += encoded
+            with open(self.data_file, 'r+b') as f:
+                # 이전에 인덱스 없이 덧붙은 바이트가 있으면 그 위에 씀
+                f.truncate(len(self.blob))
+                f.seek(len(self.blob))
+                f.write(appended)
+            self.blob += bytes(appended)
+        self.pending = {}
+        self.index['size'] = len(self.blob)
+
+        with open(f"{self.index_file}.tmp", 'w', encoding='utf-8') as f:
+            json.dump(self.index, f, separators=(',', ':'))
+        os.replace(f"{self.index_file}.tmp", self.index_file)
+
+    def _compact(self):
+        """영상별 바이트를 다시 이어 붙여 데이터 파일 새로 쓰기 (임시 파일 교체)"""
+        out = bytearray()
+        for video_id, entry in self.index['videos'].items():
+            encoded = self._encoded(video_id)
+            entry['s'] = [[len(out), len(encoded)]] if encoded else []
+            out += encoded
+        self.blob = bytes(out)
+        with open(f"{self.data_file}.tmp", 'wb') as f:
+            f.write(self.blob)
+        os.replace(f"{self.data_file}.tmp", self.data_file)
+
+    def record(self, channel_id: str, video: Dict, timestamp: int) -> bool:
+        """영상 통계 한 점 추가 (직전 값과 같으면 기록하지 않음)"""
+        video_id = video['video_id']
+        values = [timestamp, video['views'], video['likes'], video['comments']]
+        entry = self.index['videos'].get(video_id)
+        if entry is None:
+            entry = {'c': channel_id, 's': [], 'k': 0, 'last': [0, 0, 0, 0]}
+            self.index['videos'][video_id] = entry
+            self.index['channels'].setdefault(channel_id, []).append(video_id)
+        elif entry['last'][1:] == values[1:]:
+            return False
+
+        encoded = self.pending.setdefault(video_id, bytearray())
+        for value, last in zip(values, entry['last']):
+            _encode_varint(_zigzag(value - last), encoded)
+        entry['last'] = values
+        entry['k'] += 1
+        return True
+
+    def record_channel(self, channel_id: str, videos: List[Dict], when: datetime) -> int:
+        """채널의 수집 결과 반영, 새로 기록한 점 개수 반환"""
+        timestamp = int(when.timestamp())
+        return sum(1 for video in videos if self.record(channel_id, video, timestamp))
+
+    def read_range(self, video_id: str, start: Optional[datetime] = None,
+                   end: Optional[datetime] = None) -> Dict[str, array]:
+        """영상 하나의 [start, end] 구간 시계열 (열별 고정 폭 정수 배열, 시각은 UNIX 초)"""
+        columns = {name: array('q') for name in ('t', 'views', 'likes', 'comments')}
+        if video_id not in self.index['videos']:
+            return columns
+
+        encoded = self._encoded(video_id)
+        start_ts = int(start.timestamp()) if start else None
+        end_ts = int(end.timestamp()) if end else None
+
+        values = [0, 0, 0, 0]
+        position = field = shift = current = 0
+        while position < len(encoded):
+            byte = encoded[position]
+            position += 1
+            current |= (byte & 0x7F) << shift
+            if byte & 0x80:
+                shift += 7
+                continue
+            values[field] += _unzigzag(current)
+            current = shift = 0
+            field += 1
+            if field < 4:
+                continue
+            field = 0
+
+            if end_ts is not None and values[0] > end_ts:
+                break
+            if start_ts is None or values[0] >= start_ts:
+                for name, value in zip(columns, values):
+                    columns[name].append(value)
+        return columns
+
+
+class TrendingEngine:
+    """영상/채널별 조회수·반응(좋아요+댓글) 속도를 지수 이동 평균으로 추적
+
+    관측할 때마다 직전 관측 이후의 시간당 증가량으로 이동 평균을 갱신하므로
+    영상 하나당 O(1)이며 기록이 길어져도 비용이 늘지 않는다.
+    관측 간격이 일정하지 않으므로 반감기 기준으로 가중치를 정한다.
+
+    상태: {'videos': {video_id: [channel_id, 관측 시각, 조회수, 반응, 조회수 속도, 반응 속도]},
+           'channels': {channel_id: [관측 시각, 조회수 속도, 반응 속도]}}
+    """
+
+    def __init__(self, state_file: str = TRENDING_STATE_FILE):
+        self.state_file = state_file
+        self.state = self.load()
+
+    def load(self) -> Dict:
+        """상태 로드"""
+        if os.path.exists(self.state_file):
+            try:
+                with open(self.state_file, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+            except Exception as e:
+                logger.error(f"트렌딩 상태 로드 실패: {e}")
+        return {'videos': {}, 'channels': {}}
+
+    def save(self, now: datetime):
+        """상태 저장 (오랫동안 관측되지 않은 영상은 정리)"""
+        cutoff = now.timestamp() - TRENDING_RETAIN_DAYS * 86400
+        self.state['videos'] = {video_id: entry for video_id, entry in self.state['videos'].items()
+                                if entry[1] >= cutoff}
+        tmp_path = f"{self.state_file}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.state, f, separators=(',', ':'))
+        os.replace(tmp_path, self.state_file)
+
+    @staticmethod
+    def _decay(hours: float) -> float:
+        """관측 간격에 따른 새 관측값의 가중치"""
+        return 1 - 0.5 ** (hours / TRENDING_HALF_LIFE_HOURS)
+
+    def observe_channel(self, channel_id: str, videos: List[Dict], when: datetime):
+        """채널의 수집 결과 관측"""
+        now = when.timestamp()
+        channel_views = channel_engagement = 0.0
+
+        for video in videos:
+            engagement = video['likes'] + video['comments']
+            entry = self.state['videos'].get(video['video_id'])
+
+            if entry is None:
+                # 처음 보는 영상은 업로드 이후 평균 속도로 시작
+                published = datetime.fromisoformat(video['published_at'].replace('Z', '+00:00'))
+                age_hours = max((now - published.timestamp()) / 3600, 1)
+                view_rate, engagement_rate = video['views'] / age_hours, engagement / age_hours
+                self.state['videos'][video['video_id']] = [
+                    channel_id, now, video['views'], engagement, view_rate, engagement_rate
+                ]
+            else:
+                hours = (now - entry[1]) / 3600
+                if hours <= 0:
+                    continue
+                # 스팸 필터링 등으로 값이 줄어든 경우는 0으로 취급
+                view_rate = max(video['views'] - entry[2], 0) / hours
+                engagement_rate = max(engagement - entry[3], 0) / hours
+                alpha = self._decay(hours)
+                entry[1:] = [now, video['views'], engagement,
+                             entry[4] + alpha * (view_rate - entry[4]),
+                             entry[5] + alpha * (engagement_rate - entry[5])]
+
+            channel_views += view_rate
+            channel_engagement += engagement_rate
+
+        channel = self.state['channels'].get(channel_id)
+        if channel is None:
+            self.state['channels'][channel_id] = [now, channel_views, channel_engagement]
+        elif now > channel[0]:
+            alpha = self._decay((now - channel[0]) / 3600)
+            self.state['channels'][channel_id] = [
+                now,
+                channel[1] + alpha * (channel_views - channel[1]),
+                channel[2] + alpha * (channel_engagement - channel[2])
+            ]
+
+    @staticmethod
+    def _score(view_rate: float, engagement_rate: float) -> float:
+        return view_rate + TRENDING_ENGAGEMENT_WEIGHT * engagement_rate
+
+    def ranking(self, channel_records: List[Dict], limit: int = TRENDING_LIMIT) -> Dict:
+        """'지금 뜨는' 채널/영상 순위 (leaderboard.json의 trending 항목)"""
+        channels = []
+        videos = []
+
+        for record in channel_records:
+            if record['status'] != 'success':
+                continue
+            channel = self.state['channels'].get(record['channel_id'])
+            if channel is None:
+                continue
+
+            top_video = None
+            for video in record['videos']:
+                entry = self.state['videos'].get(video['video_id'])
+                if entry is None:
+                    continue
+                item = {
+                    'video_id': video['video_id'],
+                    'title': video['title'],
+                    'url': video['url'],
+                    'name': record['name'],
+                    'channel_handle': record.get('channel_handle', ''),
+                    'views': video['views'],
+                    'view_velocity': round(entry[4], 1),
+                    'engagement_velocity': round(entry[5], 2),
+                    'trending_score': round(self._score(entry[4], entry[5]), 1)
+                }
+                videos.append(item)
+                if top_video is None or item['trending_score'] > top_video['trending_score']:
+                    top_video = item
+
+            channels.append({
+                'name': record['name'],
+                'channel_id': record['channel_id'],
+                'channel_handle': record.get('channel_handle', ''),
+                'view_velocity': round(channel[1], 1),
+                'engagement_velocity': round(channel[2], 2),
+                'trending_score': round(self._score(channel[1], channel[2]), 1),
+                'top_video': {key: top_video[key] for key in ('video_id', 'title', 'url', 'view_velocity')}
+                if top_video else None
+            })
+
+        channels.sort(key=lambda item: item['trending_score'], reverse=True)
+        videos.sort(key=lambda item: item['trending_score'], reverse=True)
+        for rank, item in enumerate(channels, 1):
+            item['rank'] = rank
+        for rank, item in enumerate(videos, 1):
+            item['rank'] = rank
+
+        return {
+            'half_life_hours': TRENDING_HALF_LIFE_HOURS,
+            'channels': channels[:limit],
+            'videos': videos[:limit]
+        }
+
+
+class WindowAggregate:
+    """롤링 윈도우의 채널 집계
+
+    영상을 추가/제거할 때마다 합계와 정렬 리스트만 갱신하므로 점수 계산 시
+    채널의 전체 영상을 다시 훑지 않는다. 결과는 ScoreCalculator.calculate_channel_scores와
+    같은 형식이며, 영상 순서(최신 업로드 순) 기준 규칙도 동일하게 따른다.
+    """
+
+    def __init__(self):
+        self.videos = {}  # video_id -> 영상 정보
+        self.total_views = 0
+        self.total_likes = 0
+        self.total_comments = 0
+        self.basic_scores = []  # 정렬된 기본 점수 (중앙값/Top3용)
+        self.by_views = []  # 정렬된 (조회수, 업로드 시각, video_id) (바이럴 영상용)
+        self.by_published = []  # 정렬된 (업로드 시각, video_id, 기본 점수) (성장 비율용)
+
+    def __len__(self) -> int:
+        return len(self.videos)
+
+    def add(self, video: Dict):
+        """영상 추가"""
+        basic_score = ScoreCalculator.calculate_basic_score(video['views'], video['likes'], video['comments'])
+        self.videos[video['video_id']] = {**video, 'basic_score': basic_score}
+        self.total_views += video['views']
+        self.total_likes += video['likes']
+        self.total_comments += video['comments']
+        bisect.insort(self.basic_scores, basic_score)
+        bisect.insort(self.by_views, (video['views'], video['published_at'], video['video_id']))
+        bisect.insort(self.by_published, (video['published_at'], video['video_id'], basic_score))
+
+    def remove(self, video_id: str):
+        """영상 제거"""
+        video = self.videos.pop(video_id)
+        self.total_views -= video['views']
+        self.total_likes -= video['likes']
+        self.total_comments -= video['comments']
+        self._discard(self.basic_scores, video['basic_score'])
+        self._discard(self.by_views, (video['views'], video['published_at'], video_id))
+        self._discard(self.by_published, (video['published_at'], video_id, video['basic_score']))
+
+    @staticmethod
+    def _discard(sorted_list: List, value):
+        del sorted_list[bisect.bisect_left(sorted_list, value)]
+
+    def scores(self, weights: Optional[Dict] = None) -> Dict:
+        """현재 윈도우의 채널 종합 점수"""
+        if not self.videos:
+            return ScoreCalculator.calculate_channel_scores([], weights)
+
+        weights = weights or DEFAULT_WEIGHTS
+        video_count = len(self.videos)
+
+        # 중앙값 (정렬 리스트에서 바로 계산)
+        median_score = statistics.median(self.basic_scores)
+        average_views = self.total_views / video_count
+        average_likes = self.total_likes / video_count
+
+        if self.total_views > 0:
+            total_engagement_rate = ((self.total_likes + self.total_comments * 2) / self.total_views) * 100
+        else:
+            total_engagement_rate = 0
+
+        if video_count >= 3:
+            top3_avg = statistics.mean(self.basic_scores[-3:])
+            # 최신 업로드 순 리스트의 마지막 3개 = 가장 오래된 3개 (calculate_channel_scores와 동일)
+            recent3_avg = statistics.mean(score for _, _, score in self.by_published[:3])
+            growth_ratio = recent3_avg / median_score if median_score > 0 else 0
+        else:
+            top3_avg = 0
+            growth_ratio = 0
+
+        viral_video = self.videos[self.by_views[-1][2]]
+
+        score_median = median_score * weights['median']
+        score_engagement = total_engagement_rate * 100 * weights['engagement']
+        score_viral = top3_avg * weights['viral']
+        score_growth = growth_ratio * 100 * weights['growth']
+
+        videos = [self.videos[video_id] for _, video_id, _ in reversed(self.by_published)]
+
+        return {
+            'status': 'success',
+            'video_count': video_count,
+            'median_score': median_score,
+            'average_views': average_views,
+            'average_likes': average_likes,
+            'avg_engagement': total_engagement_rate,
+            'top3_avg': top3_avg,
+            'max_single_views': viral_video['views'],
+            'viral_video': {
+                'views': viral_video['views'],
+                'likes': viral_video['likes'],
+                'comments': viral_video['comments'],
+                'title': viral_video.get('title', ''),
+                'video_id': viral_video.get('video_id', ''),
+                'url': viral_video.get('url', '')
+            },
+            'growth_ratio': growth_ratio,
+            'score_median': score_median,
+            'score_engagement': score_engagement,
+            'score_viral': score_viral,
+            'score_growth': score_growth,
+            'total_score': score_median + score_engagement + score_viral + score_growth,
+            'videos': videos,
+            'video_details': [
+                {key: video.get(key, '') for key in
+                 ('title', 'video_id', 'url', 'published_at', 'views', 'likes', 'comments', 'basic_score')}
+                for video in videos
+            ]
+        }
+
+
+class RollingWindowTracker:
+    """롤링 윈도우(최근 N일) 리더보드 상태 관리
+
+    리더보드/채널별로 지난 실행에서 집계한 영상과 그 통계를 rolling_state.json에 남겨두고,
+    이번 실행에서는 윈도우를 벗어난 영상 제거(업로드 순 앞에서부터), 이번에 수집한 영상 중
+    새로 들어온 영상 추가, 통계가 바뀐 영상 교체만 수행한다.
+    """
+
+    def __init__(self, state_file: str = ROLLING_STATE_FILE):
+        self.state_file = state_file
+        self.state = self.load_state()
+        self.aggregates = {}  # (board_id, channel_id) -> WindowAggregate
+
+    def load_state(self) -> Dict:
+        """상태 로드"""
+        if os.path.exists(self.state_file):
+            try:
+                with open(self.state_file, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+            except Exception as e:
+                logger.error(f"롤링 윈도우 상태 로드 실패: {e}")
+        return {}
+
+    def save_state(self):
+        """상태 저장 (이번 실행에서 다룬 집계만 갱신하고, 실패/제외된 채널의 상태는 그대로 유지)"""
+        for (board_id, channel_id), aggregate in self.aggregates.items():
+            self.state.setdefault(board_id, {})[channel_id] = {
+                video_id: [video['published_at'], video['views'], video['likes'], video['comments']]
+                for video_id, video in aggregate.videos.items()
+            }
+
+        tmp_path = f"{self.state_file}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.state, f, separators=(',', ':'))
+        os.replace(tmp_path, self.state_file)
+        logger.info("롤링 윈도우 상태 저장 완료")
+
+    def _aggregate(self, board_id: str, channel_id: str, videos_by_id: Dict[str, Dict]) -> WindowAggregate:
+        """메모리의 집계 반환 (없으면 저장된 상태로 복원)"""
+        key = (board_id, channel_id)
+        if key not in self.aggregates:
+            aggregate = WindowAggregate()
+            saved = self.state.get(board_id, {}).get(channel_id, {})
+            for video_id, (published_at, views, likes, comments) in saved.items():
+                video = videos_by_id.get(video_id, {})
+                aggregate.add({
+                    'video_id': video_id,
+                    'title': video.get('title', ''),
+                    'url': f"https://www.youtube.com/watch?v={video_id}",
+                    'published_at': published_at,
+                    'views': views,
+                    'likes': likes,
+                    'comments': comments
+                })
+            self.aggregates[key] = aggregate
+        return self.aggregates[key]
+
+    def advance(self, board: Dict, channel_id: str, videos: List[Dict], fresh: bool = True) -> WindowAggregate:
+        """윈도우를 현재 시각으로 이동하고 이번 실행에서 수집한 영상 통계 반영
+
+        videos: 이번 실행의 채널 영상 (수집 기간 전체의 최신 통계)
+        fresh: False면 저장된 데이터로 대체한 채널이라 새 통계가 없으므로 윈도우 이동만 한다
+        """
+        start, end = board['start'], board['end']
+        current = {video['video_id']: video for video in videos if start <= video['published_at'] <= end}
+        aggregate = self._aggregate(board['id'], channel_id, current)
+
+        # 윈도우를 벗어난 영상: 업로드 순 리스트의 앞에서부터 벗어난 만큼만 제거
+        left = entered = updated = 0
+        while aggregate.by_published and aggregate.by_published[0][0] < start:
+            aggregate.remove(aggregate.by_published[0][1])
+            left += 1
+
+        if fresh:
+            for video_id, video in current.items():
+                counted = aggregate.videos.get(video_id)
+                if counted is None:
+                    aggregate.add(video)
+                    entered += 1
+                elif (counted['views'], counted['likes'], counted['comments']) != \
+                        (video['views'], video['likes'], video['comments']):
+                    aggregate.remove(video_id)
+                    aggregate.add(video)
+                    updated += 1
+
+            # 수집 결과에 없는 영상 (삭제/비공개 전환)
+            if len(aggregate) > len(current):
+                for video_id in [video_id for video_id in aggregate.videos if video_id not in current]:
+                    aggregate.remove(video_id)
+                    left += 1
+
+        if left or entered or updated:
+            logger.debug(f"[{board['id']}] {channel_id}: +{entered} -{left} ~{updated} (윈도우 {len(aggregate)}개)")
+        return aggregate
+
+
 class BadgeSystem:
     """뱃지 시스템"""
 
     @staticmethod
-    def calculate_badges(channel_data: Dict) -> Tuple[List[str], Dict[str, Dict]]:
+    def calculate_badges(channel_data: Dict, rules: Optional[Dict] = None) -> Tuple[List[str], Dict[str, Dict]]:
         """채널의 뱃지 계산
 
+        rules를 생략하면 기본 뱃지 기준(DEFAULT_BADGE_RULES)을 사용한다.
+
         Returns:
             badges: 획득한 뱃지 이모지 리스트
             badge_descriptions: 각 뱃지의 상세 정보
@@ -594,40 +2537,483 @@ class BadgeSystem:
         if channel_data['status'] != 'success':
             return [], {}
 
+        rules = rules or DEFAULT_BADGE_RULES
+
         badges = []
         badge_descriptions = {}
 
         # 🎯 꾸준러: 중앙값 3,000점 이상
-        if channel_data['median_score'] >= BADGE_STABLE_THRESHOLD:
+        if channel_data['median_score'] >= rules['stable_threshold']:
             badges.append('🎯')
             badge_descriptions['🎯'] = BADGE_INFO['🎯']
 
         # 💬 인게이지먼트 킹: 평균 인게이지먼트율 5% 이상
-        if channel_data['avg_engagement'] >= BADGE_ENGAGEMENT_THRESHOLD:
+        if channel_data['avg_engagement'] >= rules['engagement_threshold']:
             badges.append('💬')
             badge_descriptions['💬'] = BADGE_INFO['💬']
 
         # 🔥 바이럴 메이커: Top 3 평균이 중앙값의 10배 이상 (둘 다 0보다 큰 경우만)
-        if channel_data['median_score'] > 0 and channel_data['top3_avg'] > 0 and channel_data['top3_avg'] >= channel_data['median_score'] * BADGE_VIRAL_MULTIPLIER:
+        if channel_data['median_score'] > 0 and channel_data['top3_avg'] > 0 and channel_data['top3_avg'] >= channel_data['median_score'] * rules['viral_multiplier']:
             badges.append('🔥')
             badge_descriptions['🔥'] = BADGE_INFO['🔥']
 
         # 📈 성장 로켓: 성장 비율 1.5 이상 (실제 성장이 있는 경우만)
-        if channel_data['growth_ratio'] >= BADGE_GROWTH_THRESHOLD and channel_data['video_count'] > 0:
+        if channel_data['growth_ratio'] >= rules['growth_threshold'] and channel_data['video_count'] > 0:
             badges.append('📈')
             badge_descriptions['📈'] = BADGE_INFO['📈']
 
         # ⭐ 올라운더: 중앙값 2,000점 이상, 인게이지먼트율 3% 이상, Top3 평균 4,000점 이상
-        if (channel_data['median_score'] >= 2000 and
-            channel_data['avg_engagement'] >= 3.0 and
-            channel_data['top3_avg'] >= 4000):
+        if (channel_data['median_score'] >= rules['allrounder_median'] and
+            channel_data['avg_engagement'] >= rules['allrounder_engagement'] and
+            channel_data['top3_avg'] >= rules['allrounder_top3']):
             badges.append('⭐')
             badge_descriptions['⭐'] = BADGE_INFO['⭐']
 
         return badges, badge_descriptions
 
 
-def load_channels(filename: str) -> List[Dict]:
+class SnapshotArchive:
+    """실행별 리더보드 스냅샷 저장소 (append-only)
+
+    snapshots.jsonl에 실행마다 한 줄씩 압축된 레코드를 추가하고,
+    snapshots_index.jsonl에도 실행마다 한 줄(오프셋 + 채널별 순위/총점)만 추가한다.
+    메모리에는 이를 채널별 시계열로 모아 두므로 순위 추이나 주간 급상승 조회는
+    인덱스만으로 응답할 수 있고, 실행당 쓰기 양은 기록이 쌓여도 일정하다.
+    """
+
+    # 스냅샷 레코드의 채널별 컬럼 순서
+    COLUMNS = [
+        'channel_id', 'rank', 'total_score', 'basic', 'engagement', 'viral', 'growth',
+        'median_score', 'avg_engagement', 'top3_avg', 'growth_ratio', 'badges'
+    ]
+
+    def __init__(self, history_dir: str = HISTORY_DIR):
+        self.history_dir = history_dir
+        self.snapshots_file = os.path.join(history_dir, 'snapshots.jsonl')
+        self.index_file = os.path.join(history_dir, 'snapshots_index.jsonl')
+        self.legacy_index_file = os.path.join(history_dir, 'snapshots_index.json')  # 이전 형식 (전체 덮어쓰기)
+        self.index = self.load_index()
+
+    def load_index(self) -> Dict:
+        """인덱스 로드 (스냅샷 파일과 맞지 않으면 이어서 반영하거나 재구축)"""
+        self.index = {'runs': [], 'channels': {}}
+        if not os.path.exists(self.index_file):
+            return self.rebuild_index()
+
+        try:
+            with open(self.index_file, 'rb') as f:
+                for line in f:
+                    if not line.endswith(b'\n'):
+                        raise ValueError('마지막 줄이 잘림')
+                    entry = json.loads(line)
+                    self._index_record(entry, entry['o'], entry['l'])
+        except Exception as e:
+            logger.error(f"스냅샷 인덱스 로드 실패: {e}")
+            return self.rebuild_index()
+
+        snapshots_size = os.path.getsize(self.snapshots_file) if os.path.exists(self.snapshots_file) else 0
+        indexed_size = 0
+        if self.index['runs']:
+            _, offset, length = self.index['runs'][-1]
+            indexed_size = offset + length
+
+        if indexed_size > snapshots_size:
+            return self.rebuild_index()
+        if indexed_size < snapshots_size:
+            # 인덱스 추가 전에 중단된 실행: 스냅샷 파일의 뒷부분만 읽어 이어서 반영
+            with open(self.snapshots_file, 'rb') as f, open(self.index_file, 'ab') as index_f:
+                f.seek(indexed_size)
+                offset = indexed_size
+                for line in f:
+                    if line.strip():
+                        record = json.loads(line)
+                        self._index_record(record, offset, len(line))
+                        index_f.write(self._index_line(record, offset, len(line)))
+                    offset += len(line)
+        return self.index
+
+    def rebuild_index(self) -> Dict:
+        """스냅샷 파일 전체를 읽어 인덱스 재구축 (인덱스 파일도 새로 씀)"""
+        self.index = {'runs': [], 'channels': {}}
+        lines = []
+        if os.path.exists(self.snapshots_file):
+            with open(self.snapshots_file, 'rb') as f:
+                offset = 0
+                for line in f:
+                    if line.strip():
+                        record = json.loads(line)
+                        self._index_record(record, offset, len(line))
+                        lines.append(self._index_line(record, offset, len(line)))
+                    offset += len(line)
+            logger.info(f"스냅샷 인덱스 재구축: {len(self.index['runs'])}개 실행")
+
+        if os.path.isdir(self.history_dir):
+            tmp_path = f"{self.index_file}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.writelines(lines)
+            os.replace(tmp_path, self.index_file)
+        if os.path.exists(self.legacy_index_file):
+            os.remove(self.legacy_index_file)
+        return self.index
+
+    @staticmethod
+    def _index_line(record: Dict, offset: int, length: int) -> bytes:
+        """인덱스 파일의 한 줄 (오프셋 + 채널별 순위/총점 + 바뀐 이름/핸들)"""
+        entry = {'t': record['t'], 'o': offset, 'l': length, 'c': [row[:3] for row in record['c']]}
+        if record.get('m'):
+            entry['m'] = record['m']
+        return (json.dumps(entry, ensure_ascii=False, separators=(',', ':')) + '\n').encode('utf-8')
+
+    def _index_record(self, record: Dict, offset: int, length: int):
+        """레코드 하나를 인덱스에 반영"""
+        run_index = len(self.index['runs'])
+        self.index['runs'].append([record['t'], offset, length])
+
+        for row in record['c']:
+            channel_id, rank, total_score = row[0], row[1], row[2]
+            meta = record.get('m', {}).get(channel_id, {})
+            channel = self.index['channels'].setdefault(channel_id, {
+                'name': '', 'channel_handle': '', 'runs': [], 'rank': [], 'total_score': []
+            })
+            channel['name'] = meta.get('name', channel['name'])
+            channel['channel_handle'] = meta.get('channel_handle', channel['channel_handle'])
+            channel['runs'].append(run_index)
+            channel['rank'].append(rank)
+            channel['total_score'].append(total_score)
+
+    def append(self, output: Dict):
+        """create_json 결과를 스냅샷으로 추가"""
+        rows = []
+        meta = {}
+        for entry in output['leaderboard']:
+            channel_id = entry.get('channel_id') or entry['channel_url']
+            breakdown = entry['score_breakdown']
+            metrics = entry['metrics']
+            rows.append([
+                channel_id, entry['rank'], entry['total_score'],
+                breakdown['basic'], breakdown['engagement'], breakdown['viral'], breakdown['growth'],
+                metrics['median_score'], metrics['avg_engagement'], metrics['top3_avg'], metrics['growth_ratio'],
+                ''.join(entry.get('badges', []))
+            ])
+            # 이름/핸들은 처음 등장하거나 바뀐 경우에만 기록 (인덱스 재구축 시 순서대로 반영됨)
+            known = self.index['channels'].get(channel_id, {})
+            if known.get('name') != entry['name'] or known.get('channel_handle') != entry['channel_handle']:
+                meta[channel_id] = {'name': entry['name'], 'channel_handle': entry['channel_handle']}
+
+        record = {'t': output['last_updated'], 'c': rows}
+        if meta:
+            record['m'] = meta
+        line = (json.dumps(record, ensure_ascii=False, separators=(',', ':')) + '\n').encode('utf-8')
+
+        os.makedirs(self.history_dir, exist_ok=True)
+        with open(self.snapshots_file, 'ab') as f:
+            offset = f.tell()
+            f.write(line)
+
+        # 인덱스도 한 줄만 추가 (중간에 끊겨도 다음 로드 때 스냅샷 파일 기준으로 이어서 반영)
+        with open(self.index_file, 'ab') as f:
+            f.write(self._index_line(record, offset, len(line)))
+        self._index_record(record, offset, len(line))
+        logger.info(f"스냅샷 저장: {record['t']} ({len(rows)}개 채널, 누적 {len(self.index['runs'])}회)")
+
+    def read_run(self, run_index: int) -> Dict:
+        """특정 실행의 전체 스냅샷 레코드 읽기 (오프셋으로 바로 접근)"""
+        _, offset, length = self.index['runs'][run_index]
+        with open(self.snapshots_file, 'rb') as f:
+            f.seek(offset)
+            record = json.loads(f.read(length))
+        record['c'] = [dict(zip(self.COLUMNS, row)) for row in record['c']]
+        return record
+
+    def runs_between(self, start: str, end: str) -> List[int]:
+        """기간 내 실행 인덱스 목록 (타임스탬프는 추가 순서대로 정렬되어 있음)"""
+        timestamps = [run[0] for run in self.index['runs']]
+        return list(range(bisect.bisect_left(timestamps, start), bisect.bisect_right(timestamps, end)))
+
+    def channel_history(self, channel_id: str) -> List[Dict]:
+        """채널의 실행별 순위/점수 추이"""
+        channel = self.index['channels'].get(channel_id)
+        if not channel:
+            return []
+        return [
+            {'t': self.index['runs'][run][0], 'rank': rank, 'total_score': score}
+            for run, rank, score in zip(channel['runs'], channel['rank'], channel['total_score'])
+        ]
+
+    def biggest_movers(self, days: int = MOVERS_WINDOW_DAYS, limit: int = 10) -> Dict[str, List[Dict]]:
+        """최근 N일간 순위 변동이 가장 큰 채널 (상승/하락)"""
+        if not self.index['runs']:
+            return {'up': [], 'down': []}
+
+        latest_run = len(self.index['runs']) - 1
+        since = (datetime.fromisoformat(self.index['runs'][-1][0]) - timedelta(days=days)).isoformat()
+        window_start = self.runs_between(since, self.index['runs'][-1][0])[0]
+
+        movers = []
+        for channel_id, channel in self.index['channels'].items():
+            if not channel['runs'] or channel['runs'][-1] != latest_run:
+                continue  # 최신 실행에 없는 채널은 제외
+            # 기간 시작 이후 첫 기록과 최신 기록 비교
+            first = bisect.bisect_left(channel['runs'], window_start)
+            change = channel['rank'][first] - channel['rank'][-1]
+            if change:
+                movers.append({
+                    'channel_id': channel_id,
+                    'name': channel['name'],
+                    'channel_handle': channel['channel_handle'],
+                    'rank': [channel['rank'][first], channel['rank'][-1]],
+                    'change': change
+                })
+
+        movers.sort(key=lambda m: m['change'], reverse=True)
+        return {
+            'up': [m for m in movers if m['change'] > 0][:limit],
+            'down': [m for m in reversed(movers) if m['change'] < 0][:limit]
+        }
+
+    def export_rank_history(self, filename: str):
+        """웹페이지용 순위 추이 파일 생성 (채널별 시계열 + 급상승/급하락)"""
+        output = {
+            'timestamps': [run[0] for run in self.index['runs']],
+            'channels': {
+                channel_id: {
+                    'name': channel['name'],
+                    'channel_handle': channel['channel_handle'],
+                    'runs': channel['runs'],
+                    'rank': channel['rank'],
+                    'total_score': channel['total_score']
+                }
+                for channel_id, channel in self.index['channels'].items()
+            },
+            'movers': self.biggest_movers()
+        }
+
+        with open(filename, 'w', encoding='utf-8') as f:
+            json.dump(output, f, ensure_ascii=False, separators=(',', ':'))
+        logger.info(f"순위 추이 파일 생성 완료: {filename}")
+
+
+class RunJournal:
+    """실행 저널 (채널별 체크포인트 + 실패 채널 목록)
+
+    채널 수집이 끝날 때마다 원본 데이터를 파일로 남겨, 실행이 중간에(할당량 초과, 비정상 종료)
+    멈춰도 --resume으로 끝나지 않은 채널만 다시 수집할 수 있게 한다.
+    끝까지 실행된 저널은 체크포인트를 지우고 완료 표시(finished_at)와 실패 채널 목록만 남긴다.
+    다음 실행은 완료된 저널의 체크포인트를 이어받지 않고, 실패 채널만 갱신 주기와 관계없이 다시 수집한다.
+    """
+
+    def __init__(self, journal_dir: str = RUN_JOURNAL_DIR):
+        self.journal_dir = journal_dir
+        self.records_dir = os.path.join(journal_dir, 'channels')
+        self.state_file = os.path.join(journal_dir, 'state.json')
+        self.state = self._new_state()
+
+    @staticmethod
+    def _new_state(retry: Optional[Dict] = None) -> Dict:
+        # completed: 키 → 체크포인트 시각, retry: 직전 실행에서 실패해 이번에 다시 수집할 채널
+        return {'started_at': datetime.now(timezone.utc).isoformat(), 'finished_at': None,
+                'completed': {}, 'dead_letter': {}, 'retry': retry or {}}
+
+    def _load_state(self) -> Optional[Dict]:
+        if not os.path.exists(self.state_file):
+            return None
+        try:
+            with open(self.state_file, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+            if isinstance(state['completed'], list):  # 이전 형식: 체크포인트 시각 대신 저널 시작 시각 사용
+                state['completed'] = dict.fromkeys(state['completed'], state['started_at'])
+            state.setdefault('finished_at', None)
+            state.setdefault('retry', {})
+            return state
+        except Exception as e:
+            logger.error(f"실행 저널 로드 실패, 새로 시작합니다: {e}")
+            return None
+
+    def start(self, resume: bool = False):
+        """저널 시작
+
+        resume이고 직전 실행이 중간에 멈췄다면 RUN_CHECKPOINT_MAX_AGE_HOURS 이내의 체크포인트를 이어받는다.
+        직전 실행이 끝까지 돌았다면(실패 채널이 남았더라도) 새로 시작하고 실패 채널만 다시 수집 대상으로 넘겨받는다.
+        """
+        previous = self._load_state()
+
+        if resume and previous is not None and not previous['finished_at']:
+            cutoff = datetime.now(timezone.utc) - timedelta(hours=RUN_CHECKPOINT_MAX_AGE_HOURS)
+            completed = {key: checkpointed_at for key, checkpointed_at in previous['completed'].items()
+                         if datetime.fromisoformat(checkpointed_at) >= cutoff}
+            if len(completed) < len(previous['completed']):
+                logger.info(f"체크포인트 {len(previous['completed']) - len(completed)}개가 "
+                            f"{RUN_CHECKPOINT_MAX_AGE_HOURS}시간보다 오래되어 다시 수집합니다")
+            self.state = {**previous, 'completed': completed}
+            self._save_state()
+            logger.info(f"실행 저널 이어받기: 완료 {len(completed)}개, "
+                        f"실패 {len(previous['dead_letter'])}개 ({previous['started_at']} 시작)")
+            return
+
+        retry = {}
+        if previous is not None:
+            retry = {**previous['retry'], **previous['dead_letter']}
+        self._clear()
+        self.state = self._new_state(retry)
+        self._save_state()
+        if retry:
+            logger.info(f"직전 실행에서 실패한 채널 {len(retry)}개를 다시 수집합니다")
+
+    def _clear(self):
+        """이 저널의 파일만 삭제 (같은 디렉토리 아래의 샤드 저널은 건드리지 않음)"""
+        shutil.rmtree(self.records_dir, ignore_errors=True)
+        if os.path.exists(self.state_file):
+            os.remove(self.state_file)
+
+    @staticmethod
+    def channel_key(channel_info: Dict) -> str:
+        """채널 식별 키 (채널 ID가 없으면 URL)"""
+        return channel_info.get('channel_id') or channel_info['channel_url']
+
+    def _record_path(self, key: str) -> str:
+        return os.path.join(self.records_dir, f"{hashlib.sha1(key.encode('utf-8')).hexdigest()}.json")
+
+    def _save_state(self):
+        os.makedirs(self.journal_dir, exist_ok=True)
+        tmp_path = f"{self.state_file}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.state, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.state_file)
+
+    def is_completed(self, key: str) -> bool:
+        return key in self.state['completed']
+
+    def needs_retry(self, key: str) -> bool:
+        """직전 실행(또는 이어받은 실행)에서 실패해 다시 수집해야 하는 채널인지"""
+        return key in self.state['retry'] or key in self.state['dead_letter']
+
+    def load_record(self, key: str) -> Dict:
+        """체크포인트된 채널 원본 데이터 로드"""
+        with open(self._record_path(key), 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def checkpoint(self, key: str, record: Dict):
+        """채널 수집 완료 기록"""
+        os.makedirs(self.records_dir, exist_ok=True)
+        path = self._record_path(key)
+        with open(f"{path}.tmp", 'w', encoding='utf-8') as f:
+            json.dump(record, f, ensure_ascii=False, separators=(',', ':'))
+        os.replace(f"{path}.tmp", path)
+
+        self.state['completed'][key] = datetime.now(timezone.utc).isoformat()
+        self.state['dead_letter'].pop(key, None)
+        self.state['retry'].pop(key, None)
+        self._save_state()
+
+    def dead_letter(self, key: str, name: str, error: Exception):
+        """재시도 후에도 실패한 채널 기록"""
+        previous = self.state['dead_letter'].get(key) or self.state['retry'].pop(key, {})
+        self.state['dead_letter'][key] = {
+            'name': name,
+            'error': str(error),
+            'attempts': previous.get('attempts', 0) + 1,
+            'failed_at': datetime.now(timezone.utc).isoformat()
+        }
+        self._save_state()
+
+    def finish(self):
+        """끝까지 실행됨: 체크포인트를 지우고 완료 표시와 실패 채널 목록만 남김
+
+        저널 파일은 항상 남기므로 워크플로우 캐시의 최신 항목은 언제나 직전 실행의 저널이다.
+        """
+        if self.state['dead_letter']:
+            logger.warning(f"실패한 채널 {len(self.state['dead_letter'])}개 - 다음 실행에서 다시 수집합니다")
+            for key, entry in self.state['dead_letter'].items():
+                logger.warning(f"  - {entry['name']} ({key}): {entry['error']}")
+
+        shutil.rmtree(self.records_dir, ignore_errors=True)
+        self.state.update(finished_at=datetime.now(timezone.utc).isoformat(), completed={}, retry={})
+        self._save_state()
+
+
+class RefreshScheduler:
+    """채널별 적응형 갱신 스케줄
+
+    최근 업로드가 있거나 조회수가 빠르게 오르는 채널은 최소 주기로 갱신하고,
+    변화가 없는 채널은 갱신할 때마다 주기를 지수적으로 늘린다. 주기는
+    REFRESH_MAX_INTERVAL_HOURS를 넘지 않으므로 어떤 채널도 그보다 오래 갱신되지 않는다.
+    """
+
+    def __init__(self, schedule_file: str = REFRESH_SCHEDULE_FILE):
+        self.schedule_file = schedule_file
+        self.schedule = self.load()
+
+    def load(self) -> Dict:
+        """스케줄 로드"""
+        if os.path.exists(self.schedule_file):
+            try:
+                with open(self.schedule_file, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+            except Exception as e:
+                logger.error(f"갱신 스케줄 로드 실패: {e}")
+        return {}
+
+    def save(self):
+        """스케줄 저장 (임시 파일 교체로 원자적 저장)"""
+        tmp_path = f"{self.schedule_file}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.schedule, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.schedule_file)
+
+    def is_due(self, key: str, now: datetime) -> bool:
+        """이번 실행에서 갱신해야 하는지 여부 (스케줄이 없으면 항상 갱신)"""
+        entry = self.schedule.get(key)
+        if entry is None:
+            return True
+
+        last_refreshed = datetime.fromisoformat(entry['last_refreshed'])
+        if now - last_refreshed >= timedelta(hours=REFRESH_MAX_INTERVAL_HOURS):
+            return True
+        next_due = datetime.fromisoformat(entry['next_due'])
+        return now + timedelta(minutes=REFRESH_DUE_TOLERANCE_MINUTES) >= next_due
+
+    def record_refresh(self, key: str, record: Dict, now: datetime) -> float:
+        """갱신 결과로 다음 갱신 주기 계산 (시간 단위 주기 반환)"""
+        entry = self.schedule.get(key, {})
+        videos = record.get('videos', [])
+        total_views = sum(video['views'] for video in videos)
+        latest_upload = max((video['published_at'] for video in videos), default=None)
+
+        active = False
+        reason = '변화 없음'
+        if latest_upload:
+            upload_age = now - datetime.fromisoformat(latest_upload.replace('Z', '+00:00'))
+            if upload_age <= timedelta(days=REFRESH_ACTIVE_UPLOAD_DAYS):
+                active, reason = True, '최근 업로드'
+            elif entry.get('latest_upload') and latest_upload > entry['latest_upload']:
+                active, reason = True, '새 업로드'
+
+        if not active and entry.get('total_views'):
+            hours = (now - datetime.fromisoformat(entry['last_refreshed'])).total_seconds() / 3600
+            daily_growth = (total_views - entry['total_views']) / entry['total_views'] * 24 / max(hours, 1)
+            if daily_growth >= REFRESH_FAST_VIEW_GROWTH:
+                active, reason = True, f"조회수 증가 {daily_growth * 100:.1f}%/일"
+
+        if not entry:
+            reason = '첫 갱신'
+        if active or not entry:
+            interval = REFRESH_MIN_INTERVAL_HOURS
+        else:
+            interval = min(REFRESH_MAX_INTERVAL_HOURS, entry['interval_hours'] * REFRESH_BACKOFF_FACTOR)
+
+        self.schedule[key] = {
+            'name': record.get('name', ''),
+            'interval_hours': interval,
+            'last_refreshed': now.isoformat(),
+            'next_due': (now + timedelta(hours=interval)).isoformat(),
+            'total_views': total_views,
+            'latest_upload': latest_upload,
+            'reason': reason
+        }
+        return interval
+
+
+def load_channels(filename: str) -> List[Dict]:
     """채널 목록 로드"""
     try:
         with open(filename, 'r', encoding='utf-8') as f:
@@ -640,41 +3026,319 @@ def load_channels(filename: str) -> List[Dict]:
         sys.exit(1)
 
 
-def create_excel(leaderboard: List[Dict], filename: str):
-    """Excel 파일 생성"""
-    rows = []
+def _sheets_color(rgb: Tuple[float, float, float]) -> Dict[str, float]:
+    return {'red': rgb[0], 'green': rgb[1], 'blue': rgb[2]}
+
+
+def _excel_color(rgb: Tuple[float, float, float]) -> str:
+    return ''.join(f"{round(value * 255):02X}" for value in rgb)
+
 
+def leaderboard_sheet_rows(leaderboard: List[Dict]) -> Iterator[List]:
+    """리더보드 시트 행 (LEADERBOARD_SHEET_HEADERS 순서, 헤더 제외)"""
     for rank, item in enumerate(leaderboard, 1):
-        badges = ' '.join(item.get('badges', []))
-        name_with_badges = f"{item['name']} {badges}".strip()
-        channel_handle = item['channel_url'].split('@')[-1]
+        try:
+            # 데이터 구조 확인 및 로깅
+            if rank == 1:  # 첫 번째 아이템만 상세 로깅
+                logger.info(f"첫 번째 아이템 키: {item.keys()}")
+
+            if item['status'] == 'success':
+                # item 자체가 이미 채널 데이터임 (leaderboard = all_channel_data)
+                # scores 정보가 있는지 확인
+                scores = item.get('scores', {})
+
+                row = [
+                    rank,
+                    item['name'],
+                    f"@{item.get('channel_handle', '')}",
+                    round(item.get('total_score', 0)),
+                    round(scores.get('score_median', item.get('score_median', 0))),
+                    round(scores.get('score_engagement', item.get('score_engagement', 0))),
+                    round(scores.get('score_viral', item.get('score_viral', 0))),
+                    round(scores.get('score_growth', item.get('score_growth', 0))),
+                    scores.get('video_count', item.get('video_count', 0)),
+                    round(scores.get('median_score', item.get('median_score', 0))),
+                    round(scores.get('avg_engagement', item.get('avg_engagement', 0)), 2),
+                    round(scores.get('top3_avg', item.get('top3_avg', 0))),
+                    round(scores.get('growth_ratio', item.get('growth_ratio', 0)), 2),
+                    ' '.join(item.get('badges', []))
+                ]
+            else:
+                row = [
+                    rank, item['name'], f"@{item.get('channel_handle', '')}",
+                    0, 0, 0, 0, 0,
+                    item.get('video_count', 0), 0, 0, 0, 0, ''
+                ]
 
-        if item['status'] == 'success':
-            rows.append({
-                '참여자': f"{name_with_badges}\n@{channel_handle}",
-                '최종': round(item['total_score']),
-                '기본': round(item['score_median']),
-                '참여': round(item['score_engagement']),
-                '바이럴': round(item['score_viral']),
-                '성장': round(item['score_growth'])
-            })
-        else:
-            # 채널을 찾을 수 없는 경우도 0점으로 처리
-            rows.append({
-                '참여자': f"{item['name']}\n@{channel_handle}",
-                '최종': 0,
-                '기본': 0,
-                '참여': 0,
-                '바이럴': 0,
-                '성장': 0
-            })
+        except Exception as e:
+            logger.error(f"행 {rank} 처리 중 오류: {e}")
+            # 오류 발생 시 기본값으로 행 추가
+            row = [rank, item.get('name', 'Unknown'), '', 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, '']
+
+        yield row
+
+
+def video_sheet_rows(all_channel_data: List[Dict],
+                     video_details: Optional[Callable[[Dict], List[Dict]]] = None) -> Iterator[List]:
+    """영상 상세 시트 행 (VIDEO_SHEET_HEADERS 순서, 헤더 제외)
+
+    채널 데이터에 video_details가 없으면 video_details(채널)로 채널별로 읽는다 (VideoDetailSink).
+    """
+    for channel in all_channel_data:
+        if channel['status'] != 'success':
+            continue
+        details = channel.get('video_details')
+        if details is None and video_details is not None:
+            details = video_details(channel)
+        for video in details or []:
+            # 날짜 형식 변환 (Google Sheets가 인식할 수 있는 형식으로)
+            published_at = video.get('published_at', '')
+            if published_at:
+                try:
+                    # ISO 형식을 datetime으로 파싱
+                    date_obj = datetime.fromisoformat(published_at.replace('Z', '+00:00'))
+                    # Google Sheets가 인식할 수 있는 형식으로 변환 (YYYY-MM-DD HH:MM:SS)
+                    formatted_date = date_obj.strftime('%Y-%m-%d %H:%M:%S')
+                except:
+                    formatted_date = published_at
+            else:
+                formatted_date = ''
+
+            yield [
+                formatted_date,  # 업로드날짜를 첫 번째로
+                channel['name'],
+                f"@{channel.get('channel_handle', '')}",
+                video.get('title', ''),
+                video.get('views', 0),
+                video.get('likes', 0),
+                video.get('comments', 0),
+                round(video.get('basic_score', 0)),
+                video.get('url', '')
+            ]
+
+
+def trending_sheet_sections(trending: Dict) -> List[Tuple[List[str], List[List]]]:
+    """트렌딩 시트의 (헤더, 행) 구역 목록: 채널 순위, 영상 순위"""
+    channel_rows = []
+    for item in trending['channels']:
+        top_video = item['top_video'] or {}
+        channel_rows.append([
+            item['rank'], item['name'], f"@{item['channel_handle']}", item['trending_score'],
+            item['view_velocity'], item['engagement_velocity'],
+            top_video.get('title', ''), top_video.get('url', '')
+        ])
+
+    video_rows = [
+        [item['rank'], item['name'], f"@{item['channel_handle']}", item['trending_score'],
+         item['view_velocity'], item['engagement_velocity'], item['title'], item['url']]
+        for item in trending['videos']
+    ]
+    return [(TRENDING_CHANNEL_HEADERS, channel_rows), (TRENDING_VIDEO_HEADERS, video_rows)]
+
+
+def create_excel(leaderboard: List[Dict], filename: str, trending: Optional[Dict] = None,
+                 video_details: Optional[Callable[[Dict], List[Dict]]] = None):
+    """로컬 Excel 파일 생성 (Google Sheets와 같은 시트/서식)
+
+    openpyxl의 write-only 모드로 행을 바로 파일에 흘려 쓰므로 행 수와 관계없이 메모리가 일정하다.
+    영상 상세는 video_details(채널)로 채널별로 읽어 온다.
+    """
+    if openpyxl is None:
+        logger.warning("openpyxl이 설치되지 않아 Excel 파일을 생성하지 않습니다 (pip install openpyxl)")
+        return
+
+    header_fill = PatternFill('solid', fgColor=_excel_color(SHEET_HEADER_RGB))
+    medal_fills = [PatternFill('solid', fgColor=_excel_color(rgb)) for rgb in SHEET_MEDAL_RGB]
+    header_font = Font(bold=True)
+    center = Alignment(horizontal='center')
+
+    def header_row(sheet, headers: List[str]) -> List:
+        cells = []
+        for value in headers:
+            cell = WriteOnlyCell(sheet, value=value)
+            cell.fill = header_fill
+            cell.font = header_font
+            cell.alignment = center
+            cells.append(cell)
+        return cells
+
+    def filled_row(sheet, values: List, fill) -> List:
+        cells = []
+        for value in values:
+            cell = WriteOnlyCell(sheet, value=value)
+            cell.fill = fill
+            cells.append(cell)
+        return cells
+
+    workbook = openpyxl.Workbook(write_only=True)
+    update_time = datetime.now(timezone(timedelta(hours=9))).strftime('%Y-%m-%d %H:%M:%S KST')
+
+    # 시트 1: 리더보드 (1-3위 금/은/동, 마지막 업데이트 시간은 P열)
+    leaderboard_sheet = workbook.create_sheet('리더보드')
+    leaderboard_sheet.freeze_panes = 'A2'
+    for column, width in (('B', 16), ('C', 24), ('N', 16), ('P', 26)):
+        leaderboard_sheet.column_dimensions[column].width = width
+    leaderboard_sheet.append(header_row(leaderboard_sheet, LEADERBOARD_SHEET_HEADERS) + [None, '마지막 업데이트'])
+    for index, row in enumerate(leaderboard_sheet_rows(leaderboard)):
+        if index < len(medal_fills):
+            row = filled_row(leaderboard_sheet, row, medal_fills[index])
+        if index == 0:
+            row = row + [None, update_time]
+        leaderboard_sheet.append(row)
+    if not leaderboard:
+        leaderboard_sheet.append([None] * (len(LEADERBOARD_SHEET_HEADERS) + 1) + [update_time])
+
+    # 시트 2: 영상 상세
+    videos_sheet = workbook.create_sheet('영상상세')
+    videos_sheet.freeze_panes = 'A2'
+    for column, width in (('A', 20), ('B', 16), ('C', 24), ('D', 48), ('I', 44)):
+        videos_sheet.column_dimensions[column].width = width
+    videos_sheet.append(header_row(videos_sheet, VIDEO_SHEET_HEADERS))
+    video_count = 0
+    for row in video_sheet_rows(leaderboard, video_details):
+        videos_sheet.append(row)
+        video_count += 1
+
+    # 시트 3: 트렌딩 (지금 뜨는 채널/영상)
+    if trending is not None:
+        trending_sheet = workbook.create_sheet('트렌딩')
+        for section, (headers, section_rows) in enumerate(trending_sheet_sections(trending)):
+            if section:
+                trending_sheet.append([])
+            trending_sheet.append(header_row(trending_sheet, headers))
+            for row in section_rows:
+                trending_sheet.append(row)
+
+    # 임시 파일에 쓴 뒤 교체 (저장 도중 실패해도 이전 파일 유지)
+    tmp_path = f"{filename}.tmp"
+    workbook.save(tmp_path)
+    os.replace(tmp_path, filename)
+    logger.info(f"Excel 파일 생성 완료: {filename} ({len(leaderboard)}개 채널, {video_count}개 영상)")
+
+
+def _analytics_schemas() -> Dict[str, 'pa.Schema']:
+    """분석용 테이블 스키마 (반복이 많은 리더보드/채널/제목 문자열은 사전 인코딩)"""
+    text = pa.dictionary(pa.int32(), pa.string())
+    when = pa.timestamp('s', tz='UTC')
+    return {
+        'videos': pa.schema([
+            ('run_at', when), ('board', text), ('rank', pa.int32()),
+            ('channel_id', text), ('creator_name', text), ('channel_name', text), ('channel_handle', text),
+            ('video_id', pa.string()), ('title', text), ('published_at', when),
+            ('views', pa.int64()), ('likes', pa.int64()), ('comments', pa.int64()),
+            ('basic_score', pa.float64()), ('url', pa.string()),
+        ]),
+        'channels': pa.schema([
+            ('run_at', when), ('board', text), ('rank', pa.int32()),
+            ('channel_id', text), ('creator_name', text), ('channel_name', text), ('channel_handle', text), ('status', text),
+            ('total_score', pa.float64()), ('score_median', pa.float64()), ('score_engagement', pa.float64()),
+            ('score_viral', pa.float64()), ('score_growth', pa.float64()),
+            ('video_count', pa.int32()), ('median_score', pa.float64()), ('avg_engagement', pa.float64()),
+            ('top3_avg', pa.float64()), ('growth_ratio', pa.float64()),
+            ('subscriber_count', pa.int64()), ('subscriber_change', pa.int64()),
+            ('badges', pa.list_(pa.string())),
+        ]),
+    }
 
-    # Excel 생성 스킵 - Google Sheets 사용 중
-    logger.info(f"Excel 생성 스킵 (Google Sheets 사용 중): {filename}")
 
+def _parse_utc(value: str) -> Optional[datetime]:
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        return None
+
+
+def _write_parquet(path: str, schema: 'pa.Schema', rows: Iterable[Dict]) -> int:
+    """행을 ANALYTICS_ROW_GROUP_SIZE개씩 묶어 Parquet 파일에 흘려 쓴다 (임시 파일 → 교체)"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    count = 0
+    batch = []
+    with pq.ParquetWriter(tmp_path, schema, compression='zstd') as writer:
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= ANALYTICS_ROW_GROUP_SIZE:
+                writer.write_batch(pa.RecordBatch.from_pylist(batch, schema=schema))
+                count += len(batch)
+                batch = []
+        if batch or count == 0:
+            writer.write_batch(pa.RecordBatch.from_pylist(batch, schema=schema))
+            count += len(batch)
+    os.replace(tmp_path, path)
+    return count
+
+
+def export_analytics(leaderboard: List[Dict], board: Dict, run_at: datetime,
+                     video_details: Optional[Callable[[Dict], List[Dict]]] = None,
+                     output_dir: str = ANALYTICS_OUTPUT_DIR):
+    """채널별 점수 구성요소와 영상별 수치를 Parquet으로 내보내기 (분석용)
+
+    {output_dir}/channels/run_date=YYYY-MM-DD/{리더보드}-{시각}.parquet 와 videos/ 아래 같은 경로에
+    실행마다 파일 하나씩 쌓는다 (Hive 파티션). pyarrow.dataset 등으로 필요한 열만 읽을 수 있다.
+    영상 행은 video_details(채널)로 채널별로 읽어 오므로 primary 리더보드만 기록된다.
+    """
+    if pa is None:
+        logger.warning("pyarrow가 설치되지 않아 분석용 Parquet 파일을 생성하지 않습니다 (pip install -r requirements-analytics.txt)")
+        return
+
+    schemas = _analytics_schemas()
+    run_at = run_at.astimezone(timezone.utc).replace(microsecond=0)
+    partition = f"run_date={run_at.strftime('%Y-%m-%d')}"
+    filename = f"{board['id']}-{run_at.strftime('%H%M%S')}.parquet"
+
+    def channel_columns(item: Dict) -> Dict:
+        # leaderboard.json과 같은 값: 핸들은 URL에서, channel_name은 채널명, 크리에이터 이름은 따로
+        return {
+            'channel_id': item.get('channel_id'),
+            'creator_name': item.get('name'),
+            'channel_name': item.get('channel_title') or None,
+            'channel_handle': item['channel_url'].split('@')[-1] if '@' in item.get('channel_url', '') else None,
+        }
 
-def upload_to_google_sheets(leaderboard: List[Dict], all_channel_data: List[Dict]):
-    """Google Sheets에 데이터 업로드"""
+    def channel_rows() -> Iterator[Dict]:
+        for rank, item in enumerate(leaderboard, 1):
+            yield {
+                'run_at': run_at, 'board': board['id'], 'rank': rank, **channel_columns(item),
+                'status': item.get('status'),
+                **{field: item.get(field) for field in (
+                    'total_score', 'score_median', 'score_engagement', 'score_viral', 'score_growth',
+                    'video_count', 'median_score', 'avg_engagement', 'top3_avg', 'growth_ratio',
+                    'subscriber_count', 'subscriber_change'
+                )},
+                'badges': item.get('badges', []),
+            }
+
+    def video_rows() -> Iterator[Dict]:
+        for rank, item in enumerate(leaderboard, 1):
+            if item['status'] != 'success':
+                continue
+            for video in video_details(item):
+                yield {
+                    'run_at': run_at, 'board': board['id'], 'rank': rank, **channel_columns(item),
+                    'video_id': video.get('video_id'), 'title': video.get('title'),
+                    'published_at': _parse_utc(video.get('published_at', '')),
+                    'views': video.get('views'), 'likes': video.get('likes'), 'comments': video.get('comments'),
+                    'basic_score': video.get('basic_score'), 'url': video.get('url'),
+                }
+
+    channel_count = _write_parquet(os.path.join(output_dir, 'channels', partition, filename),
+                                   schemas['channels'], channel_rows())
+    message = f"분석용 Parquet 생성 완료 [{board['id']}]: 채널 {channel_count}행"
+    if video_details is not None:
+        video_count = _write_parquet(os.path.join(output_dir, 'videos', partition, filename),
+                                     schemas['videos'], video_rows())
+        message += f", 영상 {video_count}행"
+    logger.info(f"{message} ({output_dir}/*/{partition}/{filename})")
+
+
+def upload_to_google_sheets(leaderboard: List[Dict], all_channel_data: List[Dict], trending: Optional[Dict] = None,
+                            video_details: Optional[Callable[[Dict], List[Dict]]] = None):
+    """Google Sheets에 데이터 업로드
+
+    채널 데이터에 video_details가 없으면 video_details(채널)로 영상 상세를 읽는다 (VideoDetailSink).
+    """
     try:
         logger.info("Google Sheets 업로드 시작...")
 
@@ -704,7 +3368,7 @@ def upload_to_google_sheets(leaderboard: List[Dict], all_channel_data: List[Dict
         logger.info("인증 파일 존재 확인 완료")
 
         creds = Credentials.from_service_account_file(credentials_file, scopes=scope)
-        client = gspread.authorize(creds)
+        client = gspread.authorize(creds, session=get_transport().authorized_session(creds))
         logger.info("Google API 인증 성공")
 
         # 스프레드시트 열기
@@ -717,56 +3381,8 @@ def upload_to_google_sheets(leaderboard: List[Dict], all_channel_data: List[Dict
             leaderboard_sheet = spreadsheet.add_worksheet(title='리더보드', rows=100, cols=20)
 
         # 리더보드 데이터 준비
-        leaderboard_headers = [
-            '순위', '이름', '채널명', '총점수', '채널점수', '인게이지먼트', '바이럴', '성장',
-            '영상수', '중앙값', '인게이지먼트율(%)', 'Top3평균', '성장비율', '뱃지'
-        ]
-
-        leaderboard_data = [leaderboard_headers]
-
         logger.info(f"리더보드 데이터 준비 중... 총 {len(leaderboard)}개 채널")
-
-        for rank, item in enumerate(leaderboard, 1):
-            try:
-                # 데이터 구조 확인 및 로깅
-                if rank == 1:  # 첫 번째 아이템만 상세 로깅
-                    logger.info(f"첫 번째 아이템 키: {item.keys()}")
-
-                if item['status'] == 'success':
-                    # item 자체가 이미 채널 데이터임 (leaderboard = all_channel_data)
-                    # scores 정보가 있는지 확인
-                    scores = item.get('scores', {})
-
-                    row = [
-                        rank,
-                        item['name'],
-                        f"@{item.get('channel_handle', '')}",
-                        round(item.get('total_score', 0)),
-                        round(scores.get('score_median', item.get('score_median', 0))),
-                        round(scores.get('score_engagement', item.get('score_engagement', 0))),
-                        round(scores.get('score_viral', item.get('score_viral', 0))),
-                        round(scores.get('score_growth', item.get('score_growth', 0))),
-                        scores.get('video_count', item.get('video_count', 0)),
-                        round(scores.get('median_score', item.get('median_score', 0))),
-                        round(scores.get('avg_engagement', item.get('avg_engagement', 0)), 2),
-                        round(scores.get('top3_avg', item.get('top3_avg', 0))),
-                        round(scores.get('growth_ratio', item.get('growth_ratio', 0)), 2),
-                        ' '.join(item.get('badges', []))
-                    ]
-                else:
-                    row = [
-                        rank, item['name'], f"@{item.get('channel_handle', '')}",
-                        0, 0, 0, 0, 0,
-                        item.get('video_count', 0), 0, 0, 0, 0, ''
-                    ]
-
-                leaderboard_data.append(row)
-
-            except Exception as e:
-                logger.error(f"행 {rank} 처리 중 오류: {e}")
-                # 오류 발생 시 기본값으로 행 추가
-                row = [rank, item.get('name', 'Unknown'), '', 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, '']
-                leaderboard_data.append(row)
+        leaderboard_data = [LEADERBOARD_SHEET_HEADERS] + list(leaderboard_sheet_rows(leaderboard))
 
         logger.info(f"리더보드 데이터 준비 완료: {len(leaderboard_data)}행")
 
@@ -777,24 +3393,14 @@ def upload_to_google_sheets(leaderboard: List[Dict], all_channel_data: List[Dict
 
         # 서식 설정
         leaderboard_sheet.format('A1:N1', {
-            'backgroundColor': {'red': 0.9, 'green': 0.9, 'blue': 0.9},
+            'backgroundColor': _sheets_color(SHEET_HEADER_RGB),
             'textFormat': {'bold': True},
             'horizontalAlignment': 'CENTER'
         })
 
-        # 1-3위 색상
-        if len(leaderboard) >= 1:
-            leaderboard_sheet.format('A2:N2', {
-                'backgroundColor': {'red': 1, 'green': 0.843, 'blue': 0}
-            })  # 금색
-        if len(leaderboard) >= 2:
-            leaderboard_sheet.format('A3:N3', {
-                'backgroundColor': {'red': 0.753, 'green': 0.753, 'blue': 0.753}
-            })  # 은색
-        if len(leaderboard) >= 3:
-            leaderboard_sheet.format('A4:N4', {
-                'backgroundColor': {'red': 0.804, 'green': 0.498, 'blue': 0.196}
-            })  # 동색
+        # 1-3위 색상 (금, 은, 동)
+        for index, rgb in enumerate(SHEET_MEDAL_RGB[:len(leaderboard)]):
+            leaderboard_sheet.format(f'A{index + 2}:N{index + 2}', {'backgroundColor': _sheets_color(rgb)})
 
         # 시트 2: 영상 상세
         try:
@@ -802,45 +3408,9 @@ def upload_to_google_sheets(leaderboard: List[Dict], all_channel_data: List[Dict
         except gspread.exceptions.WorksheetNotFound:
             videos_sheet = spreadsheet.add_worksheet(title='영상상세', rows=1000, cols=20)
 
-        # 영상 상세 데이터 준비
-        video_headers = [
-            '업로드날짜', '이름', '채널명', '영상제목',
-            '조회수', '좋아요', '댓글', '기본점수', 'URL'
-        ]
-
-        video_data = [video_headers]
-
-        # 모든 채널의 영상 정보 수집
-        video_count = 0
-        for channel in all_channel_data:
-            if channel['status'] == 'success' and 'video_details' in channel:
-                for video in channel['video_details']:
-                    # 날짜 형식 변환 (Google Sheets가 인식할 수 있는 형식으로)
-                    published_at = video.get('published_at', '')
-                    if published_at:
-                        try:
-                            # ISO 형식을 datetime으로 파싱
-                            date_obj = datetime.fromisoformat(published_at.replace('Z', '+00:00'))
-                            # Google Sheets가 인식할 수 있는 형식으로 변환 (YYYY-MM-DD HH:MM:SS)
-                            formatted_date = date_obj.strftime('%Y-%m-%d %H:%M:%S')
-                        except:
-                            formatted_date = published_at
-                    else:
-                        formatted_date = ''
-
-                    row = [
-                        formatted_date,  # 업로드날짜를 첫 번째로
-                        channel['name'],
-                        f"@{channel.get('channel_handle', '')}",
-                        video.get('title', ''),
-                        video.get('views', 0),
-                        video.get('likes', 0),
-                        video.get('comments', 0),
-                        round(video.get('basic_score', 0)),
-                        video.get('url', '')
-                    ]
-                    video_data.append(row)
-                    video_count += 1
+        # 영상 상세 데이터 준비 (모든 채널의 영상 정보)
+        video_data = [VIDEO_SHEET_HEADERS] + list(video_sheet_rows(all_channel_data, video_details))
+        video_count = len(video_data) - 1
 
         logger.info(f"영상 상세 데이터 준비 완료: {video_count}개 영상")
 
@@ -851,11 +3421,37 @@ def upload_to_google_sheets(leaderboard: List[Dict], all_channel_data: List[Dict
 
         # 헤더 서식
         videos_sheet.format('A1:I1', {
-            'backgroundColor': {'red': 0.9, 'green': 0.9, 'blue': 0.9},
+            'backgroundColor': _sheets_color(SHEET_HEADER_RGB),
             'textFormat': {'bold': True},
             'horizontalAlignment': 'CENTER'
         })
 
+        # 시트 3: 트렌딩 (지금 뜨는 채널/영상)
+        if trending is not None:
+            try:
+                trending_sheet = spreadsheet.worksheet('트렌딩')
+            except gspread.exceptions.WorksheetNotFound:
+                trending_sheet = spreadsheet.add_worksheet(title='트렌딩', rows=100, cols=10)
+
+            trending_data = []
+            header_rows = []
+            for headers, section_rows in trending_sheet_sections(trending):
+                if trending_data:
+                    trending_data.append([])
+                header_rows.append(len(trending_data) + 1)
+                trending_data.append(headers)
+                trending_data.extend(section_rows)
+
+            trending_sheet.clear()
+            trending_sheet.update('A1', trending_data)
+            for row in header_rows:
+                trending_sheet.format(f'A{row}:H{row}', {
+                    'backgroundColor': _sheets_color(SHEET_HEADER_RGB),
+                    'textFormat': {'bold': True},
+                    'horizontalAlignment': 'CENTER'
+                })
+            logger.info("트렌딩 시트 업데이트 완료")
+
         # 마지막 업데이트 시간 추가
         kst = timezone(timedelta(hours=9))
         update_time = datetime.now(kst).strftime('%Y-%m-%d %H:%M:%S KST')
@@ -878,16 +3474,18 @@ def upload_to_google_sheets(leaderboard: List[Dict], all_channel_data: List[Dict
         logger.error(traceback.format_exc())
 
 
-def create_json(leaderboard: List[Dict], filename: str):
-    """JSON 파일 생성 (웹페이지용)"""
+def build_json_output(leaderboard: List[Dict], board: Optional[Dict] = None) -> Dict:
+    """웹페이지용 JSON 구조 생성"""
     output = {
         'last_updated': datetime.now(timezone.utc).isoformat(),
         'period': {
-            'start': START_DATE,
-            'end': END_DATE
+            'start': board['start'] if board else START_DATE,
+            'end': board['end'] if board else END_DATE
         },
         'leaderboard': []
     }
+    if board:
+        output['board'] = {'id': board['id'], 'title': board['title']}
 
     for rank, item in enumerate(leaderboard, 1):
         channel_handle = item['channel_url'].split('@')[-1]
@@ -896,6 +3494,7 @@ def create_json(leaderboard: List[Dict], filename: str):
             output['leaderboard'].append({
                 'rank': rank,
                 'name': item['name'],
+                'channel_id': item.get('channel_id', ''),
                 'channel_handle': channel_handle,
                 'channel_name': item.get('channel_title', ''),
                 'channel_url': item['channel_url'],
@@ -932,11 +3531,15 @@ def create_json(leaderboard: List[Dict], filename: str):
                 },
                 'status': 'success'
             })
+            if item.get('stale'):
+                # 이번 실행에서 수집에 실패해 마지막 저장 데이터로 계산된 채널
+                output['leaderboard'][-1]['stale'] = True
         else:
-            # 채널을 찾을 수 없는 경우도 0점으로 표시
+            # 채널을 찾을 수 없거나 수집에 실패한 경우도 0점으로 표시
             output['leaderboard'].append({
                 'rank': rank,
                 'name': item['name'],
+                'channel_id': item.get('channel_id', ''),
                 'channel_handle': channel_handle,
                 'channel_name': item.get('channel_title', ''),
                 'channel_url': item['channel_url'],
@@ -971,100 +3574,502 @@ def create_json(leaderboard: List[Dict], filename: str):
                     'subscriber_change': item.get('subscriber_change', 0),  # 평가 기간 중 증감
                     'subscriber_change_percent': 0  # 증감률
                 },
-                'status': 'channel_not_found'
+                'status': item['status']
+            })
+
+    return output
+
+
+# 한글 음절 분해표 (U+AC00 + (초성 * 21 + 중성) * 28 + 종성)
+HANGUL_INITIALS = 'ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ'
+HANGUL_MEDIALS = 'ㅏㅐㅑㅒㅓㅔㅕㅖㅗㅘㅙㅚㅛㅜㅝㅞㅟㅠㅡㅢㅣ'
+HANGUL_FINALS = ['', 'ㄱ', 'ㄲ', 'ㄳ', 'ㄴ', 'ㄵ', 'ㄶ', 'ㄷ', 'ㄹ', 'ㄺ', 'ㄻ', 'ㄼ', 'ㄽ', 'ㄾ', 'ㄿ', 'ㅀ',
+                 'ㅁ', 'ㅂ', 'ㅄ', 'ㅅ', 'ㅆ', 'ㅇ', 'ㅈ', 'ㅊ', 'ㅋ', 'ㅌ', 'ㅍ', 'ㅎ']
+# 겹받침/이중모음은 실제 입력 순서대로 풀어야 입력 중인 글자('과' 입력 중의 '고')도 맞출 수 있음
+HANGUL_COMPOUND_JAMO = {
+    'ㄳ': 'ㄱㅅ', 'ㄵ': 'ㄴㅈ', 'ㄶ': 'ㄴㅎ', 'ㄺ': 'ㄹㄱ', 'ㄻ': 'ㄹㅁ', 'ㄼ': 'ㄹㅂ', 'ㄽ': 'ㄹㅅ',
+    'ㄾ': 'ㄹㅌ', 'ㄿ': 'ㄹㅍ', 'ㅀ': 'ㄹㅎ', 'ㅄ': 'ㅂㅅ',
+    'ㅘ': 'ㅗㅏ', 'ㅙ': 'ㅗㅐ', 'ㅚ': 'ㅗㅣ', 'ㅝ': 'ㅜㅓ', 'ㅞ': 'ㅜㅔ', 'ㅟ': 'ㅜㅣ', 'ㅢ': 'ㅡㅣ'
+}
+
+
+def _is_hangul_syllable(char: str) -> bool:
+    return '\uac00' <= char <= '\ud7a3'
+
+
+def _is_hangul_jamo(char: str) -> bool:
+    """호환용 자모 (키보드로 입력되는 'ㄱ', 'ㅏ' 등)"""
+    return '\u3131' <= char <= '\u318e'
+
+
+def normalize_search_text(text: str) -> str:
+    """검색용 정규화: 소문자, 라틴 문자 악센트 제거(é → e), 공백/기호 제거
+
+    한글 음절/자모는 NFKD로 풀면 조합형 자모가 되므로 그대로 두고 나머지 문자만 분해한다.
+    """
+    chars = []
+    for char in unicodedata.normalize('NFC', text or '').lower():
+        if not (_is_hangul_syllable(char) or _is_hangul_jamo(char)):
+            char = ''.join(c for c in unicodedata.normalize('NFKD', char) if not unicodedata.combining(c))
+        chars.extend(c for c in char if c.isalnum())
+    return ''.join(chars)
+
+
+def hangul_keystrokes(text: str) -> str:
+    """정규화된 문자열의 한글을 입력 순서대로의 자모로 분해 ('김소윤' → 'ㄱㅣㅁㅅㅗㅇㅠㄴ')"""
+    out = []
+    for char in text:
+        if _is_hangul_syllable(char):
+            code = ord(char) - 0xAC00
+            for jamo in (HANGUL_INITIALS[code // 588], HANGUL_MEDIALS[code // 28 % 21], HANGUL_FINALS[code % 28]):
+                out.append(HANGUL_COMPOUND_JAMO.get(jamo, jamo))
+        else:
+            out.append(HANGUL_COMPOUND_JAMO.get(char, char))
+    return ''.join(out)
+
+
+def hangul_initials(text: str) -> str:
+    """정규화된 문자열의 한글 초성만 추출 ('김소윤' → 'ㄱㅅㅇ', 한글이 아닌 문자는 제외)"""
+    out = []
+    for char in text:
+        if _is_hangul_syllable(char):
+            out.append(HANGUL_INITIALS[(ord(char) - 0xAC00) // 588])
+        elif char in HANGUL_INITIALS:
+            out.append(char)
+    return ''.join(out)
+
+
+def build_search_index(entries: List[Dict]) -> Dict:
+    """리더보드 항목의 이름/핸들/채널명으로 검색 인덱스 생성
+
+    text/initials는 항목 순서(순위 - 1)대로 필드별 자모 분해 문자열/초성 문자열을 줄바꿈으로 이은 것이고,
+    grams는 두 글자 조각 → 그 조각을 포함하는 항목 번호 목록이다. 클라이언트는 검색어를 같은 방식으로
+    분해해 조각 목록을 교집합한 뒤 후보만 includes로 확인한다 (자음만 입력하면 초성 검색).
+    """
+    text_keys = []
+    initial_keys = []
+    grams = {}
+    for position, entry in enumerate(entries):
+        fields = []
+        for value in (entry.get('name'), entry.get('channel_handle'), entry.get('channel_name')):
+            normalized = normalize_search_text(value)
+            if normalized and normalized not in fields:
+                fields.append(normalized)
+
+        text = '\n'.join(hangul_keystrokes(field) for field in fields)
+        initials = '\n'.join(key for key in dict.fromkeys(hangul_initials(field) for field in fields) if key)
+        text_keys.append(text)
+        initial_keys.append(initials)
+
+        entry_grams = set()
+        for key in (text + '\n' + initials).split('\n'):
+            for i in range(len(key) - SEARCH_GRAM_SIZE + 1):
+                entry_grams.add(key[i:i + SEARCH_GRAM_SIZE])
+        for gram in entry_grams:
+            grams.setdefault(gram, []).append(position)
+
+    return {
+        'gram_size': SEARCH_GRAM_SIZE,
+        'text': text_keys,
+        'initials': initial_keys,
+        'grams': dict(sorted(grams.items()))
+    }
+
+
+def write_static_bundle(output: Dict, output_dir: str = STATIC_OUTPUT_DIR) -> Dict:
+    """정적 배포용 파일 생성 (최소화 JSON + 매니페스트)
+
+    콘텐츠 해시를 파일명에 넣어 브라우저/CDN이 영구 캐시할 수 있게 하고,
+    매니페스트만 매번 재검증하도록 한다. last_updated는 매 실행마다 바뀌므로
+    해시 대상에서 제외하고 매니페스트에만 기록한다. 압축은 GitHub Pages가
+    전송 시 처리하므로 사전 압축본은 만들지 않는다.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+
+    payload = {key: value for key, value in output.items() if key != 'last_updated'}
+    data = json.dumps(payload, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    content_hash = hashlib.sha256(data).hexdigest()[:12]
+    filename = f"leaderboard.{content_hash}.json"
+    path = os.path.join(output_dir, filename)
+
+    # 같은 해시의 파일이 이미 있으면 내용이 동일하므로 다시 쓰지 않음
+    if not os.path.exists(path):
+        with open(path, 'wb') as f:
+            f.write(data)
+        logger.info(f"정적 파일 생성: {filename} ({len(data):,} bytes)")
+    else:
+        logger.info(f"리더보드 변경 없음, 기존 정적 파일 재사용: {filename}")
+
+    # 배포 순서는 매니페스트에 기록 (체크아웃 직후에는 파일 mtime이 모두 같아 순서를 알 수 없음)
+    manifest_path = os.path.join(output_dir, STATIC_MANIFEST_FILE)
+    previous = load_previous_output(manifest_path) or {}
+    versions = [filename] + [name for name in previous.get('versions', []) if name != filename]
+
+    manifest = {
+        'last_updated': output.get('last_updated'),
+        'file': filename,
+        'hash': content_hash,
+        'size': len(data),
+        'versions': versions[:STATIC_KEEP_VERSIONS]
+    }
+
+    # 매니페스트는 원자적으로 교체 (읽는 도중 잘린 파일이 보이지 않도록)
+    tmp_path = f"{manifest_path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, separators=(',', ':'))
+    os.replace(tmp_path, manifest_path)
+
+    _prune_static_versions(output_dir, keep=manifest['versions'])
+
+    return manifest
+
+
+def _prune_static_versions(output_dir: str, keep: List[str]):
+    """매니페스트의 versions(최신순 STATIC_KEEP_VERSIONS개)에 없는 해시 파일 정리"""
+    for name in sorted(os.listdir(output_dir)):
+        parts = name.split('.')
+        if len(parts) == 3 and parts[0] == 'leaderboard' and parts[2] == 'json' and parts[1] != 'manifest' \
+                and name not in keep:
+            os.remove(os.path.join(output_dir, name))
+            logger.info(f"오래된 정적 파일 삭제: {name}")
+
+
+def load_previous_output(filename: str) -> Optional[Dict]:
+    """직전 실행의 리더보드 JSON 로드 (없거나 손상되면 None)"""
+    if not os.path.exists(filename):
+        return None
+    try:
+        with open(filename, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        logger.warning(f"이전 리더보드 로드 실패: {e}")
+        return None
+
+
+def build_leaderboard_delta(previous: Dict, current: Dict) -> Dict:
+    """두 리더보드 사이의 변경분 계산
+
+    채널별로 바뀐 항목만 담는다: 순위, 총점, 획득/상실 뱃지,
+    새 바이럴 영상, 구독자 수. 값 쌍은 [이전, 현재] 형식.
+    """
+    # 다른 저장소와 같이 channel_id로 매칭 (URL/핸들 정리가 제거+추가로 보이지 않도록)
+    previous_entries = {entry.get('channel_id') or entry['channel_url']: entry
+                        for entry in previous.get('leaderboard', [])}
+    current_entries = {entry.get('channel_id') or entry['channel_url']: entry
+                       for entry in current.get('leaderboard', [])}
+
+    # channel_id가 없던 이전 출력은 URL로 한 번 더 매칭
+    previous_by_url = {entry['channel_url']: key for key, entry in previous_entries.items()}
+    for key, entry in current_entries.items():
+        if key not in previous_entries and entry['channel_url'] in previous_by_url:
+            previous_entries[key] = previous_entries.pop(previous_by_url[entry['channel_url']])
+
+    changes = []
+    for key, entry in current_entries.items():
+        before = previous_entries.get(key)
+        if before is None:
+            continue
+
+        change = {}
+        if before['rank'] != entry['rank']:
+            change['rank'] = [before['rank'], entry['rank']]
+        if before['total_score'] != entry['total_score']:
+            change['total_score'] = [before['total_score'], entry['total_score']]
+
+        before_badges = set(before.get('badges', []))
+        current_badges = set(entry.get('badges', []))
+        if current_badges - before_badges:
+            change['badges_earned'] = [b for b in entry['badges'] if b not in before_badges]
+        if before_badges - current_badges:
+            change['badges_lost'] = [b for b in before['badges'] if b not in current_badges]
+
+        before_viral = before.get('metrics', {}).get('viral_video', {})
+        current_viral = entry.get('metrics', {}).get('viral_video', {})
+        if current_viral.get('video_id') and current_viral.get('video_id') != before_viral.get('video_id'):
+            change['viral_video'] = {
+                'video_id': current_viral['video_id'],
+                'title': current_viral.get('title', ''),
+                'views': current_viral.get('views', 0)
+            }
+
+        before_subscribers = before.get('metrics', {}).get('subscriber_count', 0)
+        current_subscribers = entry.get('metrics', {}).get('subscriber_count', 0)
+        if before_subscribers != current_subscribers:
+            change['subscriber_count'] = [before_subscribers, current_subscribers]
+
+        if change:
+            changes.append({
+                'name': entry['name'],
+                'channel_handle': entry['channel_handle'],
+                **change
             })
 
+    return {
+        'from': previous.get('last_updated'),
+        'to': current.get('last_updated'),
+        'changes': changes,
+        'added': [entry['name'] for key, entry in current_entries.items() if key not in previous_entries],
+        'removed': [entry['name'] for key, entry in previous_entries.items() if key not in current_entries]
+    }
+
+
+def update_delta_feed(delta: Dict, feed_file: str, max_entries: int = DELTA_RING_SIZE) -> Dict:
+    """변경분 피드에 새 항목 추가 (최근 max_entries개만 유지하는 링 버퍼)"""
+    feed = load_previous_output(feed_file) or {'latest_seq': 0, 'deltas': []}
+
+    seq = feed.get('latest_seq', 0) + 1
+    deltas = feed.get('deltas', []) + [{'seq': seq, **delta}]
+
+    feed = {
+        'latest_seq': seq,
+        'deltas': deltas[-max_entries:]
+    }
+
+    with open(feed_file, 'w', encoding='utf-8') as f:
+        json.dump(feed, f, ensure_ascii=False, separators=(',', ':'))
+
+    logger.info(f"변경분 피드 업데이트: #{seq} ({len(delta['changes'])}개 채널 변경)")
+    return feed
+
+
+def create_json(leaderboard: List[Dict], filename: str, static_dir: Optional[str] = None,
+                delta_file: Optional[str] = None, board: Optional[Dict] = None,
+                trending: Optional[Dict] = None) -> Dict:
+    """JSON 파일 생성 (웹페이지용)
+
+    static_dir이 주어지면 해시 파일명 기반 정적 배포 파일도 함께 생성한다.
+    delta_file이 주어지면 덮어쓰기 전의 직전 결과와 비교해 변경분 피드를 갱신한다.
+    trending이 주어지면 'trending' 항목으로 함께 저장한다.
+    웹페이지 검색용 인덱스는 'search' 항목으로 저장한다.
+    """
+    previous = load_previous_output(filename) if delta_file else None
+    output = build_json_output(leaderboard, board)
+    if trending is not None:
+        output['trending'] = trending
+    output['search'] = build_search_index(output['leaderboard'])
+
     with open(filename, 'w', encoding='utf-8') as f:
         json.dump(output, f, ensure_ascii=False, indent=2)
 
     logger.info(f"JSON 파일 생성 완료: {filename}")
 
+    if previous is not None:
+        delta = build_leaderboard_delta(previous, output)
+        if delta['changes'] or delta['added'] or delta['removed']:
+            update_delta_feed(delta, delta_file)
+        else:
+            logger.info("직전 실행 대비 변경 사항 없음 - 변경분 피드 유지")
 
-def main():
-    """메인 함수"""
-    logger.info("=" * 60)
-    logger.info("YouTube Creator Leaderboard 생성 시작")
-    logger.info(f"평가 기간: {START_DATE} ~ {END_DATE}")
-    logger.info("=" * 60)
+    if static_dir:
+        write_static_bundle(output, static_dir)
 
-    # API 키 확인
-    if not API_KEY:
-        logger.error("YOUTUBE_API_KEY 환경 변수가 설정되지 않았습니다.")
-        sys.exit(1)
+    return output
 
-    # YouTube API 초기화
-    api = YouTubeAPI(API_KEY)
 
-    # 구독자 추적기 초기화
-    subscriber_tracker = SubscriberTracker()
+def load_board_configs(filename: str = LEADERBOARDS_FILE) -> List[Dict]:
+    """리더보드 설정 로드
 
-    # 채널 목록 로드
-    channels = load_channels(CHANNELS_FILE)
-    logger.info(f"총 {len(channels)}개 채널 로드")
+    설정 파일이 없으면 START_DATE/END_DATE와 기본 가중치로 단일 리더보드를 만든다.
+    각 리더보드는 기간(start/end 또는 롤링 윈도우 window_days), 참여 채널(channels: 채널 ID/이름/핸들 목록, 생략 시 전체),
+    가중치, 뱃지 기준, 출력 파일을 가질 수 있다. primary 리더보드만
+    Google Sheets, 정적 배포, 변경분 피드, 스냅샷 아카이브에 사용된다.
+    """
+    if os.path.exists(filename):
+        try:
+            with open(filename, 'r', encoding='utf-8') as f:
+                raw_boards = json.load(f).get('leaderboards', [])
+        except json.JSONDecodeError as e:
+            logger.error(f"리더보드 설정 파싱 에러: {e}")
+            sys.exit(1)
+    else:
+        raw_boards = []
 
-    # 각 채널 데이터 수집
-    all_channel_data = []
+    if not raw_boards:
+        raw_boards = [{'id': 'main', 'title': 'YouTube Creator Leaderboard'}]
 
-    for i, channel_info in enumerate(channels, 1):
-        logger.info(f"\n[{i}/{len(channels)}] {channel_info['name']} 처리 중...")
+    boards = []
+    now = datetime.now(timezone.utc)
+    for raw in raw_boards:
+        board_id = raw['id']
 
-        # channel_handle 처리 (명시적으로 제공된 경우 사용, 없으면 URL에서 추출)
-        if 'channel_handle' in channel_info:
-            channel_handle = channel_info['channel_handle']
+        # 롤링 윈도우 리더보드: 실행 시각 기준 최근 N일
+        window_days = raw.get('window_days')
+        if window_days:
+            start = (now - timedelta(days=window_days)).strftime('%Y-%m-%dT%H:%M:%SZ')
+            end = now.strftime('%Y-%m-%dT%H:%M:%SZ')
         else:
-            channel_handle = channel_info['channel_url'].split('@')[-1] if '@' in channel_info['channel_url'] else ''
-            channel_info['channel_handle'] = channel_handle
+            start = raw.get('start', START_DATE)
+            end = raw.get('end', END_DATE)
+
+        boards.append({
+            'id': board_id,
+            'title': raw.get('title', board_id),
+            'start': start,
+            'end': end,
+            'window_days': window_days,
+            'channels': set(raw['channels']) if raw.get('channels') else None,
+            'weights': {**DEFAULT_WEIGHTS, **raw.get('weights', {})},
+            'badge_rules': {**DEFAULT_BADGE_RULES, **raw.get('badges', {})},
+            'output': raw.get('output', f"leaderboard_{board_id}.json"),
+            'primary': bool(raw.get('primary', False))
+        })
 
-        # 채널 ID 가져오기 (channel_id가 있으면 바로 사용, 없으면 검색)
-        if channel_info.get('channel_id'):
-            channel_id = channel_info['channel_id']
-            logger.info(f"✓ 저장된 채널 ID 사용: {channel_id}")
-        else:
-            channel_id = api.get_channel_id(channel_info['channel_url'])
-        if not channel_id:
-            logger.warning(f"채널 ID를 찾을 수 없어 건너뜁니다: {channel_info['name']}")
-            all_channel_data.append({
-                **channel_info,
-                'status': 'channel_not_found'
-            })
-            continue
+    # primary 지정이 없으면 첫 번째 리더보드를 primary로 사용
+    if not any(board['primary'] for board in boards):
+        boards[0]['primary'] = True
+        if not raw_boards[0].get('output'):
+            boards[0]['output'] = 'leaderboard.json'
 
-        # 채널 정보 가져오기 (구독자 수 포함)
-        channel_stats = api.get_channel_info(channel_id)
-        if not channel_stats:
-            logger.warning(f"채널 정보를 가져올 수 없습니다: {channel_info['name']}")
-            channel_stats = {'subscriber_count': 0, 'total_videos': 0}
-
-        # 구독자 증감 추적
-        subscriber_info = subscriber_tracker.update_channel(
-            channel_id,
-            channel_info['name'],
-            channel_stats['subscriber_count']
-        )
+    return boards
 
-        # 영상 목록 가져오기
-        videos = api.get_channel_videos(channel_id, START_DATE, END_DATE)
 
-        # 점수 계산
-        scores = ScoreCalculator.calculate_channel_scores(videos)
+def board_includes(board: Dict, channel_info: Dict) -> bool:
+    """채널이 리더보드 참여 대상인지 확인 (채널 ID, 이름, 핸들 중 하나로 지정)"""
+    if board['channels'] is None:
+        return True
+    keys = {channel_info.get('channel_id'), channel_info.get('name'), channel_info.get('channel_handle')}
+    return bool(keys & board['channels'])
 
-        # 채널 정보 추가
-        scores['total_video_count'] = channel_stats['total_videos']
-        scores['subscriber_count'] = subscriber_info['current']
-        scores['subscriber_change'] = subscriber_info['change']
-        scores['subscriber_change_percent'] = subscriber_info['change_percent']
-        # channel_name: channels.json에서 가져온 값 우선, 없으면 API에서 가져온 값 사용
-        scores['channel_title'] = channel_info.get('channel_name', '') or channel_stats.get('channel_title', '')
 
-        all_channel_data.append({
+def fetch_channel(api: 'YouTubeAPI', channel_info: Dict, start_date: str, end_date: str,
+                  prefetched: Optional[Dict] = None) -> Dict:
+    """채널 하나의 원본 데이터 수집 (채널 정보, 기간 내 영상)
+
+    모든 리더보드가 공유하는 데이터이므로 채널당 한 번만 호출한다.
+    prefetched(YouTubeAPI.prefetch_channels 결과)에 있는 채널은 배치로 받아 둔 응답을 사용한다.
+    재시도 후에도 실패하면 ChannelFetchError를 올린다.
+    """
+    # 채널 ID 가져오기 (channel_id가 있으면 바로 사용, 없으면 검색)
+    if channel_info.get('channel_id'):
+        channel_id = channel_info['channel_id']
+        logger.info(f"✓ 저장된 채널 ID 사용: {channel_id}")
+    else:
+        channel_id = api.get_channel_id(channel_info['channel_url'])
+    if not channel_id:
+        logger.warning(f"채널 ID를 찾을 수 없어 건너뜁니다: {channel_info['name']}")
+        return {
             **channel_info,
-            **scores
-        })
+            'status': 'channel_not_found'
+        }
 
+    entry = (prefetched or {}).get(channel_id)
+    if entry is not None and 'error' in entry:
+        raise entry['error']
+
+    # 채널 정보 가져오기 (구독자 수 포함)
+    channel_stats = entry['channel_stats'] if entry is not None else api.get_channel_info(channel_id)
+    if not channel_stats:
+        logger.warning(f"채널 정보를 가져올 수 없습니다: {channel_info['name']}")
+        channel_stats = {'subscriber_count': 0, 'total_videos': 0}
+
+    # 영상 목록 가져오기 (모든 리더보드 기간의 합집합)
+    videos = api.get_channel_videos(channel_id, start_date, end_date, prefetched=entry)
+
+    return {
+        **channel_info,
+        'channel_id': channel_id,
+        'status': 'success',
+        'channel_stats': channel_stats,
+        'videos': videos
+    }
+
+
+def cached_channel_record(channel_info: Dict, video_store: VideoStore, start_date: str, end_date: str,
+                          skipped: bool = False) -> Dict:
+    """영상 저장소의 마지막 데이터로 채널 데이터 구성
+
+    수집에 실패한 채널은 stale로 표시하고, 저장된 데이터가 없으면 fetch_failed 상태로 남겨
+    0점과 구분한다. skipped면 갱신 주기가 아직 돌아오지 않아 건너뛴 채널이다.
+    """
+    channel_id = channel_info.get('channel_id')
+    if not channel_id or not video_store.has_channel(channel_id):
+        return {**channel_info, 'status': 'fetch_failed'}
+
+    if not skipped:
+        logger.warning(f"{channel_info['name']}: 마지막으로 저장된 데이터로 대체합니다")
+    videos = [video for video in video_store.channel_videos(channel_id, since=start_date)
+              if video['published_at'] <= end_date]
+    return {
+        **channel_info,
+        'channel_id': channel_id,
+        'status': 'success',
+        ('skipped' if skipped else 'stale'): True,
+        'channel_stats': video_store.channel_stats(channel_id) or {'subscriber_count': 0, 'total_videos': 0},
+        'videos': videos
+    }
+
+
+def track_channel_record(record: Dict, subscriber_tracker: SubscriberTracker, video_store: VideoStore,
+                         retain_since: str):
+    """수집한(또는 저널에서 복원한) 채널 데이터를 구독자 추적기와 영상 저장소에 반영"""
+    if record['status'] != 'success':
+        return
+
+    # 구독자 증감 추적
+    record['subscriber_info'] = subscriber_tracker.update_channel(
+        record['channel_id'],
+        record['name'],
+        record['channel_stats']['subscriber_count']
+    )
+
+    if not record.get('stale') and not record.get('skipped'):
+        video_store.update_channel(record['channel_id'], record['videos'], retain_since=retain_since,
+                                   channel_stats=record['channel_stats'])
+
+
+def summarize_channel(board: Dict, record: Dict, rolling_tracker: Optional[RollingWindowTracker] = None,
+                      sink: Optional['VideoDetailSink'] = None) -> Optional[Dict]:
+    """채널 하나를 리더보드 기준으로 점수 계산한 요약 (리더보드 대상이 아니면 None)
+
+    요약에는 점수와 채널 정보만 남기고 영상 목록은 버린다. sink가 주어지면 영상별 상세를
+    버리기 전에 sink에 기록한다.
+    롤링 윈도우 리더보드는 이번 실행에서 수집한 영상으로 윈도우 변화분만 집계에 반영한다.
+    """
+    channel_info = {key: value for key, value in record.items()
+                    if key not in ('status', 'channel_stats', 'subscriber_info', 'videos')}
+    if not board_includes(board, channel_info):
+        return None
+
+    if record['status'] != 'success':
+        return {**channel_info, 'status': record['status']}
+
+    # 점수 계산
+    if board.get('window_days') and rolling_tracker is not None:
+        aggregate = rolling_tracker.advance(board, record['channel_id'], record['videos'],
+                                            fresh=not record.get('stale') and not record.get('skipped'))
+        scores = aggregate.scores(board['weights'])
+    else:
+        # 리더보드 기간에 해당하는 영상만 사용 (업로드 순서 유지)
+        videos = [video for video in record['videos']
+                  if board['start'] <= video['published_at'] <= board['end']]
+        scores = ScoreCalculator.calculate_channel_scores(videos, board['weights'])
+    scores.pop('videos', None)
+    details = scores.pop('video_details', [])
+    if sink is not None:
+        sink.write(RunJournal.channel_key(record), details)
+
+    # 채널 정보 추가
+    channel_stats = record['channel_stats']
+    subscriber_info = record['subscriber_info']
+    scores['total_video_count'] = channel_stats['total_videos']
+    scores['subscriber_count'] = subscriber_info['current']
+    scores['subscriber_change'] = subscriber_info['change']
+    scores['subscriber_change_percent'] = subscriber_info['change_percent']
+    # channel_name: channels.json에서 가져온 값 우선, 없으면 API에서 가져온 값 사용
+    scores['channel_title'] = channel_info.get('channel_name', '') or channel_stats.get('channel_title', '')
+
+    return {
+        **channel_info,
+        **scores
+    }
+
+
+def rank_board(board: Dict, all_channel_data: List[Dict]) -> List[Dict]:
+    """채널 요약 목록에 뱃지를 붙이고 순위 순으로 정렬"""
     # 뱃지 계산
     for channel_data in all_channel_data:
         if channel_data['status'] == 'success':
-            badges, badge_descriptions = BadgeSystem.calculate_badges(channel_data)
+            badges, badge_descriptions = BadgeSystem.calculate_badges(channel_data, board['badge_rules'])
             channel_data['badges'] = badges
             channel_data['badge_descriptions'] = badge_descriptions
         else:
@@ -1072,15 +4077,467 @@ def main():
             channel_data['badge_descriptions'] = {}
 
     # 순위 정렬
-    leaderboard = sorted(
+    return sorted(
         all_channel_data,
         key=lambda x: x.get('total_score', -1),
         reverse=True
     )
 
+
+def score_board(board: Dict, channel_records: Iterable[Dict],
+                rolling_tracker: Optional[RollingWindowTracker] = None) -> List[Dict]:
+    """수집된 채널 데이터로 리더보드 하나의 점수/뱃지/순위 계산"""
+    summaries = (summarize_channel(board, record, rolling_tracker) for record in channel_records)
+    return rank_board(board, [summary for summary in summaries if summary is not None])
+
+
+def shard_index(channel_info: Dict, shard_count: int) -> int:
+    """채널이 속한 샤드 번호 (채널 키의 SHA-1 해시 기준, 실행/머신과 관계없이 고정)"""
+    digest = hashlib.sha1(RunJournal.channel_key(channel_info).encode('utf-8')).hexdigest()
+    return int(digest, 16) % shard_count
+
+
+def _parse_shard(value: str) -> Tuple[int, int]:
+    """--shard 인자 파싱 ("K/N", K는 0부터 N-1)"""
+    try:
+        index, count = (int(part) for part in value.split('/'))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"K/N 형식이어야 합니다: {value}")
+    if count < 1 or not 0 <= index < count:
+        raise argparse.ArgumentTypeError(f"샤드 번호는 0 이상 {count - 1} 이하여야 합니다: {value}")
+    return index, count
+
+
+def shard_result_path(shard_dir: str, index: int, count: int) -> str:
+    return os.path.join(shard_dir, f"part-{index:03d}-of-{count:03d}.json")
+
+
+def write_shard_result(shard_dir: str, index: int, count: int, channel_records: List[Dict],
+                       scheduler: 'RefreshScheduler', fetch_start: str, fetch_end: str, api_calls: int) -> str:
+    """샤드가 수집한 채널 원본 데이터와 갱신 스케줄을 부분 결과 파일로 저장
+
+    점수/순위/뱃지는 전체 채널을 보고 정해지므로 머지 단계에서 단일 실행과 같은 경로로 계산한다.
+    """
+    keys = {RunJournal.channel_key(record) for record in channel_records}
+    result = {
+        'shard': index,
+        'shards': count,
+        'created_at': datetime.now(timezone.utc).isoformat(),
+        'fetch_start': fetch_start,
+        'fetch_end': fetch_end,
+        'api_calls': api_calls,
+        'records': channel_records,
+        'schedule': {key: entry for key, entry in scheduler.schedule.items() if key in keys}
+    }
+
+    os.makedirs(shard_dir, exist_ok=True)
+    path = shard_result_path(shard_dir, index, count)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(result, f, ensure_ascii=False, separators=(',', ':'))
+    os.replace(tmp_path, path)
+    return path
+
+
+def load_shard_results(shard_dir: str, channels: List[Dict], scheduler: 'RefreshScheduler') -> List[Dict]:
+    """부분 결과 파일을 모아 단일 실행과 같은 채널 순서(channels.json 순서)의 원본 데이터로 복원
+
+    샤드가 빠졌거나 샤드 수가 서로 다르면 ValueError를 올린다.
+    """
+    results = []
+    for name in sorted(os.listdir(shard_dir)) if os.path.isdir(shard_dir) else []:
+        if name.startswith('part-') and name.endswith('.json'):
+            with open(os.path.join(shard_dir, name), 'r', encoding='utf-8') as f:
+                results.append(json.load(f))
+    if not results:
+        raise ValueError(f"부분 결과 파일이 없습니다: {shard_dir}")
+
+    counts = {result['shards'] for result in results}
+    if len(counts) != 1:
+        raise ValueError(f"샤드 수가 서로 다른 부분 결과가 섞여 있습니다: {sorted(counts)}")
+    count = counts.pop()
+    missing = sorted(set(range(count)) - {result['shard'] for result in results})
+    if missing:
+        raise ValueError(f"부분 결과가 없는 샤드: {missing} (전체 {count}개)")
+
+    records = {}
+    for result in results:
+        for record in result['records']:
+            records[RunJournal.channel_key(record)] = record
+        scheduler.schedule.update(result['schedule'])
+        logger.info(f"샤드 {result['shard']}/{count}: {len(result['records'])}개 채널 "
+                    f"(API 호출 {result['api_calls']}회, {result['created_at']})")
+
+    channel_records = []
+    for channel_info in channels:
+        key = RunJournal.channel_key(channel_info)
+        if key not in records:
+            raise ValueError(f"부분 결과에 없는 채널: {channel_info['name']} ({key})")
+        channel_records.append(records[key])
+    return channel_records
+
+
+def load_roster(boards: List[Dict]) -> List[Dict]:
+    """채널 목록 로드 (어느 리더보드에도 속하지 않는 채널은 제외)"""
+    channels = load_channels(CHANNELS_FILE)
+    for channel_info in channels:
+        # channel_handle 처리 (명시적으로 제공된 경우 사용, 없으면 URL에서 추출)
+        if 'channel_handle' not in channel_info:
+            channel_url = channel_info['channel_url']
+            channel_info['channel_handle'] = channel_url.split('@')[-1] if '@' in channel_url else ''
+
+    # 어느 리더보드에도 속하지 않는 채널은 수집하지 않음
+    return [channel for channel in channels if any(board_includes(board, channel) for board in boards)]
+
+
+CHANNEL_ID_PATTERN = re.compile(r'^UC[0-9A-Za-z_-]{22}$')
+
+
+def roster_handle(channel_info: Dict) -> str:
+    """비교용 핸들 (channel_handle 우선, 없으면 URL의 @ 뒤, 소문자/URL 디코딩)"""
+    handle = channel_info.get('channel_handle', '')
+    channel_url = channel_info.get('channel_url', '')
+    if not handle and '@' in channel_url:
+        handle = channel_url.split('@')[-1]
+    return urllib.parse.unquote(handle).strip('/').lstrip('@').lower()
+
+
+def check_roster_structure(channels: List[Dict], boards: Optional[List[Dict]] = None) -> Tuple[List[str], List[str]]:
+    """API 호출 없이 확인할 수 있는 로스터 오류/경고 (필수 항목, ID 형식, 중복)"""
+    errors = []
+    warnings = []
+    seen_ids = {}
+    seen_handles = {}
+
+    for i, channel in enumerate(channels):
+        label = channel.get('name', f"#{i}")
+        if 'name' not in channel:
+            errors.append(f"{label}: name 없음")
+        if not channel.get('channel_url'):
+            errors.append(f"{label}: channel_url 없음")
+
+        channel_id = channel.get('channel_id')
+        if not channel_id:
+            errors.append(f"{label}: channel_id 없음")
+        elif not CHANNEL_ID_PATTERN.match(channel_id):
+            errors.append(f"{label}: channel_id 형식 오류 ({channel_id})")
+        elif channel_id in seen_ids:
+            errors.append(f"{label}: channel_id {channel_id}가 {seen_ids[channel_id]}와 중복")
+        else:
+            seen_ids[channel_id] = label
+
+        explicit_handle = channel.get('channel_handle', '')
+        channel_url = channel.get('channel_url', '')
+        if explicit_handle and '@' in channel_url and roster_handle({'channel_url': channel_url}) != roster_handle(channel):
+            warnings.append(f"{label}: channel_handle \"{explicit_handle}\"이 URL 핸들과 다름")
+
+        handle = roster_handle(channel)
+        if not handle:
+            warnings.append(f"{label}: 핸들 없음 (channel_handle도 없고 URL에 @가 없음)")
+        elif handle in seen_handles:
+            errors.append(f"{label}: 핸들 @{handle}이 {seen_handles[handle]}와 중복")
+        else:
+            seen_handles[handle] = label
+
+    # 리더보드 설정에서 로스터에 없는 채널을 가리키는 경우
+    known = set(seen_ids) | set(seen_handles) | {channel.get('name') for channel in channels}
+    known |= {channel.get('channel_handle') for channel in channels}
+    for board in boards or []:
+        for key in sorted(board['channels'] or []):
+            if key not in known and key.lower() not in known:
+                warnings.append(f"리더보드 {board['id']}: channels.json에 없는 채널 '{key}'")
+
+    return errors, warnings
+
+
+class RosterValidator:
+    """channels.json 사전 검증
+
+    구조 검사(필수 항목, ID 형식, 중복 ID/핸들)를 먼저 하고, 통과하면 채널 ID가 실제로 있는지와
+    핸들이 그 ID의 핸들과 맞는지를 channels.list 50개씩 배치 요청 하나로 확인한다.
+    확인된 항목은 항목 내용의 해시로 캐시하므로 로스터가 바뀌지 않으면 API를 호출하지 않는다.
+    """
+
+    def __init__(self, cache_file: str = ROSTER_VALIDATION_FILE):
+        self.cache_file = cache_file
+        self.cache = self.load()
+
+    def load(self) -> Dict:
+        if os.path.exists(self.cache_file):
+            try:
+                with open(self.cache_file, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+            except Exception as e:
+                logger.error(f"로스터 검증 캐시 로드 실패: {e}")
+        return {'entries': {}}
+
+    def save(self):
+        tmp_path = f"{self.cache_file}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.cache, f, ensure_ascii=False, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.cache_file)
+
+    @staticmethod
+    def entry_hash(channel: Dict) -> str:
+        """채널 항목 내용 해시 (키 순서와 무관)"""
+        data = json.dumps(channel, ensure_ascii=False, sort_keys=True, separators=(',', ':'))
+        return hashlib.sha256(data.encode('utf-8')).hexdigest()[:16]
+
+    def _is_cached(self, entry_hash: str, now: datetime) -> bool:
+        entry = self.cache['entries'].get(entry_hash)
+        if entry is None:
+            return False
+        return now - datetime.fromisoformat(entry['verified_at']) < timedelta(days=ROSTER_VALIDATION_MAX_AGE_DAYS)
+
+    def validate(self, channels: List[Dict], api: Optional['YouTubeAPI'] = None,
+                 boards: Optional[List[Dict]] = None) -> bool:
+        """검증 결과를 로그로 남기고 오류가 없으면 True (api가 없으면 구조 검사만)"""
+        errors, warnings = check_roster_structure(channels, boards)
+        for warning in warnings:
+            logger.warning(f"⚠️  {warning}")
+        if errors:
+            # 구조 오류가 있으면 할당량을 쓰지 않고 바로 실패
+            for error in errors:
+                logger.error(f"❌ {error}")
+            return False
+
+        now = datetime.now(timezone.utc)
+        hashes = {self.entry_hash(channel): channel for channel in channels}
+        pending = {entry_hash: channel for entry_hash, channel in hashes.items() if not self._is_cached(entry_hash, now)}
+        logger.info(f"로스터 {len(channels)}개 채널 중 {len(channels) - len(pending)}개는 확인된 내용과 같음, "
+                    f"{len(pending)}개 확인 필요")
+
+        if pending and api is None:
+            logger.warning("YOUTUBE_API_KEY가 없어 채널 ID/핸들 확인을 건너뜁니다 (구조 검사만 수행)")
+        elif pending:
+            found = api.lookup_channels(list(dict.fromkeys(channel['channel_id'] for channel in pending.values())))
+            for entry_hash, channel in pending.items():
+                label = channel['name']
+                actual = found.get(channel['channel_id'])
+                if actual is None:
+                    errors.append(f"{label}: 존재하지 않는 채널 ID ({channel['channel_id']})")
+                    continue
+                handle = roster_handle(channel)
+                if handle and actual['handle'] and handle != actual['handle']:
+                    errors.append(f"{label}: 핸들 @{handle}이 채널 ID {channel['channel_id']}의 핸들 "
+                                  f"@{actual['handle']}({actual['title']})와 다름")
+                    continue
+                if handle and not actual['handle']:
+                    warnings.append(f"{label}: 채널에 핸들이 없어 @{handle} 일치 여부를 확인할 수 없음")
+                    logger.warning(f"⚠️  {warnings[-1]}")
+                self.cache['entries'][entry_hash] = {
+                    'channel_id': channel['channel_id'],
+                    'handle': actual['handle'],
+                    'verified_at': now.isoformat()
+                }
+
+            # 로스터에서 빠지거나 바뀐 항목의 캐시는 정리
+            self.cache['entries'] = {entry_hash: entry for entry_hash, entry in self.cache['entries'].items()
+                                     if entry_hash in hashes}
+            self.save()
+
+        if errors:
+            for error in errors:
+                logger.error(f"❌ {error}")
+            return False
+
+        logger.info(f"✅ 로스터 검증 통과: {len(channels)}개 채널")
+        return True
+
+
+def iter_channel_records(api: 'YouTubeAPI', channels: List[Dict], fetch_start: str, fetch_end: str,
+                         journal: RunJournal, scheduler: RefreshScheduler, video_store: VideoStore,
+                         refresh_all: bool = False, workers: int = FETCH_WORKERS) -> Iterator[Dict]:
+    """채널별 원본 데이터를 수집되는 대로 channels 순서대로 내보내는 제너레이터
+
+    갱신 주기가 돌아온 채널만 API로 수집하고, 나머지는 영상 저장소의 데이터를 사용한다.
+    채널은 CHANNELS_PER_REQUEST개씩 묶어 배치 사전 조회 후 스레드 풀에서 수집하며,
+    다음 묶음의 사전 조회를 미리 시작해 두므로 호출한 쪽이 앞 채널을 처리하는 동안 네트워크 I/O가 계속된다.
+    메모리에는 처리 중인 두 묶음의 응답만 남는다.
+    할당량이 초과되면 실행 저널에 기록한 뒤 QuotaExceededError를 그대로 올린다.
+    엔드포인트 회로가 열려 건너뛴 채널은 실패 목록에 넣지 않고 저장된 데이터로 대체한다.
+    """
+    # 갱신 주기가 돌아온 채널만 수집 (나머지는 영상 저장소의 데이터 사용)
+    now = datetime.now(timezone.utc)
+    due_keys = {
+        RunJournal.channel_key(channel) for channel in channels
+        if refresh_all
+        or journal.needs_retry(RunJournal.channel_key(channel))
+        or not video_store.has_channel(channel.get('channel_id', ''))
+        or scheduler.is_due(RunJournal.channel_key(channel), now)
+    }
+    logger.info(f"갱신 대상: {len(due_keys)}/{len(channels)}개 채널")
+
+    def needs_fetch(channel: Dict) -> bool:
+        key = RunJournal.channel_key(channel)
+        return key in due_keys and not journal.is_completed(key)
+
+    batch_enabled = os.getenv('YOUTUBE_BATCH_ENABLED', 'true').lower() == 'true'
+
+    def prefetch(chunk: List[Dict]) -> Dict[str, Dict]:
+        # 채널 ID가 있는 채널은 채널 정보와 첫 페이지를 배치 요청으로 미리 조회
+        pending_ids = list(dict.fromkeys(
+            channel['channel_id'] for channel in chunk if channel.get('channel_id') and needs_fetch(channel)
+        ))
+        if not batch_enabled or not pending_ids:
+            return {}
+        prefetched = api.prefetch_channels(pending_ids, fetch_start, fetch_end)
+        api_logger.info(f"{len(pending_ids)}개 채널 배치 사전 조회 완료")
+        return prefetched
+
+    def fetch(channel_info: Dict, prefetched: Dict[str, Dict]) -> Dict:
+        with log_channel(channel_info):
+            return fetch_channel(api, channel_info, fetch_start, fetch_end, prefetched)
+
+    chunks = [channels[offset:offset + CHANNELS_PER_REQUEST]
+              for offset in range(0, len(channels), CHANNELS_PER_REQUEST)]
+    executor = ThreadPoolExecutor(max_workers=max(workers, 1), thread_name_prefix='fetch')
+    try:
+        next_prefetch = executor.submit(prefetch, chunks[0]) if chunks else None
+        for chunk_index, chunk in enumerate(chunks):
+            prefetched = next_prefetch.result()
+            if chunk_index + 1 < len(chunks):
+                next_prefetch = executor.submit(prefetch, chunks[chunk_index + 1])
+
+            futures = {id(channel): executor.submit(fetch, channel, prefetched)
+                       for channel in chunk if needs_fetch(channel)}
+            del prefetched  # 사전 조회 응답은 각 수집 작업만 참조
+
+            for offset, channel_info in enumerate(chunk):
+                i = chunk_index * CHANNELS_PER_REQUEST + offset + 1
+                with log_channel(channel_info):
+                    key = RunJournal.channel_key(channel_info)
+
+                    if journal.is_completed(key):
+                        logger.info(f"\n[{i}/{len(channels)}] {channel_info['name']}: 실행 저널에서 복원")
+                        record = journal.load_record(key)
+                    elif key not in due_keys:
+                        next_due = scheduler.schedule[key]['next_due']
+                        logger.info(f"\n[{i}/{len(channels)}] {channel_info['name']}: 갱신 주기 전 (다음 갱신 {next_due})")
+                        record = cached_channel_record(channel_info, video_store, fetch_start, fetch_end, skipped=True)
+                    else:
+                        logger.info(f"\n[{i}/{len(channels)}] {channel_info['name']} 처리 중...")
+                        try:
+                            record = futures.pop(id(channel_info)).result()
+                        except QuotaExceededError as e:
+                            # 할당량 초과: 완료된 채널은 저널에 남아 있으므로 다음 --resume에서 이어서 수집
+                            journal.dead_letter(key, channel_info['name'], e)
+                            logger.error(f"API 할당량 초과로 중단합니다 ({i - 1}/{len(channels)}개 채널 완료): {e}")
+                            raise
+                        except CircuitOpenError as e:
+                            # 회로 차단은 채널 문제가 아니므로 실패로 남기지 않고 저장된 데이터로 대체
+                            # (갱신 기록을 남기지 않아 다음 실행에서 다시 수집 대상이 됨)
+                            logger.warning(f"{channel_info['name']}: {e}")
+                            record = cached_channel_record(channel_info, video_store, fetch_start, fetch_end)
+                        except ChannelFetchError as e:
+                            journal.dead_letter(key, channel_info['name'], e)
+                            logger.error(f"{channel_info['name']}: 수집 실패 - {e}")
+                            record = cached_channel_record(channel_info, video_store, fetch_start, fetch_end)
+                        else:
+                            journal.checkpoint(key, record)
+                            if record['status'] == 'success':
+                                interval = scheduler.record_refresh(key, record, now)
+                                logger.info(f"다음 갱신까지 {interval}시간 ({scheduler.schedule[key]['reason']})")
+
+                yield record
+    finally:
+        # 중단(할당량 초과, 호출한 쪽의 예외)되면 아직 시작하지 않은 수집은 취소
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def collect_channel_records(api: 'YouTubeAPI', channels: List[Dict], fetch_start: str, fetch_end: str,
+                            journal: RunJournal, scheduler: RefreshScheduler, video_store: VideoStore,
+                            refresh_all: bool = False) -> List[Dict]:
+    """채널별 원본 데이터를 모두 수집해 목록으로 반환 (샤드 부분 결과처럼 전체가 필요한 경우)"""
+    return list(iter_channel_records(api, channels, fetch_start, fetch_end, journal, scheduler, video_store,
+                                     refresh_all=refresh_all))
+
+
+class PersistentStores:
+    """실행 사이에 유지되는 상태 파일 묶음
+
+    단일 실행에서는 실행마다 한 번 로드하고, 데몬 모드에서는 메모리에 둔 채
+    주기마다 변경분만 반영해 저장한다.
+    """
+
+    def __init__(self):
+        self.video_store = VideoStore()
+        self.scheduler = RefreshScheduler()
+        self.subscriber_tracker = SubscriberTracker()
+        self.rolling_tracker = RollingWindowTracker()
+        self.timeseries = VideoTimeSeries()
+        self.trending = TrendingEngine()
+        self.snapshot_archive = SnapshotArchive()
+
+    def save(self, now: datetime):
+        """구독자 기준선 / 영상 저장소 / 시계열 / 트렌딩 / 갱신 스케줄 저장"""
+        self.subscriber_tracker.save_baseline()
+        self.video_store.save()
+        self.timeseries.save()
+        self.trending.save(now)
+        self.scheduler.save()
+
+    def close(self):
+        """열어 둔 파일 닫기 (데몬 모드에서 저장소를 다시 로드하기 전에 호출)"""
+        self.video_store.close()
+
+
+def publish_leaderboards(boards: List[Dict], channel_records: Iterable[Dict], retain_since: str,
+                         stores: PersistentStores):
+    """수집한 원본 데이터로 저장소를 갱신하고 리더보드별 결과 파일/Sheets 생성
+
+    channel_records는 iter_channel_records처럼 수집되는 대로 받아도 된다. 채널이 도착하면
+    바로 저장소에 반영하고 리더보드별 점수를 계산해 요약만 남기므로(영상 상세와 갱신한 채널의 영상은
+    VideoDetailSink 임시 파일로), 저장소와 요약이 차지하는 메모리는 영상 수가 아니라 채널 수에 비례한다.
+    (롤링 윈도우 리더보드의 집계는 윈도우 안의 영상 수에 비례한다.)
+    단일 실행과 샤드 머지가 같은 경로를 거치므로 결과가 동일하다.
+    """
+    now = datetime.now(timezone.utc)
+    points = 0
+    summaries = {board['id']: [] for board in boards}
+    sink = VideoDetailSink()  # primary 리더보드의 영상 상세 (Sheets 영상상세 시트용)
+    try:
+        records = iter(channel_records)
+        with profile_stage('collect'):
+            while True:
+                # 스트리밍 수집에서는 다음 채널을 기다리는 시간이 곧 수집 시간
+                with profile_stage('fetch'):
+                    record = next(records, None)
+                if record is None:
+                    break
+                with profile_stage('score'), log_channel(record):
+                    track_channel_record(record, stores.subscriber_tracker, stores.video_store, retain_since)
+                    if record['status'] == 'success' and not record.get('stale') and not record.get('skipped'):
+                        points += stores.timeseries.record_channel(record['channel_id'], record['videos'], now)
+                        stores.trending.observe_channel(record['channel_id'], record['videos'], now)
+
+                    for board in boards:
+                        summary = summarize_channel(board, record, stores.rolling_tracker,
+                                                    sink=sink if board['primary'] else None)
+                        if summary is not None:
+                            summaries[board['id']].append(summary)
+
+        with profile_stage('save'):
+            stores.save(now)
+        logger.info(f"시계열: 변화가 있는 영상 {points}개 기록 (전체 {len(stores.timeseries.index['videos'])}개, "
+                    f"{len(stores.timeseries.blob):,} bytes)")
+
+        for board in boards:
+            with profile_stage('publish'):
+                publish_board(board, rank_board(board, summaries.pop(board['id'])), retain_since, stores, sink, now)
+    finally:
+        sink.close()
+
+    if any(board['window_days'] for board in boards):
+        stores.rolling_tracker.save_state()
+
+
+def publish_board(board: Dict, leaderboard: List[Dict], retain_since: str, stores: PersistentStores,
+                  sink: VideoDetailSink, now: datetime):
+    """순위가 정해진 리더보드 하나의 결과 출력/파일/Sheets 생성"""
     # 결과 출력
     logger.info("\n" + "=" * 60)
-    logger.info("최종 순위")
+    logger.info(f"최종 순위 [{board['id']}]")
     logger.info("=" * 60)
     for rank, item in enumerate(leaderboard, 1):
         if item['status'] == 'success':
@@ -1089,32 +4546,604 @@ def main():
         else:
             logger.info(f"{rank}위: {item['name']} - 데이터 부족")
 
-    # 구독자 기준선 데이터 저장
-    subscriber_tracker.save_baseline()
-
     # 파일 생성
     logger.info("\n파일 생성 중...")
-    create_json(leaderboard, 'leaderboard.json')  # JSON은 웹페이지용으로 필요
+    analytics_enabled = os.getenv('ANALYTICS_EXPORT_ENABLED', 'false').lower() == 'true'
+    if not board['primary']:
+        with profile_stage('json'):
+            create_json(leaderboard, board['output'], board=board)
+        if analytics_enabled:
+            with profile_stage('analytics'):
+                export_analytics(leaderboard, board, now)
+        return
+
+    # 지금 뜨는 채널/영상 (리더보드에 속한 채널만, 영상은 저장소에서 채널별로 읽음)
+    with profile_stage('trending'):
+        trending_now = stores.trending.ranking(
+            {**channel, 'videos': stores.video_store.channel_videos(channel['channel_id'], since=retain_since)}
+            for channel in leaderboard if channel['status'] == 'success'
+        )
+
+    # 정적 배포 모드: 해시 파일 + 매니페스트를 docs/에 직접 생성
+    static_dir = STATIC_OUTPUT_DIR if os.getenv('STATIC_OUTPUT_ENABLED', 'false').lower() == 'true' else None
+    with profile_stage('json'):
+        output = create_json(leaderboard, board['output'], static_dir=static_dir,
+                             delta_file=DELTA_FEED_FILE, board=board,
+                             trending=trending_now)  # JSON은 웹페이지용으로 필요
+
+    # 스냅샷 아카이브에 이번 실행 기록 + 순위 추이 파일 생성
+    with profile_stage('history'):
+        stores.snapshot_archive.append(output)
+        stores.snapshot_archive.export_rank_history(RANK_HISTORY_FILE)
+
+    # 분석용 Parquet (채널별 점수 구성요소 + 영상별 수치)
+    if analytics_enabled:
+        with profile_stage('analytics'):
+            export_analytics(leaderboard, board, now,
+                             video_details=lambda channel: sink.read(RunJournal.channel_key(channel)))
 
     # Google Sheets 업로드 (환경 변수 확인)
     if os.getenv('GOOGLE_SHEETS_ENABLED', 'false').lower() == 'true':
         logger.info("\nGoogle Sheets 업로드 중...")
-        upload_to_google_sheets(leaderboard, all_channel_data)
+        with profile_stage('sheets'):
+            upload_to_google_sheets(leaderboard, leaderboard, trending=trending_now,
+                                    video_details=lambda channel: sink.read(RunJournal.channel_key(channel)))
     else:
         # Google Sheets가 비활성화된 경우에만 로컬 Excel 생성
-        create_excel(leaderboard, 'leaderboard.xlsx')
+        with profile_stage('excel'):
+            create_excel(leaderboard, EXCEL_FILE, trending=trending_now,
+                         video_details=lambda channel: sink.read(RunJournal.channel_key(channel)))
         logger.info("Google Sheets가 비활성화되어 로컬 Excel 파일을 생성했습니다.")
 
+
+def run_cycle(api: 'YouTubeAPI', stores: PersistentStores, args: argparse.Namespace, resume: bool = False):
+    """수집부터 결과 파일 생성까지 한 번 실행 (샤드 모드면 부분 결과 저장까지)"""
+    boards = load_board_configs(LEADERBOARDS_FILE)
+
+    # 모든 리더보드 기간의 합집합으로 한 번만 수집
+    fetch_start = min(board['start'] for board in boards)
+    fetch_end = max(board['end'] for board in boards)
+
+    logger.info("=" * 60)
+    logger.info("YouTube Creator Leaderboard 생성 시작")
+    for board in boards:
+        logger.info(f"[{board['id']}] 평가 기간: {board['start']} ~ {board['end']} → {board['output']}")
+    logger.info("=" * 60)
+
+    channels = load_roster(boards)
+    logger.info(f"총 {len(channels)}개 채널 로드")
+
+    api_calls, retries, batch_calls = api.api_calls, api.retries, api.batch_calls
+    hedged_calls, hedge_wins = api.hedged_calls, api.hedge_wins
+
+    journal_dir = RUN_JOURNAL_DIR
+    if args.shard:
+        shard, shard_count = args.shard
+        channels = [channel for channel in channels if shard_index(channel, shard_count) == shard]
+        journal_dir = os.path.join(RUN_JOURNAL_DIR, f"shard-{shard}-of-{shard_count}")
+        logger.info(f"샤드 {shard}/{shard_count}: {len(channels)}개 채널 담당")
+
+    # 실행 저널 시작 (resume이면 완료된 채널은 다시 수집하지 않음)
+    journal = RunJournal(journal_dir)
+    journal.start(resume=resume)
+
+    if args.shard:
+        # 공유 상태 파일은 머지 단계에서 한 번만 갱신
+        with profile_stage('fetch'):
+            channel_records = collect_channel_records(api, channels, fetch_start, fetch_end, journal, stores.scheduler,
+                                                      stores.video_store, refresh_all=args.refresh_all)
+        path = write_shard_result(args.shard_dir, shard, shard_count, channel_records, stores.scheduler,
+                                  fetch_start, fetch_end, api.api_calls - api_calls)
+        journal.finish()
+        logger.info(f"부분 결과 저장: {path} (API 호출 {api.api_calls - api_calls}회)")
+        return
+
+    # 수집되는 대로 점수 계산 (채널별 원본 데이터는 처리 후 바로 버림)
+    counts = {'channels': 0, 'success': 0}
+
+    def counted(records: Iterator[Dict]) -> Iterator[Dict]:
+        for record in records:
+            counts['channels'] += 1
+            counts['success'] += record['status'] == 'success'
+            yield record
+
+    channel_records = iter_channel_records(api, channels, fetch_start, fetch_end, journal, stores.scheduler,
+                                           stores.video_store, refresh_all=args.refresh_all)
+    publish_leaderboards(boards, counted(channel_records), fetch_start, stores)
+
+    journal.finish()
+
     # 통계
     logger.info("\n" + "=" * 60)
     logger.info("실행 통계")
     logger.info("=" * 60)
-    logger.info(f"총 API 호출 횟수: {api.api_calls}")
-    logger.info(f"성공적으로 처리된 채널: {sum(1 for x in leaderboard if x['status'] == 'success')}개")
-    logger.info(f"데이터 부족 채널: {sum(1 for x in leaderboard if x['status'] != 'success')}개")
+    logger.info(f"리더보드 수: {len(boards)}개")
+    logger.info(f"총 API 호출 횟수: {api.api_calls - api_calls} (재시도 {api.retries - retries}회, "
+                f"배치 요청 {api.batch_calls - batch_calls}회)")
+    logger.info(f"API 키 사용량 ({api.key_pool.usage['day']} PT, 예상): {api.key_pool.summary()}")
+    logger.info(f"헤지 요청 {api.hedged_calls - hedged_calls}회 (먼저 응답 {api.hedge_wins - hedge_wins}회)")
+    for line in api.endpoint_summary():
+        logger.info(f"  {line}")
+    transport_stats = get_transport().stats()
+    logger.info(f"HTTP 요청 {transport_stats['requests']}건 / 커넥션 {transport_stats['connections']}개 사용")
+    logger.info(f"성공적으로 처리된 채널: {counts['success']}개")
+    logger.info(f"데이터 부족 채널: {counts['channels'] - counts['success']}개")
     logger.info("=" * 60)
     logger.info("완료!")
 
 
+class LeaderboardDaemon:
+    """프로세스를 유지하며 주기적으로 리더보드를 갱신하는 서비스 모드
+
+    API 클라이언트(디스커버리 문서 파싱, 커넥션 풀)와 상태 파일은 한 번만 로드해 메모리에 두고,
+    주기마다 갱신 주기가 돌아온 채널만 수집한 뒤 결과 파일과 상태 파일을 저장한다.
+    SIGTERM/SIGINT를 받으면 진행 중인 주기를 마치고 종료하며, SIGHUP을 받으면 바로 다음 주기를 시작한다.
+    """
+
+    def __init__(self, api: 'YouTubeAPI', stores: PersistentStores, args: argparse.Namespace,
+                 interval_minutes: float = DAEMON_INTERVAL_MINUTES,
+                 server: Optional['LeaderboardAPIServer'] = None):
+        self.api = api
+        self.stores = stores
+        self.args = args
+        self.interval = interval_minutes * 60
+        self.server = server
+        self.stop_event = threading.Event()
+        self.wake_event = threading.Event()
+
+    def _handle_stop(self, signum, frame):
+        logger.info(f"종료 신호 수신 ({signal.Signals(signum).name}) - 진행 중인 주기를 마치고 종료합니다")
+        # 두 번째 신호는 기본 동작(즉시 종료)
+        signal.signal(signum, signal.SIG_DFL)
+        self.stop_event.set()
+        self.wake_event.set()
+
+    def _reload_stores(self):
+        # 수집 도중 중단된 주기는 저장소를 일부 채널만 갱신한 채 남기므로 마지막 저장본으로 되돌림
+        self.stores.close()
+        self.stores = PersistentStores()
+
+    def _handle_wake(self, signum, frame):
+        logger.info("SIGHUP 수신 - 다음 주기를 바로 시작합니다")
+        self.wake_event.set()
+
+    def run(self):
+        signal.signal(signal.SIGTERM, self._handle_stop)
+        signal.signal(signal.SIGINT, self._handle_stop)
+        if hasattr(signal, 'SIGHUP'):
+            signal.signal(signal.SIGHUP, self._handle_wake)
+
+        logger.info(f"데몬 모드 시작 (주기 {self.interval / 60:g}분)")
+        if self.server is not None:
+            self.server.start_background()
+        cycle = 0
+        # 첫 주기는 이전 프로세스가 중단하며 남긴 저널을 이어받고, 이후에는 앞 주기가
+        # 할당량 초과나 오류로 중단된 경우에만 이어받음 (정상 종료 뒤에는 새 저널에서 실패 채널만 재시도)
+        resume = True
+        while not self.stop_event.is_set():
+            cycle += 1
+            started = time.monotonic()
+            try:
+                run_cycle(self.api, self.stores, self.args, resume=resume)
+                resume = False
+            except QuotaExceededError:
+                logger.error("API 할당량 초과 - 다음 주기에 남은 채널부터 이어서 수집합니다")
+                self._reload_stores()
+                resume = True
+            except Exception:
+                logger.exception(f"주기 {cycle} 실패 - 다음 주기에 다시 시도합니다")
+                self._reload_stores()
+                resume = True
+            self.api.key_pool.save()
+            if self.server is not None:
+                # 이번 주기 결과로 새 인덱스를 만든 뒤 교체 (실패하면 이전 인덱스로 계속 응답)
+                try:
+                    boards = load_board_configs(LEADERBOARDS_FILE)
+                    self.server.swap_index(LeaderboardIndex.from_files(boards, self.stores.snapshot_archive))
+                except Exception:
+                    logger.exception("API 인덱스 재생성 실패 - 이전 인덱스로 계속 응답합니다")
+            logger.info(f"주기 {cycle} 종료 ({time.monotonic() - started:.1f}초)")
+
+            self.wake_event.wait(timeout=max(self.interval - (time.monotonic() - started), 0))
+            self.wake_event.clear()
+
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+        self.stores.close()
+        logger.info("데몬 종료")
+
+
+def _entry_metric(entry: Dict, metric: str):
+    """API 정렬 기준 값 (total_score, score_breakdown 항목, metrics 항목 순으로 찾음)"""
+    if metric == 'total_score':
+        return entry.get('total_score')
+    if metric in entry.get('score_breakdown', {}):
+        return entry['score_breakdown'][metric]
+    return entry.get('metrics', {}).get(metric)
+
+
+class LeaderboardIndex:
+    """API 서버가 조회하는 읽기 전용 인덱스
+
+    리더보드 결과 파일과 스냅샷 아카이브로 한 번 만들고 이후에는 바꾸지 않는다.
+    갱신할 때는 새 인덱스를 만들어 서버의 참조를 통째로 교체하므로, 처리 중인 요청은
+    이전 인덱스로 끝까지 응답하고 잠금이 필요 없다.
+    """
+
+    def __init__(self, outputs: Dict[str, Dict], primary: str, archive: Optional[SnapshotArchive] = None):
+        self.primary = primary
+        self.boards = {}
+        for board_id, output in outputs.items():
+            entries = output.get('leaderboard', [])
+            by_key = {}
+            for entry in entries:
+                if entry.get('channel_id'):
+                    by_key[entry['channel_id']] = entry
+                if entry.get('channel_handle'):
+                    by_key[entry['channel_handle'].lower()] = entry
+
+            # 숫자 지표마다 내림차순 목록을 미리 정렬 (동점은 순위 순)
+            metric_names = {'total_score'}
+            for entry in entries:
+                metric_names.update(entry.get('score_breakdown', {}))
+                metric_names.update(name for name, value in entry.get('metrics', {}).items()
+                                    if isinstance(value, (int, float)) and not isinstance(value, bool))
+            sorted_by = {}
+            for metric in metric_names:
+                ranked = [entry for entry in entries if isinstance(_entry_metric(entry, metric), (int, float))]
+                ranked.sort(key=lambda entry: (-_entry_metric(entry, metric), entry['rank']))
+                sorted_by[metric] = ranked
+
+            badges = {}
+            for entry in entries:
+                for badge in entry.get('badges', []):
+                    badges.setdefault(badge, []).append(entry)
+
+            self.boards[board_id] = {
+                'output': output,
+                'by_key': by_key,
+                'sorted_by': sorted_by,
+                'badges': badges
+            }
+
+        # 순위 추이는 인덱스 생성 시점에 복사 (아카이브는 데몬이 계속 추가하므로 공유하지 않음)
+        self.history = {}
+        if archive is not None:
+            for channel_id in archive.index['channels']:
+                self.history[channel_id] = archive.channel_history(channel_id)
+
+        # 인덱스 버전 = 리더보드별 갱신 시각 (ETag와 응답 캐시가 버전에 묶임)
+        stamp = json.dumps({board_id: board['output'].get('last_updated') for board_id, board in self.boards.items()},
+                           sort_keys=True)
+        self.version = hashlib.sha1(stamp.encode('utf-8')).hexdigest()[:12]
+        self.responses = {}  # (경로, 쿼리) → (상태, 본문, gzip 본문, ETag)
+
+    @classmethod
+    def from_files(cls, boards: List[Dict], archive: Optional[SnapshotArchive] = None) -> 'LeaderboardIndex':
+        """리더보드 설정의 결과 파일들로 인덱스 생성 (아직 없는 파일은 건너뜀)"""
+        outputs = {}
+        for board in boards:
+            output = load_previous_output(board['output'])
+            if output is not None:
+                outputs[board['id']] = output
+        primary = next(board['id'] for board in boards if board['primary'])
+        return cls(outputs, primary, archive)
+
+    def _board(self, params: Dict) -> Tuple[Optional[str], Optional[Dict]]:
+        board_id = params.get('board', self.primary)
+        return board_id, self.boards.get(board_id)
+
+    @staticmethod
+    def _summary(entry: Dict) -> Dict:
+        return {
+            'rank': entry['rank'],
+            'name': entry['name'],
+            'channel_id': entry.get('channel_id'),
+            'channel_handle': entry.get('channel_handle'),
+            'total_score': entry['total_score'],
+            'badges': entry.get('badges', [])
+        }
+
+    def query(self, path: str, params: Dict[str, str]) -> Tuple[int, Dict]:
+        """요청 경로/쿼리 → (HTTP 상태, 응답 본문)"""
+        parts = [urllib.parse.unquote(part) for part in path.strip('/').split('/') if part]
+
+        if parts == ['healthz']:
+            return 200, {'status': 'ok', 'version': self.version, 'boards': len(self.boards)}
+        if not parts or parts[0] != 'api' or len(parts) > 3:
+            return 404, {'error': 'not_found', 'path': path}
+        endpoint, arg = parts[1] if len(parts) > 1 else '', parts[2] if len(parts) > 2 else None
+
+        if endpoint == 'boards' and arg is None:
+            return 200, {'boards': [{
+                'id': board_id,
+                'title': board['output'].get('board', {}).get('title', board_id),
+                'period': board['output'].get('period'),
+                'last_updated': board['output'].get('last_updated'),
+                'channels': len(board['output'].get('leaderboard', [])),
+                'metrics': sorted(board['sorted_by']),
+                'primary': board_id == self.primary
+            } for board_id, board in self.boards.items()]}
+
+        if endpoint == 'history' and arg:
+            # 핸들로 요청해도 채널 ID로 찾음 (아카이브는 채널 ID 기준)
+            _, board = self._board(params)
+            entry = board['by_key'].get(arg.lower(), board['by_key'].get(arg)) if board else None
+            channel_id = entry['channel_id'] if entry else arg
+            if channel_id not in self.history:
+                return 404, {'error': 'unknown_channel', 'channel': arg}
+            return 200, {'channel_id': channel_id, 'history': self.history[channel_id]}
+
+        board_id, board = self._board(params)
+        if board is None:
+            return 404, {'error': 'unknown_board', 'board': board_id}
+
+        if endpoint == 'top' and arg is None:
+            metric = params.get('metric', 'total_score')
+            if metric not in board['sorted_by']:
+                return 400, {'error': 'unknown_metric', 'metric': metric, 'metrics': sorted(board['sorted_by'])}
+            try:
+                limit = min(max(int(params.get('n', API_DEFAULT_LIMIT)), 1), API_MAX_LIMIT)
+            except ValueError:
+                return 400, {'error': 'invalid_n', 'n': params['n']}
+            return 200, {
+                'board': board_id,
+                'metric': metric,
+                'last_updated': board['output'].get('last_updated'),
+                'results': [{**self._summary(entry), 'value': _entry_metric(entry, metric)}
+                            for entry in board['sorted_by'][metric][:limit]]
+            }
+
+        if endpoint == 'creators' and arg:
+            entry = board['by_key'].get(arg.lower(), board['by_key'].get(arg))
+            if entry is None:
+                return 404, {'error': 'unknown_channel', 'channel': arg}
+            return 200, {'board': board_id, 'last_updated': board['output'].get('last_updated'), 'creator': entry}
+
+        if endpoint == 'badges':
+            if arg is None:
+                return 200, {'board': board_id, 'badges': {
+                    badge: [self._summary(entry) for entry in holders] for badge, holders in board['badges'].items()
+                }}
+            # 오타(없는 뱃지)는 404, 있는 뱃지를 아무도 받지 못했으면 빈 목록
+            if arg not in BADGE_INFO:
+                return 404, {'error': 'unknown_badge', 'badge': arg, 'badges': list(BADGE_INFO)}
+            holders = board['badges'].get(arg, [])
+            return 200, {
+                'board': board_id,
+                'badge': arg,
+                'description': BADGE_INFO[arg],
+                'holders': [self._summary(entry) for entry in holders]
+            }
+
+        if endpoint == 'trending' and arg is None:
+            trending = board['output'].get('trending')
+            if trending is None:
+                return 404, {'error': 'no_trending', 'board': board_id}
+            return 200, {'board': board_id, 'trending': trending}
+
+        return 404, {'error': 'not_found', 'path': path}
+
+    def response(self, path: str, query: str) -> Tuple[int, bytes, Optional[bytes], str]:
+        """직렬화된 응답 (같은 인덱스에서 같은 요청은 한 번만 만듦)"""
+        key = (path, query)
+        cached = self.responses.get(key)
+        if cached is not None:
+            return cached
+
+        status, payload = self.query(path, dict(urllib.parse.parse_qsl(query)))
+        body = json.dumps(payload, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        compressed = gzip.compress(body, compresslevel=6) if len(body) >= API_GZIP_MIN_BYTES else None
+        etag = f'"{self.version}-{hashlib.sha1(body).hexdigest()[:16]}"'
+        cached = (status, body, compressed, etag)
+        if len(self.responses) < API_RESPONSE_CACHE_SIZE:
+            self.responses[key] = cached
+        return cached
+
+
+class LeaderboardAPIHandler(BaseHTTPRequestHandler):
+    """GET 전용 JSON 핸들러 (ETag/If-None-Match, gzip 지원)"""
+
+    protocol_version = 'HTTP/1.1'
+    server_version = 'LeaderboardAPI'
+
+    def do_GET(self):
+        index = self.server.index  # 요청 처리 중 인덱스가 교체되어도 이 참조로 끝까지 응답
+        url = urllib.parse.urlsplit(self.path)
+        status, body, compressed, etag = index.response(url.path, url.query)
+
+        if status == 200 and etag in [tag.strip() for tag in self.headers.get('If-None-Match', '').split(',')]:
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.send_header('Cache-Control', 'no-cache')
+            self.end_headers()
+            return
+
+        if compressed is not None and 'gzip' in self.headers.get('Accept-Encoding', ''):
+            body = compressed
+            content_encoding = 'gzip'
+        else:
+            content_encoding = None
+
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Cache-Control', 'no-cache')
+        self.send_header('Vary', 'Accept-Encoding')
+        self.send_header('Access-Control-Allow-Origin', '*')
+        if status == 200:
+            self.send_header('ETag', etag)
+        if content_encoding:
+            self.send_header('Content-Encoding', content_encoding)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        api_server_logger.debug(f"{self.address_string()} {format % args}")
+
+
+class LeaderboardAPIServer(ThreadingHTTPServer):
+    """읽기 전용 리더보드 API 서버"""
+
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int], index: LeaderboardIndex):
+        super().__init__(address, LeaderboardAPIHandler)
+        self.index = index
+
+    def swap_index(self, index: LeaderboardIndex):
+        """새 인덱스로 교체 (참조 대입 한 번이라 원자적)"""
+        previous, self.index = self.index, index
+        if previous.version != index.version:
+            api_server_logger.info(f"API 인덱스 교체: {previous.version} → {index.version}")
+
+    def start_background(self) -> threading.Thread:
+        """별도 스레드에서 요청 처리 시작"""
+        thread = threading.Thread(target=self.serve_forever, name='api-server', daemon=True)
+        thread.start()
+        host, port = self.server_address[:2]
+        logger.info(f"API 서버 시작: http://{host}:{port}/api/boards")
+        return thread
+
+
+def _board_output_mtimes(boards: List[Dict]) -> Tuple:
+    """결과 파일/스냅샷 인덱스 수정 시각 (단독 실행 시 변경 감지용)"""
+    paths = [board['output'] for board in boards] + [os.path.join(HISTORY_DIR, 'snapshots_index.jsonl')]
+    return tuple(os.path.getmtime(path) if os.path.exists(path) else None for path in paths)
+
+
+def serve_api(port: int, host: str = API_SERVER_HOST):
+    """이미 만들어진 결과 파일만으로 API 서버 실행 (파일이 바뀌면 인덱스 교체)"""
+    boards = load_board_configs(LEADERBOARDS_FILE)
+    server = LeaderboardAPIServer((host, port), LeaderboardIndex.from_files(boards, SnapshotArchive()))
+    stop_event = threading.Event()
+
+    def reload_loop():
+        mtimes = _board_output_mtimes(boards)
+        while not stop_event.wait(API_RELOAD_SECONDS):
+            current = _board_output_mtimes(boards)
+            if current != mtimes:
+                mtimes = current
+                try:
+                    server.swap_index(LeaderboardIndex.from_files(boards, SnapshotArchive()))
+                except Exception:
+                    logger.exception("API 인덱스 재생성 실패 - 이전 인덱스로 계속 응답합니다")
+
+    threading.Thread(target=reload_loop, name='api-reload', daemon=True).start()
+    host, port = server.server_address[:2]
+    logger.info(f"API 서버 시작: http://{host}:{port}/api/boards (Ctrl+C로 종료)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stop_event.set()
+        server.server_close()
+        logger.info("API 서버 종료")
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """명령행 인자 파싱"""
+    parser = argparse.ArgumentParser(description='YouTube Creator Leaderboard')
+    parser.add_argument('--resume', action='store_true',
+                        help='이전 실행 저널을 이어받아 끝나지 않았거나 실패한 채널만 수집')
+    parser.add_argument('--refresh-all', action='store_true',
+                        help='갱신 주기와 관계없이 모든 채널 수집')
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument('--shard', type=_parse_shard, metavar='K/N',
+                      help='채널을 N개로 나눈 것 중 K번째(0부터)만 수집해 부분 결과 파일로 저장')
+    mode.add_argument('--merge', action='store_true',
+                      help='샤드 부분 결과를 합쳐 리더보드 생성')
+    mode.add_argument('--daemon', action='store_true',
+                      help='프로세스를 유지하며 주기적으로 갱신 (SIGTERM/SIGINT로 종료)')
+    mode.add_argument('--validate', action='store_true',
+                      help='channels.json 사전 검증만 수행 (중복, 채널 ID 존재 여부, 핸들 일치)')
+    parser.add_argument('--interval', type=float, default=DAEMON_INTERVAL_MINUTES, metavar='MINUTES',
+                        help=f'데몬 모드 갱신 주기 (분, 기본값: {DAEMON_INTERVAL_MINUTES})')
+    parser.add_argument('--shard-dir', default=SHARD_DIR,
+                        help=f'부분 결과 파일 디렉토리 (기본값: {SHARD_DIR})')
+    parser.add_argument('--serve', type=int, metavar='PORT',
+                        help='읽기 전용 HTTP API 서버 실행 (단독으로는 기존 결과 파일 제공, --daemon과 함께면 주기마다 갱신)')
+    parser.add_argument('--host', default=API_SERVER_HOST,
+                        help=f'API 서버 바인드 주소 (기본값: {API_SERVER_HOST})')
+    parser.add_argument('--profile', nargs='?', const=PROFILE_DIR, metavar='DIR',
+                        help=f'단계별 CPU 프로파일(pstats), 스택 샘플(collapsed), 할당 기록을 DIR에 저장 (기본값: {PROFILE_DIR})')
+    args = parser.parse_args(argv)
+    if args.serve is not None and (args.shard or args.merge):
+        parser.error('--serve는 --shard/--merge와 함께 사용할 수 없습니다')
+    return args
+
+
+def main(argv: Optional[List[str]] = None):
+    """메인 함수"""
+    args = parse_args(argv)
+    setup_logging()
+    if args.profile:
+        setup_profiling(args.profile)
+
+    if args.validate:
+        # 할당량을 쓰기 전에 잘못된 로스터 항목을 찾음 (확인된 항목은 캐시로 건너뜀)
+        boards = load_board_configs(LEADERBOARDS_FILE)
+        api = YouTubeAPI(API_KEYS) if API_KEYS else None
+        try:
+            valid = RosterValidator().validate(load_channels(CHANNELS_FILE), api, boards)
+        except ChannelFetchError as e:
+            logger.error(f"채널 확인 요청 실패: {e}")
+            valid = False
+        finally:
+            # 채널 확인에 쓴 할당량도 키별 사용량에 반영
+            if api is not None:
+                api.key_pool.save()
+        sys.exit(0 if valid else 1)
+
+    if args.serve is not None and not args.daemon and not args.merge:
+        # 결과 파일만 제공 (API 호출 없음, 상태 파일은 로드하지 않음)
+        serve_api(args.serve, args.host)
+        return
+
+    # 상태 파일 로드 (데몬 모드에서는 메모리에 유지)
+    stores = PersistentStores()
+
+    if args.merge:
+        # 샤드 부분 결과 합치기 (API 호출 없음)
+        boards = load_board_configs(LEADERBOARDS_FILE)
+        channels = load_roster(boards)
+        try:
+            channel_records = load_shard_results(args.shard_dir, channels, stores.scheduler)
+        except ValueError as e:
+            logger.error(f"샤드 결과 병합 실패: {e}")
+            sys.exit(1)
+        publish_leaderboards(boards, channel_records, min(board['start'] for board in boards), stores)
+        logger.info(f"샤드 병합 완료: {len(channel_records)}개 채널")
+        return
+
+    # API 키 확인
+    if not API_KEYS:
+        logger.error("YOUTUBE_API_KEY(또는 YOUTUBE_API_KEYS) 환경 변수가 설정되지 않았습니다.")
+        sys.exit(1)
+
+    # YouTube API 초기화
+    api = YouTubeAPI(API_KEYS)
+
+    if args.daemon:
+        server = None
+        if args.serve is not None:
+            boards = load_board_configs(LEADERBOARDS_FILE)
+            server = LeaderboardAPIServer((args.host, args.serve),
+                                          LeaderboardIndex.from_files(boards, stores.snapshot_archive))
+        LeaderboardDaemon(api, stores, args, interval_minutes=args.interval, server=server).run()
+        return
+
+    try:
+        run_cycle(api, stores, args, resume=args.resume)
+    except QuotaExceededError:
+        # 완료된 채널은 저널에 남아 있으므로 다음 --resume에서 이어서 수집
+        logger.error("할당량이 초기화된 뒤 --resume으로 다시 실행하세요.")
+        sys.exit(1)
+    finally:
+        api.key_pool.save()
+
+
 if __name__ == '__main__':
     main()
@@ -0,0 +1,86 @@
+"""영상별 통계 시계열(timeseries/) 저장 테스트"""
+import json
+import os
+
+import leaderboard
+from leaderboard import VideoTimeSeries
+
+
+def video(views, likes=0, comments=0, video_id='v1'):
+    return {'video_id': video_id, 'views': views, 'likes': likes, 'comments': comments}
+
+
+def test_save_appends_only_new_deltas(tmp_path):
+    series_dir = str(tmp_path / 'ts')
+    series = VideoTimeSeries(series_dir)
+    series.record('UCa', video(10), 100)
+    series.record('UCa', video(5, video_id='v2'), 100)
+    series.save()
+    with open(series.data_file, 'rb') as f:
+        first = f.read()
+
+    series = VideoTimeSeries(series_dir)
+    assert not series.record('UCa', video(10), 200)  # 값이 같으면 기록하지 않음
+    assert series.record('UCa', video(25, likes=1), 300)
+    series.save()
+    with open(series.data_file, 'rb') as f:
+        second = f.read()
+    assert second.startswith(first) and len(second) > len(first)
+
+    reopened = VideoTimeSeries(series_dir)
+    columns = reopened.read_range('v1')
+    assert list(columns['t']) == [100, 300]
+    assert list(columns['views']) == [10, 25]
+    assert list(columns['likes']) == [0, 1]
+    assert list(reopened.read_range('v2')['views']) == [5]
+
+
+def test_bytes_appended_without_index_are_dropped(tmp_path):
+    series_dir = str(tmp_path / 'ts')
+    series = VideoTimeSeries(series_dir)
+    series.record('UCa', video(10), 100)
+    series.save()
+    with open(series.data_file, 'ab') as f:
+        f.write(b'\xff\xff')  # 인덱스를 저장하기 전에 중단된 실행
+
+    reopened = VideoTimeSeries(series_dir)
+    assert list(reopened.read_range('v1')['views']) == [10]
+    reopened.record('UCa', video(20), 200)
+    reopened.save()
+    assert os.path.getsize(reopened.data_file) == reopened.index['size']
+    assert list(VideoTimeSeries(series_dir).read_range('v1')['views']) == [10, 20]
+
+
+def test_compacts_fragmented_series(tmp_path, monkeypatch):
+    monkeypatch.setattr(leaderboard, 'TIMESERIES_COMPACT_SEGMENTS', 3)
+    series_dir = str(tmp_path / 'ts')
+    for run in range(8):
+        series = VideoTimeSeries(series_dir)
+        series.record('UCa', video(10 * (run + 1)), 100 * (run + 1))
+        series.save()
+
+    reopened = VideoTimeSeries(series_dir)
+    assert len(reopened.index['videos']['v1']['s']) <= 3
+    assert list(reopened.read_range('v1')['views']) == [10 * (run + 1) for run in range(8)]
+    assert os.path.getsize(reopened.data_file) == reopened.index['size']
+
+
+def test_reads_legacy_contiguous_index(tmp_path):
+    series_dir = str(tmp_path / 'ts')
+    series = VideoTimeSeries(series_dir)
+    series.record('UCa', video(10), 100)
+    series.save()
+
+    # 이전 형식 인덱스 (영상당 오프셋/길이 하나)
+    with open(series.index_file, 'r', encoding='utf-8') as f:
+        index = json.load(f)
+    entry = index['videos']['v1']
+    (offset, length), = entry.pop('s')
+    entry['o'], entry['n'] = offset, length
+    with open(series.index_file, 'w', encoding='utf-8') as f:
+        json.dump(index, f)
+
+    legacy = VideoTimeSeries(series_dir)
+    legacy.record('UCa', video(30), 200)
+    legacy.save()
+    assert list(VideoTimeSeries(series_dir).read_range('v1')['views']) == [10, 30]
@@ -0,0 +1,173 @@
+"""영상 저장소 바이너리 상태 파일(video_store.bin) 왕복 테스트"""
+import json
+
+import pytest
+
+import leaderboard
+from leaderboard import VideoStateFile, VideoStore
+
+
+def make_video(video_id, published_at, views=100, likes=10, comments=1, title='제목'):
+    return {
+        'video_id': video_id,
+        'title': title,
+        'published_at': published_at,
+        'views': views,
+        'likes': likes,
+        'comments': comments
+    }
+
+
+@pytest.fixture
+def paths(tmp_path):
+    return str(tmp_path / 'video_store.bin'), str(tmp_path / 'video_store.json')
+
+
+def open_store(paths) -> VideoStore:
+    store_file, legacy_file = paths
+    return VideoStore(store_file=store_file, legacy_file=legacy_file)
+
+
+def test_migrates_legacy_json_to_binary(paths):
+    store_file, legacy_file = paths
+    legacy = {
+        'updated_at': '2025-12-01T00:00:00+00:00',
+        'channels': {
+            'UCb': {'v2': {'title': '둘', 'published_at': '2025-11-02T00:00:00Z',
+                           'views': 20, 'likes': 2, 'comments': 0}},
+            'UCa': {'v1': {'title': '하나', 'published_at': '2025-11-01T00:00:00Z',
+                           'views': 10, 'likes': 1, 'comments': 1}}
+        },
+        'channel_stats': {'UCa': {'subscriber_count': 1000, 'total_videos': 5}}
+    }
+    with open(legacy_file, 'w', encoding='utf-8') as f:
+        json.dump(legacy, f, ensure_ascii=False)
+
+    store = open_store(paths)
+    assert store.state is None
+    store.save()
+    store.close()
+
+    reopened = open_store(paths)
+    assert reopened.state is not None
+    assert reopened.state.channel_count == 2
+    assert reopened.has_channel('UCa') and reopened.has_channel('UCb')
+    assert reopened.channel_stats('UCa') == {'subscriber_count': 1000, 'total_videos': 5}
+    assert reopened.channel_stats('UCb') is None
+    assert reopened.channel_videos('UCa') == [{
+        'video_id': 'v1',
+        'title': '하나',
+        'published_at': '2025-11-01T00:00:00Z',
+        'url': 'https://www.youtube.com/watch?v=v1',
+        'views': 10,
+        'likes': 1,
+        'comments': 1
+    }]
+    reopened.close()
+
+
+def test_save_after_lazy_materialization_keeps_untouched_channels(paths):
+    store = open_store(paths)
+    store.update_channel('UCa', [make_video('a1', '2025-11-01T00:00:00Z', views=10)],
+                         channel_stats={'subscriber_count': 1, 'total_videos': 1})
+    store.update_channel('UCb', [make_video('b1', '2025-11-02T00:00:00Z', views=20, title='영상 "b"')],
+                         channel_stats={'subscriber_count': 2, 'total_videos': 1})
+    store.save()
+    assert store.data['channels'] == {} and store.spill is None
+
+    # UCa만 복원해 갱신하고 UCb는 상태 파일에 그대로 둔 채 저장 (갱신한 채널은 메모리에 남기지 않음)
+    store.update_channel('UCa', [make_video('a1', '2025-11-01T00:00:00Z', views=15),
+                                 make_video('a2', '2025-11-03T00:00:00Z', views=5)])
+    assert store.data['channels'] == {}
+    assert set(store.spill.offsets) == {'UCa'}
+    assert [(v['video_id'], v['views']) for v in store.channel_videos('UCa')] == [('a2', 5), ('a1', 15)]
+    store.save()
+    store.close()
+
+    reopened = open_store(paths)
+    assert [(v['video_id'], v['views']) for v in reopened.channel_videos('UCa')] == [('a2', 5), ('a1', 15)]
+    assert reopened.channel_stats('UCa') == {'subscriber_count': 1, 'total_videos': 1}
+    assert [(v['video_id'], v['title']) for v in reopened.channel_videos('UCb')] == [('b1', '영상 "b"')]
+    assert reopened.channel_stats('UCb') == {'subscriber_count': 2, 'total_videos': 1}
+    reopened.close()
+
+
+def test_reading_channels_does_not_keep_videos_in_memory(paths):
+    store = open_store(paths)
+    store.update_channel('UCa', [make_video('a1', '2025-11-01T00:00:00Z')],
+                         channel_stats={'subscriber_count': 1, 'total_videos': 1})
+    store.save()
+
+    assert [v['video_id'] for v in store.channel_videos('UCa')] == ['a1']
+    assert store.channel_stats('UCa') == {'subscriber_count': 1, 'total_videos': 1}
+    assert store.data['channels'] == {}
+    store.close()
+
+
+def test_retain_since_drops_old_videos_on_save(paths):
+    store = open_store(paths)
+    store.update_channel('UCa', [make_video('old', '2025-01-01T00:00:00Z'),
+                                 make_video('new', '2025-11-01T00:00:00Z')])
+    store.save()
+    store.update_channel('UCa', [], retain_since='2025-06-01T00:00:00Z')
+    store.save()
+    store.close()
+
+    reopened = open_store(paths)
+    assert [v['video_id'] for v in reopened.channel_videos('UCa')] == ['new']
+    reopened.close()
+
+
+@pytest.mark.parametrize('damage', ['truncate', 'magic', 'empty'])
+def test_corrupt_state_file_falls_back_to_legacy_json(paths, damage):
+    store_file, legacy_file = paths
+    store = open_store(paths)
+    store.update_channel('UCa', [make_video('a1', '2025-11-01T00:00:00Z')])
+    store.save()
+    store.close()
+
+    with open(store_file, 'rb') as f:
+        content = f.read()
+    if damage == 'truncate':
+        content = content[:-3]
+    elif damage == 'magic':
+        content = b'XXXX' + content[4:]
+    else:
+        content = b''
+    with open(store_file, 'wb') as f:
+        f.write(content)
+
+    with pytest.raises(Exception):
+        VideoStateFile(store_file)
+
+    # 상태 파일을 열 수 없으면 이전 형식 JSON으로, 그것도 없으면 빈 저장소로 시작
+    reopened = open_store(paths)
+    assert reopened.state is None
+    assert not reopened.has_channel('UCa')
+
+    with open(legacy_file, 'w', encoding='utf-8') as f:
+        json.dump({'updated_at': None, 'channels': {'UCz': {}}}, f)
+    fallback = open_store(paths)
+    assert fallback.state is None
+    assert fallback.has_channel('UCz')
+
+
+def test_close_releases_state_file(paths):
+    store = open_store(paths)
+    store.update_channel('UCa', [make_video('a1', '2025-11-01T00:00:00Z')])
+    store.save()
+    buffer = store.state.buffer
+    store.close()
+    assert store.state is None
+    assert buffer.closed
+    store.close()  # 두 번 닫아도 오류 없음
+
+
+def test_persistent_stores_close_closes_video_store(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    stores = leaderboard.PersistentStores()
+    stores.video_store.update_channel('UCa', [make_video('a1', '2025-11-01T00:00:00Z')])
+    stores.video_store.save()
+    assert stores.video_store.state is not None
+    stores.close()
+    assert stores.video_store.state is None